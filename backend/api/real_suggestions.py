@@ -6,14 +6,15 @@ Uses real IPEDS data for accurate major-based college suggestions
 import time
 import logging
 from fastapi import APIRouter
+from data.data_versions import VersionedCache
 from data.real_college_suggestions import real_college_suggestions
 from data.real_ipeds_major_mapping import get_major_relevance_info
 from api.dependencies import CollegeSuggestionsRequest
 
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache for college suggestions
-suggestion_cache = {}
+# Simple in-memory cache for college suggestions (keyed by data version)
+suggestion_cache = VersionedCache()
 CACHE_DURATION = 300  # 5 minutes
 
 router = APIRouter()
@@ -4,6 +4,7 @@ ML-enhanced probability calculation routes.
 Provides endpoints for ML+Formula hybrid predictions.
 """
 
+import time
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
@@ -11,6 +12,7 @@ from database import get_db, College, UserProfile, AcademicData, Extracurricular
 from database.schemas import CalculationResponse
 from api.dependencies import get_current_user_profile
 from ml.models.predictor import get_predictor, model_available
+from ml.models.shadow import shadow_scorer
 from ml.preprocessing.feature_extractor import StudentFeatures, CollegeFeatures
 
 router = APIRouter()
@@ -218,12 +220,15 @@ async def calculate_ml_probability(
     
     # Get predictor and make prediction
     predictor = get_predictor()
+    predict_started = time.perf_counter()
     result = predictor.predict(
         student=student_features,
         college=college_features,
         model_name=model_name,
         use_formula=True
     )
+    shadow_scorer.submit(student_features, college_features, result,
+                         time.perf_counter() - predict_started, model_name)
     
     # Determine category based on final probability
     prob = result.probability
@@ -0,0 +1,22 @@
+"""
+In-process benchmark suite for the API's hot paths.
+
+Run from backend/:
+
+    python -m benchmarks                          # run and print the table
+    python -m benchmarks --save baseline.json     # record a baseline
+    python -m benchmarks --baseline baseline.json # fail (exit 1) on regressions
+
+See runner.py for what is measured and how regressions are judged.
+"""
+
+from .corpus import BenchmarkCorpus, build_corpus
+from .runner import (
+    BENCHMARK_THRESHOLD,
+    BenchmarkCase,
+    BenchmarkResult,
+    compare_to_baseline,
+    load_baseline,
+    run_case,
+    save_baseline
+)
@@ -0,0 +1,69 @@
+"""
+Command line entry point: python -m benchmarks [options]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+
+from benchmarks.corpus import DEFAULT_SEED, build_corpus
+from benchmarks.runner import (
+    BENCHMARK_THRESHOLD, compare_to_baseline, load_baseline, report, results_document, run_case, save_baseline
+)
+from benchmarks.suite import build_cases
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the API hot paths in-process')
+    parser.add_argument('--cases', help='Comma-separated case names (default: all)')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per case')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed calls per case first')
+    parser.add_argument('--alloc-iterations', type=int, default=20, help='Calls per case measured under tracemalloc')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Corpus seed')
+    parser.add_argument('--students', type=int, default=40, help='Synthetic student profiles')
+    parser.add_argument('--colleges', type=int, default=40, help='Catalog colleges')
+    parser.add_argument('--save', metavar='PATH', help='Write the results as a JSON baseline')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare with a JSON baseline; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD,
+                        help='Allowed regression as a fraction of the baseline (default %(default)s)')
+    args = parser.parse_args(argv)
+
+    # Per-call logging and prints would swamp the output (their cost is still measured)
+    logging.basicConfig(level=logging.ERROR)
+    logging.disable(logging.WARNING)
+
+    corpus = build_corpus(args.seed, args.students, args.colleges)
+    only = [name.strip() for name in args.cases.split(',')] if args.cases else None
+    results = []
+    with open(os.devnull, 'w') as sink:
+        with contextlib.redirect_stdout(sink):
+            cases = build_cases(corpus, only)
+        for case in cases:
+            with contextlib.redirect_stdout(sink):
+                result = run_case(case, args.iterations, args.warmup, args.alloc_iterations)
+            results.append(result)
+            print(f"{case.name}: p50 {result.p50_ms:.3f}ms, {result.throughput:.1f} calls/s", file=sys.stderr)
+
+    print(report(results))
+    document = results_document(results, corpus.describe())
+    if args.save:
+        save_baseline(document, args.save)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline.get('corpus') != document['corpus']:
+            print(f"\nWARNING: baseline corpus {baseline.get('corpus')} differs from {document['corpus']}")
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
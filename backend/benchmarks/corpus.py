@@ -0,0 +1,130 @@
+"""
+Deterministic benchmark inputs.
+
+Student profiles come from SyntheticDataGenerator with a fixed seed and
+colleges are drawn from the catalog snapshot with the same seed, so two
+runs against the same data version see exactly the same requests.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from data.catalog_snapshot import get_catalog_snapshot
+from ml.preprocessing.feature_extractor import StudentFeatures
+from ml.training.synthetic_data import SyntheticDataGenerator
+
+DEFAULT_SEED = 42
+
+MAJORS = ('Computer Science', 'Business', 'Engineering', 'Biology', 'Psychology',
+          'Economics', 'Mathematics', 'English', 'Nursing', 'Political Science')
+
+# Frontend form field -> synthetic factor score it is taken from (1-10 dropdowns)
+FRONTEND_FACTOR_FIELDS = {
+    'rigor': 'rigor',
+    'extracurricular_depth': 'ecs_leadership',
+    'leadership_positions': 'ecs_leadership',
+    'passion_projects': 'major_fit',
+    'awards_publications': 'awards_publications',
+    'portfolio_audition': 'portfolio_audition',
+    'essay_quality': 'essay',
+    'recommendations': 'recommendations',
+    'interview': 'interview',
+    'demonstrated_interest': 'demonstrated_interest',
+    'legacy_status': 'legacy',
+    'hs_reputation': 'hs_reputation',
+    'geographic_diversity': 'geography_residency',
+    'plan_timing': 'plan_timing',
+    'geography_residency': 'geography_residency',
+    'firstgen_diversity': 'firstgen_diversity',
+    'ability_to_pay': 'ability_to_pay',
+    'policy_knob': 'policy_knob',
+    'conduct_record': 'conduct_record',
+}
+
+
+@dataclass
+class BenchmarkCorpus:
+    """Inputs shared by the benchmark cases"""
+    seed: int
+    students: List[StudentFeatures]
+    # Frontend form dicts (string values, as posted by the app), one per student
+    profiles: List[Dict[str, str]]
+    colleges: List[str]
+    search_queries: List[str]
+    zipcodes: List[str]
+    data_version: str = ''
+    sizes: Dict[str, int] = field(default_factory=dict)
+
+    def describe(self) -> Dict[str, Any]:
+        """What a baseline needs to know to be comparable"""
+        return {'seed': self.seed, 'data_version': self.data_version, **self.sizes}
+
+
+def frontend_profile(student: StudentFeatures, major: str) -> Dict[str, str]:
+    """The frontend form a synthetic student would submit"""
+    scores = student.factor_scores
+    profile = {
+        'gpa_unweighted': f"{student.gpa_unweighted:.2f}",
+        'gpa_weighted': f"{student.gpa_weighted:.2f}",
+        'sat': str(student.sat_total),
+        'act': str(student.act_composite),
+        'ap_count': str(student.ap_count),
+        'honors_count': str(student.honors_count),
+        'class_rank_percentile': f"{student.class_rank_percentile:.0f}",
+        'class_size': str(student.class_size),
+        'major': major,
+    }
+    for form_field, factor in FRONTEND_FACTOR_FIELDS.items():
+        value = scores.get(factor)
+        profile[form_field] = str(int(round(min(10.0, max(1.0, value))))) if value is not None else '5'
+    return profile
+
+
+def build_corpus(seed: int = DEFAULT_SEED, students: int = 40, colleges: int = 40) -> BenchmarkCorpus:
+    """
+    Generate the benchmark inputs.
+
+    Args:
+        seed: Seed for the synthetic students and the college sample
+        students: Number of student profiles
+        colleges: Number of catalog colleges
+
+    Returns:
+        BenchmarkCorpus (identical for identical arguments and catalog)
+    """
+    from data.data_versions import data_versions
+
+    generator = SyntheticDataGenerator(random_seed=seed)
+    rng = np.random.RandomState(seed)
+
+    student_features = [generator.generate_student_profile()[0] for _ in range(students)]
+    majors = [MAJORS[i] for i in rng.randint(0, len(MAJORS), size=students)]
+    profiles = [frontend_profile(student, major) for student, major in zip(student_features, majors)]
+
+    names = sorted({name for name in get_catalog_snapshot().column('name') if name})
+    picked = [names[i] for i in sorted(rng.choice(len(names), size=min(colleges, len(names)), replace=False))]
+    for profile, college in zip(profiles, rng.permutation(picked * (students // max(1, len(picked)) + 1))):
+        profile['college'] = str(college)
+
+    # Search terms: a word of a college name (partial match) and some full names
+    queries = []
+    for name in picked:
+        words = [word for word in name.split() if len(word) > 3 and word.isalpha()]
+        queries.append(words[rng.randint(len(words))].lower() if words else name.lower())
+    queries += [name.lower() for name in picked[::4]]
+
+    zipcodes = [f"{prefix:02d}{suffix:03d}" for prefix, suffix in
+                zip(rng.randint(1, 100, size=colleges), rng.randint(0, 1000, size=colleges))]
+
+    return BenchmarkCorpus(
+        seed=seed,
+        students=student_features,
+        profiles=profiles,
+        colleges=picked,
+        search_queries=queries,
+        zipcodes=zipcodes,
+        data_version=data_versions.current.version,
+        sizes={'students': students, 'colleges': len(picked)},
+    )
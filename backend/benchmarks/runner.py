@@ -0,0 +1,192 @@
+"""
+Benchmark timing, allocation measurement and baseline comparison.
+
+A case is a callable plus a list of inputs; the runner calls it with the
+inputs in turn. After a few untimed warm-up calls (data loads, index
+builds) it times each call with perf_counter and reports throughput and
+latency percentiles. A second, shorter pass runs under tracemalloc for
+the peak memory a call allocates and the memory it leaves behind;
+tracemalloc slows calls down, so the two passes are kept apart.
+
+Results are saved as JSON baselines. A later run is compared with one
+metric at a time. It regresses when it is more than `threshold` (a
+fraction) worse than the baseline and also worse by more than a small
+absolute floor, so sub-millisecond jitter does not fail the run.
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Allowed slowdown / allocation growth before a run fails (fraction of the baseline)
+BENCHMARK_THRESHOLD = float(os.environ.get('BENCHMARK_THRESHOLD', '0.25'))
+
+# Metrics compared against the baseline (higher is worse) -> absolute floor below which changes are ignored
+REGRESSION_METRICS = {'p50_ms': 0.05, 'p95_ms': 0.1, 'peak_alloc_kib': 16.0}
+
+
+@dataclass
+class BenchmarkCase:
+    """A hot path to benchmark"""
+    name: str
+    func: Callable[[Any], Any]
+    inputs: Sequence[Any]
+    # Untimed call before each timed call (e.g. clearing a response cache)
+    before: Optional[Callable[[], None]] = None
+    # Items each call processes (for batch cases), for items/s
+    items_per_call: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    calls: int
+    seconds: float
+    throughput: float  # calls per second
+    items_per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_alloc_kib: float  # median peak allocated during one call
+    retained_kib: float  # mean memory still allocated after a call
+
+
+def run_case(case: BenchmarkCase, iterations: int = 200, warmup: int = 3,
+             alloc_iterations: int = 20) -> BenchmarkResult:
+    """
+    Benchmark one case.
+
+    Args:
+        case: The case to run
+        iterations: Timed calls (inputs are cycled)
+        warmup: Untimed calls first
+        alloc_iterations: Calls measured under tracemalloc
+
+    Returns:
+        BenchmarkResult
+    """
+    inputs = case.inputs
+    for i in range(warmup):
+        _call(case, inputs[i % len(inputs)])
+
+    durations = np.empty(iterations)
+    for i in range(iterations):
+        item = inputs[i % len(inputs)]
+        if case.before is not None:
+            case.before()
+        started = time.perf_counter()
+        case.func(item)
+        durations[i] = time.perf_counter() - started
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(alloc_iterations):
+            item = inputs[i % len(inputs)]
+            if case.before is not None:
+                case.before()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            case.func(item)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+
+    total = float(durations.sum())
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99]) * 1000
+    return BenchmarkResult(
+        name=case.name,
+        calls=iterations,
+        seconds=round(total, 6),
+        throughput=round(iterations / total, 3) if total else 0.0,
+        items_per_second=round(iterations * case.items_per_call / total, 3) if total else 0.0,
+        mean_ms=round(total / iterations * 1000, 4),
+        p50_ms=round(float(p50), 4),
+        p95_ms=round(float(p95), 4),
+        p99_ms=round(float(p99), 4),
+        max_ms=round(float(durations.max()) * 1000, 4),
+        peak_alloc_kib=round(float(np.median(peaks)) / 1024, 2) if peaks else 0.0,
+        retained_kib=round(float(np.mean(retained)) / 1024, 2) if retained else 0.0,
+    )
+
+
+def _call(case: BenchmarkCase, item: Any) -> None:
+    if case.before is not None:
+        case.before()
+    case.func(item)
+
+
+def results_document(results: List[BenchmarkResult], corpus: Dict[str, Any]) -> Dict[str, Any]:
+    """Results as a baseline document"""
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()) + 'Z',
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'corpus': corpus,
+        'results': {result.name: asdict(result) for result in results},
+    }
+
+
+def save_baseline(document: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Raises:
+        FileNotFoundError: if there is no baseline at path
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any],
+                        threshold: float = None) -> List[str]:
+    """
+    Regressions of results against a baseline document.
+
+    Cases missing from either side are skipped.
+
+    Returns:
+        One message per regressed metric (empty when within threshold)
+    """
+    threshold = BENCHMARK_THRESHOLD if threshold is None else threshold
+    regressions = []
+    for result in results:
+        base = baseline.get('results', {}).get(result.name)
+        if base is None:
+            continue
+        for metric, floor in REGRESSION_METRICS.items():
+            old, new = base.get(metric), getattr(result, metric)
+            if old is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append(
+                    f"{result.name}: {metric} {new:.3f} vs baseline {old:.3f} "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%, threshold {threshold * 100:.0f}%)"
+                )
+    return regressions
+
+
+def report(results: List[BenchmarkResult]) -> str:
+    """Results as a text table"""
+    header = f"{'case':<28} {'calls/s':>10} {'items/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9} {'kept KiB':>9}"
+    lines = [header, '-' * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<28} {r.throughput:>10.1f} {r.items_per_second:>11.1f} {r.p50_ms:>9.3f} {r.p95_ms:>9.3f} "
+            f"{r.p99_ms:>9.3f} {r.peak_alloc_kib:>9.1f} {r.retained_kib:>9.1f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,107 @@
+"""
+The hot paths benchmarked in-process.
+
+Endpoint cases call the FastAPI handlers directly (async handlers on one
+event loop) with request models built from the corpus, so they include
+the handler's own work but not HTTP parsing or middleware. Service cases
+call the code underneath them. Nothing leaves the process. Without
+OPENAI_API_KEY the enrichment step uses its fallback data. The zipcode
+case seeds the zippopotam cache for the corpus zipcodes instead of
+calling the API.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.corpus import BenchmarkCorpus
+from benchmarks.runner import BenchmarkCase
+
+# Students scored against every corpus college in the batch prediction case
+BATCH_STUDENTS = 10
+
+
+def build_cases(corpus: BenchmarkCorpus, only: Optional[Sequence[str]] = None) -> List[BenchmarkCase]:
+    """
+    Benchmark cases over a corpus.
+
+    Args:
+        corpus: Inputs (see build_corpus)
+        only: Case names to build (default: all)
+
+    Returns:
+        Cases in a stable order
+    """
+    try:
+        from backend import main  # run from the repository root (main.py there wraps backend.main)
+    except ImportError:
+        import main
+    from core import calculate_admission_probability
+    from core.vectorized import calculate_probability_matrix
+    from data.college_tuition_service import college_tuition_service
+    from data.tuition_state_service import tuition_state_service
+    from data.zippopotam_service import zippopotam_service
+    from ml.models.predictor import get_predictor
+
+    loop = asyncio.new_event_loop()
+
+    def run(coroutine_function: Callable) -> Callable:
+        return lambda item: loop.run_until_complete(coroutine_function(item))
+
+    colleges = [main.catalog_college_features(name) for name in corpus.colleges]
+    predictor = get_predictor()
+    scores = [student.factor_scores for student in corpus.students]
+    pairs = [(student, colleges[i % len(colleges)]) for i, student in enumerate(corpus.students)]
+
+    for zipcode in corpus.zipcodes:
+        state = tuition_state_service.get_state_from_zipcode(zipcode) or 'CA'
+        zippopotam_service.cache.setdefault(zipcode, {
+            'city': 'Benchmark', 'state': state, 'state_abbr': state, 'zipcode': zipcode
+        })
+
+    builders: Dict[str, Callable[[], BenchmarkCase]] = {
+        'search': lambda: BenchmarkCase(
+            'search', run(lambda q: main.search_colleges(q=q, limit=20)), corpus.search_queries),
+        'get_college_data': lambda: BenchmarkCase(
+            'get_college_data', main.get_college_data, corpus.colleges),
+        'formula_single': lambda: BenchmarkCase(
+            'formula_single',
+            lambda pair: calculate_admission_probability(pair[0].factor_scores, pair[1].acceptance_rate),
+            pairs),
+        'formula_batch': lambda: BenchmarkCase(
+            'formula_batch',
+            lambda colleges_batch: calculate_probability_matrix(scores, colleges_batch),
+            [[{'acceptance_rate': college.acceptance_rate} for college in colleges]],
+            items_per_call=len(scores) * len(colleges)),
+        'predict_single': lambda: BenchmarkCase(
+            'predict_single', lambda pair: predictor.predict(pair[0], pair[1]), pairs),
+        'predict_batch': lambda: BenchmarkCase(
+            'predict_batch',
+            lambda students: predictor.predict_probability_grid(students, colleges),
+            [corpus.students[:BATCH_STUDENTS]],
+            items_per_call=min(BATCH_STUDENTS, len(corpus.students)) * len(colleges)),
+        'predict_frontend': lambda: BenchmarkCase(
+            'predict_frontend',
+            run(lambda profile: main.predict_admission_frontend(main.FrontendProfileRequest(**profile))),
+            corpus.profiles),
+        'suggestions': lambda: BenchmarkCase(
+            'suggestions',
+            run(lambda profile: main.suggest_colleges(main.CollegeSuggestionsRequest(**profile))),
+            corpus.profiles,
+            # Each call computes its suggestions rather than hitting the response cache
+            before=main.suggestion_cache.clear),
+        'improvement_analysis': lambda: BenchmarkCase(
+            'improvement_analysis',
+            run(lambda profile: main.get_improvement_analysis(profile['college'], profile)),
+            corpus.profiles),
+        'tuition_lookup': lambda: BenchmarkCase(
+            'tuition_lookup', college_tuition_service.get_college_tuition_data, corpus.colleges),
+        'tuition_by_zipcode': lambda: BenchmarkCase(
+            'tuition_by_zipcode',
+            lambda pair: tuition_state_service.get_tuition_for_college_and_zipcode(*pair),
+            list(zip(corpus.colleges, corpus.zipcodes))),
+    }
+    unknown = set(only or ()) - set(builders)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+    return [build() for name, build in builders.items() if not only or name in only]
+
@@ -20,6 +20,7 @@ from .probability import (
 from .audit import (
     AuditRow,
     AuditReport,
+    LazyAuditReport,
     build_audit,
     identify_strengths_and_weaknesses,
     format_audit_for_display
@@ -28,6 +29,29 @@ from .pipeline import (
     calculate_admission_probability,
     batch_calculate_probabilities
 )
+from .calibration_table import (
+    CalibrationTable,
+    build_calibration_table,
+    get_calibration_table
+)
+from .vectorized import (
+    FACTOR_ORDER,
+    WEIGHT_VECTOR,
+    scores_to_matrix,
+    compute_composites,
+    default_calibration_arrays,
+    calibration_arrays,
+    logistic_probs,
+    calculate_probability_matrix
+)
+from .portfolio import (
+    PortfolioSimulation,
+    simulate_portfolio
+)
+from .list_optimizer import (
+    ApplicationListPlan,
+    optimize_application_list
+)
 
 __all__ = [
     # Weights
@@ -51,6 +75,7 @@ __all__ = [
     # Audit
     'AuditRow',
     'AuditReport',
+    'LazyAuditReport',
     'build_audit',
     'identify_strengths_and_weaknesses',
     'format_audit_for_display',
@@ -58,5 +83,26 @@ __all__ = [
     # Pipeline (main entry point)
     'calculate_admission_probability',
     'batch_calculate_probabilities',
+    
+    # Per-college calibration table
+    'CalibrationTable',
+    'build_calibration_table',
+    'get_calibration_table',
+    
+    # Vectorized engine (many profiles x many colleges)
+    'FACTOR_ORDER',
+    'WEIGHT_VECTOR',
+    'scores_to_matrix',
+    'compute_composites',
+    'default_calibration_arrays',
+    'calibration_arrays',
+    'logistic_probs',
+    'calculate_probability_matrix',
+    
+    # Application-list simulation
+    'PortfolioSimulation',
+    'simulate_portfolio',
+    'ApplicationListPlan',
+    'optimize_application_list',
 ]
 
@@ -3,7 +3,7 @@ Audit trail for probability calculations.
 Shows user exactly what contributed to their score.
 """
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from .weights import FACTOR_WEIGHTS
 
@@ -44,6 +44,52 @@ class AuditReport:
         }
 
 
+class LazyAuditReport(AuditReport):
+    """
+    AuditReport whose breakdown is built on first access.
+
+    The numeric results (composite, probability, acceptance rate) are set
+    up front; percentile, factor breakdown and policy notes come from
+    `build_details` the first time any of them is read.
+    """
+
+    def __init__(
+        self,
+        composite_score: float,
+        probability: float,
+        acceptance_rate: float,
+        build_details: Callable[[], Tuple[float, List[AuditRow], List[str]]]
+    ):
+        self.composite_score = composite_score
+        self.probability = probability
+        self.acceptance_rate = acceptance_rate
+        self._build_details = build_details
+        self._details = None
+
+    def _get_details(self) -> Tuple[float, List[AuditRow], List[str]]:
+        if self._details is None:
+            self._details = self._build_details()
+            self._build_details = None
+        return self._details
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the breakdown has been materialized yet"""
+        return self._details is not None
+
+    @property
+    def percentile_estimate(self) -> float:
+        return self._get_details()[0]
+
+    @property
+    def factor_breakdown(self) -> List[AuditRow]:
+        return self._get_details()[1]
+
+    @property
+    def policy_notes(self) -> List[str]:
+        return self._get_details()[2]
+
+
 def build_audit(
     scores: Dict[str, Optional[float]],
     used_factors: List[str],
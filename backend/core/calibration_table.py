@@ -0,0 +1,276 @@
+"""
+Per-college calibration table keyed by IPEDS unitid.
+
+Holds the logistic parameters (A, C) and the elite post-calibration
+(multiplicative factor and max-probability cap) for every catalog college,
+precomputed by backend/scripts/enhanced_calibration_system.py and stored as
+a compact .npz array file. Lookups are a single dict hit into the arrays.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+
+from .elite_matcher import EliteNameMatcher
+from .probability import CalibrationParams
+from .vectorized import default_calibration_arrays
+
+DEFAULT_TABLE_PATH = Path(__file__).parent.parent / 'data' / 'models' / 'college_calibration.npz'
+
+# Short names used in enhanced_calibration_factors.json -> full college names
+ELITE_NAME_MAPPING: Dict[str, str] = {
+    'MIT': 'massachusetts institute of technology',
+    'Harvard': 'harvard university',
+    'Stanford': 'stanford university',
+    'Yale': 'yale university',
+    'Princeton': 'princeton university',
+    'Columbia': 'columbia university',
+    'UPenn': 'university of pennsylvania',
+    'Dartmouth': 'dartmouth college',
+    'Brown': 'brown university',
+    'Cornell': 'cornell university',
+    'Duke': 'duke university',
+    'Northwestern': 'northwestern university',
+    'Vanderbilt': 'vanderbilt university',
+    'Rice': 'rice university',
+    'Emory': 'emory university',
+    'Georgetown': 'georgetown university',
+    'CMU': 'carnegie mellon university',
+    'NYU': 'new york university',
+    'UChicago': 'university of chicago',
+    'Boston University': 'boston university'
+}
+
+
+def elite_calibration_by_name(enhanced_factors: Dict[str, dict]) -> Dict[str, dict]:
+    """
+    Convert enhanced_calibration_factors.json entries to lowercase full-name keys.
+
+    Args:
+        enhanced_factors: Parsed enhanced_calibration_factors.json
+
+    Returns:
+        Dict of full lowercase name -> {factor, max_prob, acceptance_rate, category}
+    """
+    elite_calibration = {}
+    for college, data in enhanced_factors.items():
+        mapped_name = ELITE_NAME_MAPPING.get(college, college.lower())
+        elite_calibration[mapped_name] = {
+            'factor': data['calibration_factor'],
+            'max_prob': data['max_probability'],
+            'acceptance_rate': data['acceptance_rate'],
+            'category': data['category']
+        }
+    return elite_calibration
+
+
+def match_elite_name(college_name: str, elite_calibration: Dict[str, dict]) -> Optional[str]:
+    """
+    Find the elite entry for a college name (first substring match either way).
+
+    Reference implementation of the rule EliteNameMatcher compiles.
+
+    Returns:
+        Matching key of elite_calibration, or None
+    """
+    college_name = college_name.lower()
+    for elite_name in elite_calibration:
+        if elite_name in college_name or college_name in elite_name:
+            return elite_name
+    return None
+
+
+def _as_unitids(unitids: Sequence) -> list:
+    """Normalize unitids to ints; unusable ones become None"""
+    out = []
+    for u in unitids:
+        try:
+            out.append(None if u is None else int(u))
+        except (TypeError, ValueError):
+            out.append(None)
+    return out
+
+
+class CalibrationTable:
+    """
+    Column arrays of per-college calibration, indexed by unitid.
+
+    Non-elite colleges carry factor=1.0 and max_prob=1.0 so the elite
+    post-calibration is a no-op for them.
+    """
+
+    def __init__(
+        self,
+        unitid: np.ndarray,
+        acceptance_rate: np.ndarray,
+        A: np.ndarray,
+        C: np.ndarray,
+        factor: np.ndarray,
+        max_prob: np.ndarray,
+        is_elite: np.ndarray
+    ):
+        self.unitid = np.asarray(unitid, dtype=np.int64)
+        self.acceptance_rate = np.asarray(acceptance_rate, dtype=np.float64)
+        self.A = np.asarray(A, dtype=np.float64)
+        self.C = np.asarray(C, dtype=np.float64)
+        self.factor = np.asarray(factor, dtype=np.float64)
+        self.max_prob = np.asarray(max_prob, dtype=np.float64)
+        self.is_elite = np.asarray(is_elite, dtype=bool)
+        self._row_by_unitid = {int(u): i for i, u in enumerate(self.unitid)}
+
+    def __len__(self) -> int:
+        return len(self.unitid)
+
+    def __contains__(self, unitid) -> bool:
+        return self.row(unitid) is not None
+
+    def row(self, unitid) -> Optional[int]:
+        """Row index for a unitid, or None if the college is not in the table"""
+        if unitid is None:
+            return None
+        try:
+            return self._row_by_unitid.get(int(unitid))
+        except (TypeError, ValueError):
+            return None
+
+    def calibration_params(
+        self,
+        unitid,
+        acceptance_rate: Optional[float] = None
+    ) -> Optional[CalibrationParams]:
+        """
+        Logistic parameters for a college.
+
+        If acceptance_rate is given and differs from the rate the table was
+        built from (e.g. a live override), returns None so the caller
+        derives parameters for that rate instead.
+        """
+        i = self.row(unitid)
+        if i is None:
+            return None
+        if acceptance_rate is not None and abs(acceptance_rate - self.acceptance_rate[i]) > 1e-9:
+            return None
+        return CalibrationParams(A=float(self.A[i]), C=float(self.C[i]))
+
+    def calibration_arrays(self, unitids: Sequence, acceptance_rates: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Logistic parameters (A, C) for many colleges, as (N,) arrays.
+
+        Rows come straight from the table; colleges missing from it, or
+        whose acceptance rate differs from the table's (see
+        calibration_params), get parameters derived for their rate.
+        """
+        rates = np.asarray(acceptance_rates, dtype=np.float64)
+        rows = np.array([self._row_by_unitid.get(u, -1) for u in _as_unitids(unitids)], dtype=np.int64)
+        A, C = default_calibration_arrays(rates)
+        found = np.flatnonzero(rows >= 0)
+        table_rows = rows[found]
+        same_rate = np.abs(rates[found] - self.acceptance_rate[table_rows]) <= 1e-9
+        A[found[same_rate]] = self.A[table_rows[same_rate]]
+        C[found[same_rate]] = self.C[table_rows[same_rate]]
+        return A, C
+
+    def elite_params(self, unitid) -> Optional[Tuple[float, float]]:
+        """(factor, max_prob) for an elite college, or None"""
+        i = self.row(unitid)
+        if i is None or not self.is_elite[i]:
+            return None
+        return float(self.factor[i]), float(self.max_prob[i])
+
+    def save(self, path) -> None:
+        """Write the table as a compressed .npz array file."""
+        np.savez_compressed(
+            path,
+            unitid=self.unitid,
+            acceptance_rate=self.acceptance_rate,
+            A=self.A,
+            C=self.C,
+            factor=self.factor,
+            max_prob=self.max_prob,
+            is_elite=self.is_elite
+        )
+
+    @classmethod
+    def load(cls, path) -> 'CalibrationTable':
+        """Load a table written by save()."""
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+
+def build_calibration_table(
+    unitids: Iterable[int],
+    names: Iterable[str],
+    acceptance_rates: Iterable[float],
+    elite_calibration: Dict[str, dict]
+) -> CalibrationTable:
+    """
+    Precompute the calibration table for a college catalog.
+
+    Args:
+        unitids: Catalog unitids
+        names: Catalog college names (same order)
+        acceptance_rates: Catalog acceptance rates (same order)
+        elite_calibration: Output of elite_calibration_by_name
+
+    Returns:
+        CalibrationTable with one row per college
+    """
+    unitids = np.asarray(list(unitids), dtype=np.int64)
+    names = list(names)
+    acceptance_rates = np.asarray(list(acceptance_rates), dtype=np.float64)
+
+    A, C = default_calibration_arrays(acceptance_rates)
+    factor = np.ones(len(unitids))
+    max_prob = np.ones(len(unitids))
+    is_elite = np.zeros(len(unitids), dtype=bool)
+
+    matcher = EliteNameMatcher(list(elite_calibration))
+    for i, name in enumerate(names):
+        elite_name = matcher.match(str(name))
+        if elite_name is not None:
+            factor[i] = elite_calibration[elite_name]['factor']
+            max_prob[i] = elite_calibration[elite_name]['max_prob']
+            is_elite[i] = True
+
+    return CalibrationTable(unitids, acceptance_rates, A, C, factor, max_prob, is_elite)
+
+
+def load_calibration_table(path=None) -> Optional[CalibrationTable]:
+    """Read a table file, or None if it has not been built"""
+    table_path = path or DEFAULT_TABLE_PATH
+    return CalibrationTable.load(table_path) if os.path.exists(table_path) else None
+
+
+# Global table instance (lazy loaded)
+_calibration_table: Optional[CalibrationTable] = None
+_calibration_table_loaded = False
+
+# Optional source of the serving table (set by the data version manager)
+_calibration_provider: Optional[Callable[[], Optional[CalibrationTable]]] = None
+
+
+def set_calibration_provider(provider: Optional[Callable[[], Optional[CalibrationTable]]]) -> None:
+    """Resolve get_calibration_table() through provider (None restores the file singleton)"""
+    global _calibration_provider
+    _calibration_provider = provider
+
+
+def get_calibration_table(path: Optional[str] = None) -> Optional[CalibrationTable]:
+    """
+    Get the serving calibration table, or None if it was not built.
+
+    With a provider registered (see set_calibration_provider) this is the
+    table of the data version serving the current request; otherwise the
+    global table loaded once from disk.
+
+    Args:
+        path: Table file (defaults to data/models/college_calibration.npz)
+    """
+    global _calibration_table, _calibration_table_loaded
+    if path is None and _calibration_provider is not None:
+        return _calibration_provider()
+    if not _calibration_table_loaded:
+        _calibration_table = load_calibration_table(path)
+        _calibration_table_loaded = True
+    return _calibration_table
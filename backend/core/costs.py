@@ -0,0 +1,112 @@
+"""
+Per-request cost accounting.
+
+Code on the request path counts the operations that make a request
+expensive without necessarily showing up as a slow stage:
+
+    count('file_reads')
+    count('rows_scanned', len(df))
+
+During a request the counts are summed into the request's context (the
+middleware opens it with collect_costs()). When the response is ready
+they are returned in the X-Request-Cost header and added to per-endpoint
+totals exported at /metrics next to the number of requests, so
+"suggestions now reads a CSV 100 times" shows up both on the one request
+and as a jump in file_reads per request. Outside a request (startup,
+background reloads) counts are dropped.
+
+Counting costs one context variable lookup and a dict update.
+"""
+
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Operations counted on the request path
+OPERATIONS = ('file_reads', 'rows_scanned', 'model_invocations', 'cache_hits', 'cache_misses', 'http_calls')
+
+COST_HEADER = 'X-Request-Cost'
+METRIC_NAME = 'chancify_request_operations_total'
+REQUESTS_METRIC_NAME = 'chancify_requests_total'
+
+
+class CostMetrics:
+    """Operation totals keyed by (endpoint, operation), plus requests per endpoint"""
+
+    def __init__(self):
+        self._totals: Dict[Tuple[str, str], int] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(self, endpoint: str, counts: Dict[str, int]) -> None:
+        """Add one request's operation counts"""
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            for operation, n in counts.items():
+                key = (endpoint, operation)
+                self._totals[key] = self._totals.get(key, 0) + n
+
+    def total(self, endpoint: str, operation: str) -> int:
+        return self._totals.get((endpoint, operation), 0)
+
+    def requests(self, endpoint: str) -> int:
+        return self._requests.get(endpoint, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._requests.clear()
+
+    def render(self) -> str:
+        """Totals in the Prometheus text exposition format"""
+        with self._lock:
+            totals = sorted(self._totals.items())
+            requests = sorted(self._requests.items())
+        lines = [
+            f'# HELP {REQUESTS_METRIC_NAME} Requests served, by endpoint.',
+            f'# TYPE {REQUESTS_METRIC_NAME} counter',
+        ]
+        lines += [f'{REQUESTS_METRIC_NAME}{{endpoint="{_escape(endpoint)}"}} {n}' for endpoint, n in requests]
+        lines += [
+            f'# HELP {METRIC_NAME} Costly operations performed while serving requests, by endpoint.',
+            f'# TYPE {METRIC_NAME} counter',
+        ]
+        lines += [
+            f'{METRIC_NAME}{{endpoint="{_escape(endpoint)}",operation="{_escape(operation)}"}} {n}'
+            for (endpoint, operation), n in totals
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+cost_metrics = CostMetrics()
+
+# Operation -> count for the running request; None outside requests
+_request_costs: ContextVar[Optional[Dict[str, int]]] = ContextVar('request_costs', default=None)
+
+
+def count(operation: str, n: int = 1) -> None:
+    """Count n operations against the running request (no-op outside one)"""
+    costs = _request_costs.get()
+    if costs is not None:
+        costs[operation] = costs.get(operation, 0) + n
+
+
+@contextmanager
+def collect_costs() -> Iterator[Dict[str, int]]:
+    """Collect the operations counted inside the block (per request)"""
+    costs: Dict[str, int] = {}
+    token = _request_costs.set(costs)
+    try:
+        yield costs
+    finally:
+        _request_costs.reset(token)
+
+
+def format_costs(costs: Dict[str, int]) -> str:
+    """Header value: 'cache_hits=2, rows_scanned=6483' (sorted, non-zero only)"""
+    return ', '.join(f'{operation}={n}' for operation, n in sorted(costs.items()) if n)
@@ -0,0 +1,100 @@
+"""
+Compiled matcher for elite-calibration membership.
+
+Replaces the per-prediction loop of
+`elite_name in college_name or college_name in elite_name` checks with an
+Aho-Corasick automaton over the elite names (first direction) and a
+precomputed substring index (second direction). Ties resolve to the first
+elite name in insertion order, exactly like the original loop.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+
+class EliteNameMatcher:
+    """Matches college names against a fixed list of elite names."""
+
+    def __init__(self, elite_names: Sequence[str]):
+        """
+        Compile the matcher.
+
+        Args:
+            elite_names: Lowercase elite college names, in priority order
+        """
+        self.elite_names: List[str] = list(elite_names)
+
+        # Aho-Corasick automaton: goto transitions, failure links and the
+        # lowest pattern index that ends at (or suffix-links from) each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Optional[int]] = [None]
+
+        for index, name in enumerate(self.elite_names):
+            state = 0
+            for char in name:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                state = next_state
+            if self._out[state] is None or index < self._out[state]:
+                self._out[state] = index
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                self._out[next_state] = _min_index(self._out[next_state], self._out[self._fail[next_state]])
+
+        # Reverse direction (college name inside an elite name): every
+        # substring of every elite name mapped to its first elite index
+        self._substring_index: Dict[str, int] = {}
+        for index, name in enumerate(self.elite_names):
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    self._substring_index.setdefault(name[start:end], index)
+
+    def match_index(self, college_name: str) -> Optional[int]:
+        """
+        Index of the first elite name matching college_name, or None.
+
+        An empty name is a substring of every elite name, so like the
+        original loop it matches the first one.
+        """
+        text = (college_name or '').lower()
+        if not text:
+            return 0 if self.elite_names else None
+
+        best = self._substring_index.get(text)
+
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            best = _min_index(best, self._out[state])
+
+        return best
+
+    def match(self, college_name: str) -> Optional[str]:
+        """First elite name matching college_name, or None."""
+        index = self.match_index(college_name)
+        return None if index is None else self.elite_names[index]
+
+
+def _min_index(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
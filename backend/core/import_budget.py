@@ -0,0 +1,117 @@
+"""
+Import-time budget for API startup.
+
+Importing the API should load only what serving needs: the ML stack
+(sklearn, joblib, xgboost) is imported when the predictor loads, which
+happens in the background warm-up or on the first prediction, and
+spreadsheet/client libraries are imported by the code paths that use
+them. This module measures a fresh interpreter's import of the app with
+`python -X importtime` and checks it against a budget:
+
+- total import time at most IMPORT_TIME_BUDGET seconds
+- none of HEAVY_MODULES imported
+
+Run it from backend/ (exits 1 when over budget):
+
+    python -m core.import_budget [module]
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+# Seconds the app import may take (IMPORT_TIME_BUDGET env var)
+IMPORT_TIME_BUDGET = float(os.environ.get('IMPORT_TIME_BUDGET', '3.0'))
+
+# Top-level packages that must not be imported at startup
+HEAVY_MODULES = ('sklearn', 'xgboost', 'joblib', 'scipy', 'matplotlib', 'openpyxl', 'openai')
+
+
+@dataclass
+class ImportProfile:
+    """What importing a module in a fresh interpreter loaded, and how long it took"""
+    module: str
+    seconds: float
+    # Modules imported directly by the module -> cumulative seconds
+    direct: Dict[str, float] = field(default_factory=dict)
+    # Every module imported along the way
+    loaded: List[str] = field(default_factory=list)
+
+    def slowest(self, count: int = 10) -> List[tuple]:
+        return sorted(self.direct.items(), key=lambda item: -item[1])[:count]
+
+
+def profile_imports(module: str = 'main', cwd: Optional[str] = None) -> ImportProfile:
+    """
+    Import module in a new interpreter with -X importtime and parse the report.
+
+    Args:
+        module: Module to import
+        cwd: Directory to run in (default: backend/)
+
+    Raises:
+        RuntimeError: if the import fails
+    """
+    cwd = cwd or os.path.join(os.path.dirname(__file__), '..')
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    # Lines: "import time: <self us> | <cumulative us> | <indent><name>"; children precede their parent
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header
+        name = parts[2].rstrip()
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(parts[1]) / 1e6))
+
+    profile = ImportProfile(module=module, seconds=0.0, loaded=[name for _, name, _ in entries])
+    for index, (depth, name, cumulative) in enumerate(entries):
+        if name == module and depth == 1:
+            profile.seconds = cumulative
+            # Its direct imports are the preceding entries one level deeper, back to the previous top-level one
+            for child_depth, child, child_cumulative in reversed(entries[:index]):
+                if child_depth <= 1:
+                    break
+                if child_depth == 3:
+                    profile.direct[child] = child_cumulative
+    return profile
+
+
+def check_import_budget(profile: ImportProfile, budget: float = None,
+                        forbidden: Sequence[str] = HEAVY_MODULES) -> List[str]:
+    """
+    Problems with a profile: over the time budget, or forbidden packages loaded.
+
+    Returns:
+        One message per problem (empty when within budget)
+    """
+    budget = IMPORT_TIME_BUDGET if budget is None else budget
+    problems = []
+    if profile.seconds > budget:
+        slowest = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in profile.slowest(5))
+        problems.append(f"import {profile.module} took {profile.seconds:.2f}s (budget {budget:.2f}s); slowest: {slowest}")
+    heavy = sorted({name.split('.')[0] for name in profile.loaded} & set(forbidden))
+    if heavy:
+        problems.append(f"import {profile.module} loaded {', '.join(heavy)}")
+    return problems
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else 'main'
+    result = profile_imports(target, cwd=os.getcwd())
+    print(f"import {target}: {result.seconds:.3f}s (budget {IMPORT_TIME_BUDGET:.2f}s)")
+    for name, seconds in result.slowest():
+        print(f"  {seconds:8.3f}s  {name}")
+    issues = check_import_budget(result)
+    for issue in issues:
+        print(f"FAIL: {issue}")
+    sys.exit(1 if issues else 0)
@@ -0,0 +1,166 @@
+"""
+Per-stage latency histograms, exported in Prometheus text format.
+
+Code on the prediction path marks its stages:
+
+    with stage('formula'):
+        ...
+
+or decorates a whole function with @timed('get_college_data'). Each stage
+is also a tracing span (core/tracing.py). During a
+request the stage times are summed per stage into the request's context
+(the middleware opens it with collect_stages()); when the response is
+ready they are recorded once per stage under the route's path, next to
+the request's total time as stage 'request'. A batch endpoint that runs
+the formula for 500 colleges therefore records one formula observation:
+the time that request spent in the formula. Stages may nest (e.g.
+get_college_data includes its college_resolution). Outside a request,
+each stage is recorded directly under endpoint 'none'.
+
+Recording costs one perf_counter pair and a dict update per stage; the
+histogram update (a bisect over fixed buckets) happens once per stage per
+request.
+"""
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from core.tracing import span
+
+# Histogram bucket upper bounds in seconds (Prometheus 'le' labels)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Pipeline stages instrumented in the API (plus 'request' for the whole request)
+STAGES = ('college_resolution', 'get_college_data', 'enrichment', 'formula', 'feature_extraction',
+          'scaling', 'model_inference', 'calibration', 'serialization')
+
+METRIC_NAME = 'chancify_stage_latency_seconds'
+
+
+class Histogram:
+    """Counts of observations per latency bucket (the last bucket is +Inf)"""
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class LatencyMetrics:
+    """Histograms keyed by (endpoint, stage)"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, stage_name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((endpoint, stage_name))
+            if histogram is None:
+                histogram = self._histograms[(endpoint, stage_name)] = Histogram()
+            histogram.observe(seconds)
+
+    def observe_request(self, endpoint: str, stages: Dict[str, float], total: float) -> None:
+        """Record one request's per-stage times and its total"""
+        with self._lock:
+            for stage_name, seconds in (*stages.items(), ('request', total)):
+                histogram = self._histograms.get((endpoint, stage_name))
+                if histogram is None:
+                    histogram = self._histograms[(endpoint, stage_name)] = Histogram()
+                histogram.observe(seconds)
+
+    def histogram(self, endpoint: str, stage_name: str) -> Optional[Histogram]:
+        return self._histograms.get((endpoint, stage_name))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """All histograms in the Prometheus text exposition format"""
+        with self._lock:
+            items = sorted((key, list(h.counts), h.sum, h.count) for key, h in self._histograms.items())
+        lines = [
+            f'# HELP {METRIC_NAME} Time spent in each pipeline stage per request, by endpoint.',
+            f'# TYPE {METRIC_NAME} histogram',
+        ]
+        for (endpoint, stage_name), counts, total, count in items:
+            labels = f'endpoint="{_escape(endpoint)}",stage="{_escape(stage_name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip((*LATENCY_BUCKETS, '+Inf'), counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{{labels}}} {total:.9f}')
+            lines.append(f'{METRIC_NAME}_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+latency_metrics = LatencyMetrics()
+
+# Stage name -> seconds for the running request; None outside requests
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_stages', default=None)
+
+
+def record_stage(stage_name: str, seconds: float) -> None:
+    """Add time spent in a stage to the running request (or record it directly)"""
+    stages = _request_stages.get()
+    if stages is None:
+        latency_metrics.observe('none', stage_name, seconds)
+    else:
+        stages[stage_name] = stages.get(stage_name, 0.0) + seconds
+
+
+class stage:
+    """Context manager timing a pipeline stage (and tracing it as a span)"""
+    __slots__ = ('name', 'started', '_span')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._span = span(name)
+
+    def __enter__(self) -> 'stage':
+        self._span.__enter__()
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record_stage(self.name, perf_counter() - self.started)
+        self._span.__exit__(*exc)
+
+
+def timed(stage_name: str) -> Callable:
+    """Decorator timing every call of a function as a stage"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect_stages() -> Iterator[Dict[str, float]]:
+    """Collect the stage times recorded inside the block (per request)"""
+    stages: Dict[str, float] = {}
+    token = _request_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _request_stages.reset(token)
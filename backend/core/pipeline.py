@@ -3,17 +3,60 @@ Complete end-to-end probability calculation pipeline.
 Integrates scoring, probability, and audit modules.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from .scoring import CollegePolicy, compute_composite, apply_conduct_penalty
-from .probability import calculate_probability, probability_to_percentile
-from .audit import AuditReport, build_audit
+from .probability import CalibrationParams, calculate_probability, probability_to_percentile
+from .audit import AuditRow, AuditReport, LazyAuditReport, build_audit
+from .vectorized import calculate_probability_matrix
+
+
+def _build_audit_details(
+    factor_scores: Dict[str, Optional[float]],
+    acceptance_rate: float,
+    probability: float,
+    used_factors: List[str],
+    cluster_note: Optional[str],
+    uses_testing: bool,
+    need_aware: bool
+) -> Tuple[float, List[AuditRow], List[str]]:
+    """
+    Build the non-numeric part of the report: percentile, audit rows and notes.
+    
+    Returns:
+        Tuple of (percentile_estimate, factor_breakdown, policy_notes)
+    """
+    # Estimate percentile
+    percentile = probability_to_percentile(probability, acceptance_rate)
+    
+    # Build audit trail
+    audit_rows = build_audit(
+        scores=factor_scores,
+        used_factors=used_factors
+    )
+    
+    # Compile policy notes
+    conduct_score = factor_scores.get("conduct_record")
+    policy_notes = []
+    if not uses_testing:
+        policy_notes.append("Test-optional: standardized testing scores not used")
+    if not need_aware:
+        policy_notes.append("Need-blind: ability to pay not considered")
+    if cluster_note:
+        policy_notes.append(cluster_note)
+    if conduct_score and conduct_score < 5:
+        penalty = (5.0 - conduct_score) * 8.0
+        policy_notes.append(f"Conduct penalty applied: -{penalty:.0f} points")
+    
+    return percentile, audit_rows, policy_notes
 
 
 def calculate_admission_probability(
     factor_scores: Dict[str, Optional[float]],
     acceptance_rate: float,
     uses_testing: bool = True,
-    need_aware: bool = False
+    need_aware: bool = False,
+    lazy_audit: bool = False,
+    calibration: Optional[CalibrationParams] = None
 ) -> AuditReport:
     """
     Complete pipeline: scores → composite → probability → audit report.
@@ -25,6 +68,13 @@ def calculate_admission_probability(
         acceptance_rate: College's acceptance rate (0-1, e.g., 0.10 for 10%)
         uses_testing: Does college require/consider test scores?
         need_aware: Is college need-aware in admissions?
+        lazy_audit: If True, return a LazyAuditReport that only computes the
+                    numeric results now and builds the percentile, factor
+                    breakdown and policy notes on first access. Use this
+                    when only `.probability` / `.composite_score` are read.
+        calibration: Optional precomputed logistic parameters (e.g. from the
+                     per-college calibration table); derived from the
+                     acceptance rate when omitted.
         
     Returns:
         Complete AuditReport with probability and breakdown
@@ -58,34 +108,33 @@ def calculate_admission_probability(
     # Step 4: Calculate probability
     prob_result = calculate_probability(
         composite_score=final_composite,
-        acceptance_rate=acceptance_rate
+        acceptance_rate=acceptance_rate,
+        calibration=calibration
     )
     
-    # Step 5: Estimate percentile
-    percentile = probability_to_percentile(
-        prob_result.probability,
-        acceptance_rate
-    )
+    # Step 5: Percentile, audit trail and policy notes
+    def build_details():
+        return _build_audit_details(
+            factor_scores=factor_scores,
+            acceptance_rate=acceptance_rate,
+            probability=prob_result.probability,
+            used_factors=scoring_result.used_factors,
+            cluster_note=scoring_result.cluster_note,
+            uses_testing=uses_testing,
+            need_aware=need_aware
+        )
     
-    # Step 6: Build audit trail
-    audit_rows = build_audit(
-        scores=factor_scores,
-        used_factors=scoring_result.used_factors
-    )
+    if lazy_audit:
+        return LazyAuditReport(
+            composite_score=final_composite,
+            probability=prob_result.probability,
+            acceptance_rate=acceptance_rate,
+            build_details=build_details
+        )
     
-    # Step 7: Compile policy notes
-    policy_notes = []
-    if not uses_testing:
-        policy_notes.append("Test-optional: standardized testing scores not used")
-    if not need_aware:
-        policy_notes.append("Need-blind: ability to pay not considered")
-    if scoring_result.cluster_note:
-        policy_notes.append(scoring_result.cluster_note)
-    if conduct_score and conduct_score < 5:
-        penalty = (5.0 - conduct_score) * 8.0
-        policy_notes.append(f"Conduct penalty applied: -{penalty:.0f} points")
+    percentile, audit_rows, policy_notes = build_details()
     
-    # Step 8: Create final report
+    # Step 6: Create final report
     report = AuditReport(
         composite_score=final_composite,
         probability=prob_result.probability,
@@ -105,6 +154,9 @@ def batch_calculate_probabilities(
     """
     Calculate probabilities for multiple colleges at once.
     
+    Composites and probabilities for all colleges come from one pass of
+    the vectorized engine; each report builds its breakdown lazily.
+    
     Args:
         factor_scores: Student's factor scores
         colleges: List of dicts with college info:
@@ -113,22 +165,51 @@ def batch_calculate_probabilities(
     Returns:
         Dictionary mapping college names to AuditReports
     """
+    if not colleges:
+        return {}
+    
+    composites, probabilities = calculate_probability_matrix([factor_scores], colleges)
+    
+    # Scoring metadata only depends on the policy, so share it per policy
+    scoring_by_policy = {}
+    
+    def details_builder(acceptance_rate, probability, uses_testing, need_aware):
+        def build_details():
+            key = (uses_testing, need_aware)
+            if key not in scoring_by_policy:
+                scoring_by_policy[key] = compute_composite(
+                    factor_scores,
+                    CollegePolicy(uses_testing=uses_testing, need_aware=need_aware)
+                )
+            scoring_result = scoring_by_policy[key]
+            return _build_audit_details(
+                factor_scores=factor_scores,
+                acceptance_rate=acceptance_rate,
+                probability=probability,
+                used_factors=scoring_result.used_factors,
+                cluster_note=scoring_result.cluster_note,
+                uses_testing=uses_testing,
+                need_aware=need_aware
+            )
+        return build_details
+    
     results = {}
     
-    for college in colleges:
-        name = college["name"]
+    for j, college in enumerate(colleges):
         acceptance_rate = college["acceptance_rate"]
-        uses_testing = college.get("uses_testing", True)
-        need_aware = college.get("need_aware", False)
+        probability = float(probabilities[0, j])
         
-        report = calculate_admission_probability(
-            factor_scores=factor_scores,
+        results[college["name"]] = LazyAuditReport(
+            composite_score=float(composites[0, j]),
+            probability=probability,
             acceptance_rate=acceptance_rate,
-            uses_testing=uses_testing,
-            need_aware=need_aware
+            build_details=details_builder(
+                acceptance_rate,
+                probability,
+                college.get("uses_testing", True),
+                college.get("need_aware", False)
+            )
         )
-        
-        results[name] = report
     
     return results
 
@@ -0,0 +1,268 @@
+"""
+Preloaded, pre-forked server mode.
+
+A plain uvicorn process imports the app and loads every data service and
+model for itself, so N processes hold N copies. In prefork mode the master
+process loads everything once (all startup components plus the ML
+predictor), then forks the workers, which inherit the loaded state
+copy-on-write and serve the same listening socket.
+
+Copy-on-write only holds while nobody writes to the inherited pages. The
+cyclic garbage collector is the main writer: a collection touches the
+header of every tracked object, which copies the page it lives on in the
+child. The master therefore disables automatic collection while loading
+and calls gc.freeze() right before forking; the inherited objects are
+moved to a permanent generation the children never scan. Each child
+re-enables the collector for its own allocations.
+
+Workers never see each other's reloads: a reload endpoint run in one
+worker only changes that worker, and a re-forked worker would start from
+the master's original preload. Reloads therefore go through the master.
+The reload endpoints call request_reload(), which sends SIGHUP to the
+master (an operator can send it directly too); the master reloads the
+data bundle, the active model and the improvement rules, re-freezes, and
+replaces the workers one at a time with forks of the reloaded state.
+State that lives only in memory (e.g. shadow scoring) is not carried over.
+
+memory_report() reads /proc/<pid>/smaps_rollup to split each worker's
+resident memory into unique (private) and shared pages, which is what to
+size containers by. Linux only; elsewhere serve_preforked() falls back to
+a single in-process server.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds after the workers start before the first memory report
+MEMORY_REPORT_DELAY = 10.0
+
+# Pid of the prefork master, set in its workers (None when not preforked)
+_master_pid: Optional[int] = None
+
+
+def preload() -> None:
+    """Load every startup component and the ML models in this process"""
+    from core.startup import report, startup_components
+    from ml.models.predictor import get_predictor
+
+    started = time.perf_counter()
+    timings = startup_components.load_all()
+    get_predictor()
+    logger.info(f"Preloaded components in {time.perf_counter() - started:.2f}s:\n{report(timings)}")
+
+
+def reload_preloaded() -> None:
+    """Reload the data bundle, the active model and the improvement rules in this process"""
+    from data.data_versions import data_versions
+    from data.improvement_analysis_service import improvement_analysis_service
+    from ml.models.predictor import get_predictor
+
+    started = time.perf_counter()
+    if not data_versions.reload():
+        logger.warning(f"Data reload failed; keeping the previous bundle: {data_versions.last_error}")
+    get_predictor(force_reload=True)
+    improvement_analysis_service.reload_rules()
+    logger.info(f"Reloaded preloaded state in {time.perf_counter() - started:.2f}s")
+
+
+def request_reload() -> bool:
+    """
+    Ask the prefork master to reload and replace every worker.
+
+    Returns:
+        Whether a master was signalled (False outside a preforked worker)
+    """
+    if _master_pid is None:
+        return False
+    try:
+        os.kill(_master_pid, signal.SIGHUP)
+    except OSError as e:
+        logger.warning(f"Could not signal prefork master {_master_pid}: {e}")
+        return False
+    return True
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Resident memory of a process split by sharing (kB), or None if unavailable.
+
+    unique is private to the process (what each extra worker costs);
+    shared is mapped by other processes too (inherited pages not yet
+    copied, shared segments, libraries); pss charges shared pages
+    proportionally, so the sum over processes is their real footprint.
+    """
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        return None
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'unique': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def memory_report(pids: Dict[str, int]) -> str:
+    """Fixed-width table of process_memory() for each labelled pid (MB)"""
+    rows = [('process', 'pid', 'rss MB', 'unique MB', 'shared MB', 'pss MB')]
+    total_pss = 0
+    for label, pid in pids.items():
+        memory = process_memory(pid)
+        if memory is None:
+            rows.append((label, str(pid), '-', '-', '-', '-'))
+            continue
+        total_pss += memory['pss']
+        rows.append((label, str(pid), *(f"{memory[key] / 1024:.1f}" for key in ('rss', 'unique', 'shared', 'pss'))))
+    rows.append(('total', '', '', '', '', f"{total_pss / 1024:.1f}"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app: Any, sock: socket.socket, log_level: str) -> None:
+    """Body of a forked worker: serve until told to stop, then exit"""
+    import uvicorn
+
+    global _master_pid
+    _master_pid = os.getppid()
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1, signal.SIGHUP):
+        signal.signal(signum, signal.SIG_DFL)
+    gc.enable()
+    code = 0
+    try:
+        uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+    except BaseException:
+        logger.exception(f"Worker {os.getpid()} crashed")
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def serve_preforked(app: Any, host: str = '0.0.0.0', port: int = 8000, workers: int = 2,
+                    log_level: str = 'info') -> None:
+    """
+    Preload the app's state, fork workers sharing it, and supervise them.
+
+    Workers that die are re-forked from the preloaded master. SIGHUP
+    reloads the master's state (reload_preloaded) and replaces the workers
+    one at a time. SIGTERM or SIGINT stops all workers; SIGUSR1 logs a
+    memory report.
+
+    Args:
+        app: ASGI app (already imported, so its module state is inherited)
+        host: Interface to bind
+        port: Port to bind
+        workers: Number of worker processes
+        log_level: uvicorn log level for the workers
+    """
+    if not hasattr(os, 'fork'):
+        import uvicorn
+        logger.warning("fork() is unavailable; serving from a single process")
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    gc.disable()
+    preload()
+    sock = _bind(host, port)
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Master {os.getpid()} froze {gc.get_freeze_count()} objects; forking {workers} workers on {host}:{port}")
+
+    children: Dict[int, int] = {}  # pid -> worker number
+    retiring = set()  # replaced workers still finishing their requests
+    state = {'stopping': False, 'report': False, 'reload': False}
+
+    def spawn(number: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(app, sock, log_level)
+        children[pid] = number
+
+    def stop(signum, frame):
+        state['stopping'] = True
+
+    def request_report(signum, frame):
+        state['report'] = True
+
+    def request_master_reload(signum, frame):
+        state['reload'] = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGUSR1, request_report)
+    signal.signal(signal.SIGHUP, request_master_reload)
+
+    for number in range(workers):
+        spawn(number)
+    report_at = time.monotonic() + MEMORY_REPORT_DELAY
+
+    while not state['stopping']:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid and pid in children:
+            number = children.pop(pid)
+            logger.warning(f"Worker {number} (pid {pid}) exited with status {status}; re-forking")
+            spawn(number)
+        elif pid:
+            retiring.discard(pid)
+        if state['reload']:
+            state['reload'] = False
+            try:
+                reload_preloaded()
+            except Exception:
+                logger.exception("Reload failed; workers keep their current state")
+            else:
+                gc.unfreeze()
+                gc.collect()
+                gc.freeze()
+                # Start each replacement before stopping the worker it replaces
+                for old_pid, number in sorted(children.items(), key=lambda c: c[1]):
+                    del children[old_pid]
+                    spawn(number)
+                    retiring.add(old_pid)
+                    try:
+                        os.kill(old_pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        retiring.discard(old_pid)
+                logger.info(f"Replaced workers after reload; {len(retiring)} finishing")
+        if state['report'] or (report_at is not None and time.monotonic() >= report_at):
+            state['report'], report_at = False, None
+            pids = {'master': os.getpid(), **{f'worker {n}': pid for pid, n in sorted(children.items(), key=lambda c: c[1])}}
+            logger.info("Memory by process:\n" + memory_report(pids))
+        time.sleep(0.5)
+
+    logger.info("Stopping workers")
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in list(children) + list(retiring):
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
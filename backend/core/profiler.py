@@ -0,0 +1,295 @@
+"""
+On-demand sampling profiler for single requests.
+
+A request is profiled when it carries the admin header
+(X-Profile-Token: <PROFILE_ADMIN_TOKEN>) or is picked by PROFILE_SAMPLE_RATE,
+and its path is one of PROFILED_PATHS. While it runs, a sampler thread
+reads the stacks of the threads working on it every PROFILE_INTERVAL_MS
+(sys._current_frames(), so any thread can be sampled; a SIGPROF sampler
+only sees the main thread). The capture is written as collapsed stacks,
+one "frame;frame;frame count" line per distinct stack, which flamegraph.pl
+and speedscope read directly:
+
+    backend/logs/profiles/<request id>.collapsed
+    backend/logs/profiles/<request id>.json      (duration, sample count)
+
+A capture never replaces an existing one: when the id is taken (a client
+reusing an X-Request-ID) it is saved under the id plus a random suffix.
+Captures are saved on the tracing writer thread (core.tracing.submit_write),
+ahead of the request's slow-trace line, so the event loop never waits on disk.
+Listing and downloading captures also requires the admin header.
+
+The threads working on a request are the one running the middleware plus
+any thread that enters one of the request's tracing spans (a threadpool
+worker running a traced function is sampled while inside it). Samples of
+the event loop thread waiting in select() are dropped; other requests
+interleaved on the event loop can still appear in a capture, so profile a
+quiet worker when precision matters.
+
+Sampling is off unless requested, and costs one attribute check per span.
+"""
+
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from core.tracing import submit_write, valid_request_id
+
+logger = logging.getLogger(__name__)
+
+# Shared secret for the profiling header and the debug endpoints; both are off when unset
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN', '')
+PROFILE_HEADER = 'x-profile-token'
+# Fraction of eligible requests profiled without the header
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+# Sampling interval in milliseconds
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR',
+    os.path.join(os.path.dirname(__file__), '..', 'logs', 'profiles')
+)
+# Captures kept on disk (oldest are deleted)
+MAX_PROFILES = 100
+MAX_STACK_DEPTH = 200
+
+# Request paths that may be profiled (prefix matches)
+PROFILED_PATHS = ('/api/predict/frontend', '/api/suggest/colleges', '/api/improvement-analysis')
+
+_BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Leaf functions of a thread with nothing to do
+_IDLE_FILES = ('selectors.py',)
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Whether a profiling header value is the admin token (never when no token is configured)"""
+    return bool(token and PROFILE_ADMIN_TOKEN) and hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+
+def should_profile(path: str, token: Optional[str]) -> bool:
+    """Whether a request to path (with the given profiling header) is profiled"""
+    if not path.startswith(PROFILED_PATHS):
+        return False
+    if is_admin(token):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+_labels: Dict[Any, str] = {}
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = os.path.abspath(code.co_filename)
+        if filename.startswith(_BACKEND_DIR + os.sep):
+            filename = os.path.relpath(filename, _BACKEND_DIR)
+        else:
+            filename = '/'.join(filename.split(os.sep)[-2:])
+        label = _labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+    return label
+
+
+def collapse_stack(frame) -> Optional[str]:
+    """Root-first 'a;b;c' stack of a frame, or None for an idle thread"""
+    if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+        return None
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """Periodically samples the stacks of the threads working on one request"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._threads: Dict[int, int] = {}  # thread id -> nesting depth
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enter(self) -> None:
+        """Sample the calling thread until the matching leave()"""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def leave(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Record the current stack of each thread working on the request"""
+        frames = sys._current_frames()
+        with self._lock:
+            idents = list(self._threads)
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame)
+            if stack:
+                self.counts[stack] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """Captured stacks in collapsed format, most frequent first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class profile_request:
+    """
+    Context manager profiling the trace it is given (enter inside trace_request).
+
+    The capture is queued on exit and saved under the trace's request id
+    (see save_profile) by the writer thread, which then records the id it
+    was saved under on the trace.
+    """
+
+    def __init__(self, trace, directory: Optional[str] = None):
+        self.trace = trace
+        self.directory = directory
+        self.sampler = StackSampler()
+
+    def __enter__(self) -> StackSampler:
+        self.trace.sampler = self.sampler
+        self.trace.root.attrs['profiled'] = True
+        self.started = time.perf_counter()
+        self.sampler.enter()
+        self.sampler.start()
+        return self.sampler
+
+    def __exit__(self, *exc) -> None:
+        self.sampler.stop()
+        self.sampler.leave()
+        self.trace.sampler = None
+        trace, sampler = self.trace, self.sampler
+        duration_ms = (time.perf_counter() - self.started) * 1000
+        directory = self.directory or PROFILE_DIR
+
+        def save() -> None:
+            saved = save_profile(trace.request_id, sampler, duration_ms, directory)
+            if saved is not None:
+                trace.root.attrs['profile'] = saved
+        submit_write(save)
+
+
+_save_lock = threading.Lock()
+
+
+def save_profile(request_id: str, sampler: StackSampler, duration_ms: float,
+                 directory: Optional[str] = None) -> Optional[str]:
+    """
+    Write a capture and its metadata, pruning old captures (never raises).
+
+    Existing captures are never overwritten; if request_id already has
+    one, this one is saved under request_id plus a random suffix.
+
+    Returns:
+        The id the capture was saved under, or None if it could not be written
+    """
+    directory = directory or PROFILE_DIR
+    meta = {
+        'request_id': request_id,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()) + 'Z',
+        'duration_ms': round(duration_ms, 3),
+        'samples': sampler.samples,
+        'interval_ms': sampler.interval * 1000,
+        'stacks': len(sampler.counts),
+    }
+    capture_id = request_id
+    try:
+        with _save_lock:
+            os.makedirs(directory, exist_ok=True)
+            try:
+                f = open(os.path.join(directory, f"{capture_id}.collapsed"), 'x')
+            except FileExistsError:
+                capture_id = f"{request_id[:55]}-{uuid.uuid4().hex[:8]}"
+                f = open(os.path.join(directory, f"{capture_id}.collapsed"), 'x')
+            with f:
+                f.write(sampler.collapsed())
+            meta['request_id'] = capture_id
+            with open(os.path.join(directory, f"{capture_id}.json"), 'x') as f:
+                json.dump(meta, f)
+            _prune(directory)
+    except OSError as e:
+        logger.warning(f"Could not save profile for request {request_id}: {e}")
+        return None
+    logger.info(f"Profiled request {request_id} as {capture_id}: {sampler.samples} samples over {duration_ms:.0f}ms")
+    return capture_id
+
+
+def _prune(directory: str) -> None:
+    captures = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith('.json')),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in captures[:max(0, len(captures) - MAX_PROFILES)]:
+        for suffix in ('.json', '.collapsed'):
+            try:
+                os.remove(os.path.join(directory, entry.name[:-len('.json')] + suffix))
+            except OSError:
+                pass
+
+
+def list_profiles(directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Metadata of the saved captures, newest first"""
+    directory = directory or PROFILE_DIR
+    profiles = []
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.name.endswith('.json')]
+    except OSError:
+        return []
+    for entry in entries:
+        try:
+            with open(entry.path) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda meta: meta.get('timestamp', ''), reverse=True)
+
+
+def profile_path(request_id: str, directory: Optional[str] = None) -> str:
+    """
+    Path of a saved capture.
+
+    Raises:
+        KeyError: if the id is malformed or there is no capture for it
+    """
+    if not valid_request_id(request_id):
+        raise KeyError(request_id)
+    path = os.path.join(directory or PROFILE_DIR, f"{request_id}.collapsed")
+    if not os.path.exists(path):
+        raise KeyError(request_id)
+    return path
@@ -0,0 +1,218 @@
+"""
+Lazy, dependency-ordered initialization of heavy components.
+
+Services that parse data files or build clients are declared as components
+of a ComponentGraph instead of being constructed at import time. Each
+component names the components it needs. It is built on first use (after
+its dependencies), or by load_all(), which builds independent components
+concurrently on a thread pool as soon as their dependencies are ready.
+Importing the API therefore loads no data and /api/health answers
+immediately. Builds block the calling thread, so while the background
+warm-up runs (warming_up()) the API holds requests back without blocking
+the event loop (see main's warmup_middleware) instead of letting them
+build components on it. Once warm-up has finished, failed or never
+started (STARTUP_WARMUP=0), requests build what they use on first use.
+
+Every build is timed; report() renders the per-component timing table
+logged at boot.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Worker threads used by load_all() (most builds are I/O or parsing bound)
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class ComponentTiming:
+    """Build record of one component"""
+    name: str
+    depends_on: Tuple[str, ...]
+    state: str  # pending | loading | ready | failed
+    started: Optional[float] = None  # seconds after the graph was created
+    seconds: Optional[float] = None
+    thread: Optional[str] = None
+    error: Optional[str] = None
+
+
+class _Component:
+    def __init__(self, name: str, factory: Callable[[], Any], depends_on: Tuple[str, ...]):
+        self.factory = factory
+        self.instance = None
+        self.lock = threading.Lock()
+        self.timing = ComponentTiming(name, depends_on, 'pending')
+
+
+class ComponentGraph:
+    """Named components with dependencies, each built at most once"""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._warmup: Optional[threading.Thread] = None
+        self.created_at = time.perf_counter()
+
+    def add(self, name: str, factory: Callable[[], Any], depends_on: Sequence[str] = ()) -> 'LazyComponent':
+        """
+        Declare a component.
+
+        Dependencies must be declared first, which also rules out cycles.
+
+        Args:
+            name: Component name
+            factory: Builds the instance (called once, on first use)
+            depends_on: Components that must be built before this one
+
+        Returns:
+            A proxy that builds the component on first attribute access
+
+        Raises:
+            ValueError: if the name is taken or a dependency is unknown
+        """
+        if name in self._components:
+            raise ValueError(f"Component {name!r} is already declared")
+        unknown = [dep for dep in depends_on if dep not in self._components]
+        if unknown:
+            raise ValueError(f"Component {name!r} depends on undeclared components {unknown}")
+        self._components[name] = _Component(name, factory, tuple(depends_on))
+        return LazyComponent(self, name)
+
+    def get(self, name: str) -> Any:
+        """
+        The built instance of a component, building it (and its dependencies) if needed.
+
+        Raises:
+            KeyError: if the component is not declared
+            Exception: whatever the factory raised; a later call retries
+        """
+        component = self._components[name]
+        if component.timing.state == 'ready':
+            return component.instance
+        for dep in component.timing.depends_on:
+            self.get(dep)
+        with component.lock:
+            if component.timing.state != 'ready':
+                self._build(component)
+        return component.instance
+
+    def _build(self, component: _Component) -> None:
+        timing = component.timing
+        started = time.perf_counter()
+        timing.state = 'loading'
+        timing.started = started - self.created_at
+        timing.thread = threading.current_thread().name
+        try:
+            component.instance = component.factory()
+        except Exception as e:
+            timing.state, timing.error = 'failed', str(e)
+            timing.seconds = time.perf_counter() - started
+            logger.error(f"Component {timing.name} failed to initialize: {e}")
+            raise
+        timing.seconds = time.perf_counter() - started
+        timing.state, timing.error = 'ready', None
+
+    def is_ready(self, name: str) -> bool:
+        return self._components[name].timing.state == 'ready'
+
+    def warming_up(self) -> bool:
+        """Whether a load_in_background() warm-up is still running"""
+        return self._warmup is not None and self._warmup.is_alive()
+
+    def load_all(self, max_workers: int = DEFAULT_WORKERS) -> List[ComponentTiming]:
+        """
+        Build every component, running independent ones concurrently.
+
+        A component whose dependency failed is left pending. Failures are
+        recorded in the timings rather than raised.
+
+        Returns:
+            The timings, in declaration order
+        """
+        done = {name for name in self._components if self.is_ready(name)}
+        pending = {name: set(c.timing.depends_on) for name, c in self._components.items() if name not in done}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='startup') as pool:
+            running = {}
+            while pending or running:
+                blocked = [name for name, deps in pending.items() if deps & failed]
+                while blocked:
+                    for name in blocked:
+                        del pending[name]
+                        failed.add(name)
+                    blocked = [name for name, deps in pending.items() if deps & failed]
+                for name in [name for name, deps in pending.items() if deps <= done]:
+                    del pending[name]
+                    running[pool.submit(self.get, name)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    (failed if future.exception() else done).add(name)
+        return self.timings()
+
+    def load_in_background(self, on_done: Optional[Callable[[List[ComponentTiming]], None]] = None,
+                           max_workers: int = DEFAULT_WORKERS) -> threading.Thread:
+        """Run load_all() on a daemon thread, then call on_done(timings)"""
+        def run():
+            timings = self.load_all(max_workers)
+            if on_done is not None:
+                on_done(timings)
+
+        thread = threading.Thread(target=run, name='startup-warmup', daemon=True)
+        self._warmup = thread
+        thread.start()
+        return thread
+
+    def timings(self) -> List[ComponentTiming]:
+        return [component.timing for component in self._components.values()]
+
+    def status(self) -> Dict[str, str]:
+        """Component name -> state"""
+        return {name: component.timing.state for name, component in self._components.items()}
+
+
+def report(timings: List[ComponentTiming]) -> str:
+    """Render timings as a fixed-width table"""
+    rows = [('component', 'depends on', 'state', 'start s', 'time s', 'thread')]
+    for t in timings:
+        rows.append((
+            t.name,
+            ', '.join(t.depends_on) or '-',
+            t.state if t.error is None else f'{t.state}: {t.error[:40]}',
+            '-' if t.started is None else f'{t.started:.3f}',
+            '-' if t.seconds is None else f'{t.seconds:.3f}',
+            t.thread or '-'
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+
+class LazyComponent:
+    """Module-level stand-in for a component, built on first attribute access"""
+
+    def __init__(self, graph: ComponentGraph, name: str):
+        self._graph = graph
+        self._name = name
+
+    def __getattr__(self, name: str):
+        return getattr(self._graph.get(self._name), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._graph.get(self._name), name, value)
+
+    def __repr__(self) -> str:
+        return f"<LazyComponent {self._name}>"
+
+
+# Components of the running API (warmed up by main's startup event)
+startup_components = ComponentGraph()
@@ -0,0 +1,293 @@
+"""
+Request-scoped tracing.
+
+Each request runs inside a trace: a root span held in a context variable.
+Code along the request path opens child spans:
+
+    with span('real_ipeds_mapping.get_colleges_for_major', major=major):
+        ...
+
+or decorates a function (sync or async) with @traced('predictor.predict').
+Pipeline stages timed by core.metrics.stage are spans too, and calls to
+methods of the versioned data services (real_ipeds_mapping,
+college_names_mapping, ...) are traced automatically. Outside a trace
+(startup, background threads) spans are no-ops.
+
+Traces are kept in memory for the request only. A request that takes at
+least SLOW_REQUEST_MS has its full span tree appended as one JSON line to
+SLOW_REQUEST_LOG, tagged with the request id that is also returned in the
+X-Request-ID response header. Finding what made a slow request slow
+therefore needs no verbose logging:
+
+    grep <request id> backend/logs/slow_requests.jsonl
+
+The request only queues the write: file I/O runs on one background writer
+thread (submit_write), so the event loop never blocks on disk.
+flush_writes() waits for queued writes, e.g. before reading the log back.
+"""
+
+import inspect
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Caller-supplied request ids accepted as-is (others are replaced by a generated id)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Requests at least this slow (ms) have their span tree written out
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '1000'))
+# JSONL file of slow request traces
+SLOW_REQUEST_LOG = os.environ.get(
+    'SLOW_REQUEST_LOG',
+    os.path.join(os.path.dirname(__file__), '..', 'logs', 'slow_requests.jsonl')
+)
+# The log is rotated to <file>.1 past this size
+SLOW_REQUEST_LOG_MAX_BYTES = 10 * 1024 * 1024
+# Spans kept per trace (a runaway loop cannot grow a trace without bound)
+MAX_SPANS_PER_TRACE = 2000
+
+
+class Span:
+    """One timed operation and the operations it called"""
+    __slots__ = ('name', 'attrs', 'started', 'duration', 'error', 'children', 'trace')
+
+    def __init__(self, name: str, attrs: Dict[str, Any], trace: 'Trace'):
+        self.name = name
+        self.attrs = attrs
+        self.started = perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.children: List['Span'] = []
+        self.trace = trace
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """Span tree with times in ms relative to origin (the trace start)"""
+        node = {
+            'name': self.name,
+            'start_ms': round((self.started - origin) * 1000, 3),
+            'duration_ms': None if self.duration is None else round(self.duration * 1000, 3),
+        }
+        if self.attrs:
+            node['attrs'] = self.attrs
+        if self.error:
+            node['error'] = self.error
+        if self.children:
+            node['children'] = [child.to_dict(origin) for child in self.children]
+        return node
+
+
+class Trace:
+    """The spans of one request"""
+
+    def __init__(self, request_id: str, name: str, **attrs):
+        self.request_id = request_id
+        self.timestamp = time.time()
+        self.span_count = 1
+        self.dropped_spans = 0
+        self.root = Span(name, attrs, self)
+        # StackSampler while the request is profiled (core/profiler.py)
+        self.sampler = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.root.started + self.root.duration if self.root.duration is not None else perf_counter()
+        return (end - self.root.started) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            'request_id': self.request_id,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(self.timestamp)) + 'Z',
+            'duration_ms': round(self.duration_ms, 3),
+            'spans': self.root.to_dict(self.root.started),
+        }
+        if self.dropped_spans:
+            record['dropped_spans'] = self.dropped_spans
+        return record
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    parent = _current_span.get()
+    return parent.trace if parent is not None else None
+
+
+def valid_request_id(value: str) -> bool:
+    """Whether value is a safe request id (ASCII letters, digits, '-' and '_', at most 64)"""
+    return bool(REQUEST_ID_PATTERN.match(value))
+
+
+def current_request_id() -> Optional[str]:
+    """Id of the request being traced, if any (for log lines)"""
+    trace = current_trace()
+    return trace.request_id if trace is not None else None
+
+
+def tracing_active() -> bool:
+    return _current_span.get() is not None
+
+
+class span:
+    """Context manager for a child span of the current one (no-op outside a trace)"""
+    __slots__ = ('name', 'attrs', '_span', '_token')
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self._span: Optional[Span] = None
+
+    def __enter__(self) -> 'span':
+        parent = _current_span.get()
+        if parent is not None:
+            trace = parent.trace
+            if trace.span_count < MAX_SPANS_PER_TRACE:
+                trace.span_count += 1
+                self._span = Span(self.name, self.attrs, trace)
+                parent.children.append(self._span)
+                self._token = _current_span.set(self._span)
+                if trace.sampler is not None:
+                    trace.sampler.enter()
+            else:
+                trace.dropped_spans += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        current = self._span
+        if current is None:
+            return
+        current.duration = perf_counter() - current.started
+        if exc_type is not None:
+            current.error = exc_type.__name__
+        _current_span.reset(self._token)
+        if current.trace.sampler is not None:
+            current.trace.sampler.leave()
+
+    def set(self, **attrs) -> None:
+        """Attach attributes to the span (ignored outside a trace)"""
+        if self._span is not None:
+            self._span.attrs.update(attrs)
+
+
+def traced(name: str) -> Callable:
+    """Decorator running every call of a function (sync or async) in a span"""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class trace_request:
+    """
+    Context manager tracing one request.
+
+    On exit the trace is written to the slow-request log if it took at
+    least SLOW_REQUEST_MS.
+    """
+
+    def __init__(self, name: str, request_id: Optional[str] = None, **attrs):
+        self.trace = Trace(request_id or uuid.uuid4().hex[:16], name, **attrs)
+
+    def __enter__(self) -> Trace:
+        self._token = _current_span.set(self.trace.root)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        root = self.trace.root
+        root.duration = perf_counter() - root.started
+        if exc_type is not None:
+            root.error = exc_type.__name__
+        _current_span.reset(self._token)
+        if self.trace.duration_ms >= SLOW_REQUEST_MS:
+            trace, path = self.trace, SLOW_REQUEST_LOG
+            submit_write(lambda: write_slow_trace(trace, path))
+
+
+# Queued file writes (slow traces, profile captures), run in order by one thread
+_writes: 'queue.Queue[Callable[[], None]]' = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def submit_write(job: Callable[[], None]) -> None:
+    """Run job on the background writer thread, after every job queued before it"""
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_write_loop, name='trace-writer', daemon=True)
+            _writer.start()
+    _writes.put(job)
+
+
+def _write_loop() -> None:
+    while True:
+        job = _writes.get()
+        try:
+            job()
+        except Exception as e:
+            logger.warning(f"Background trace write failed: {e}")
+        finally:
+            _writes.task_done()
+
+
+def flush_writes() -> None:
+    """Block until every queued write has run"""
+    _writes.join()
+
+
+_log_lock = threading.Lock()
+
+
+def write_slow_trace(trace: Trace, path: Optional[str] = None) -> None:
+    """Append a trace to the slow-request log (never raises)"""
+    path = path or SLOW_REQUEST_LOG
+    line = json.dumps(trace.to_dict(), default=str)
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) > SLOW_REQUEST_LOG_MAX_BYTES:
+                os.replace(path, path + '.1')
+            with open(path, 'a') as f:
+                f.write(line + '\n')
+    except OSError as e:
+        logger.warning(f"Could not write slow request trace {trace.request_id}: {e}")
+        return
+    logger.info(f"Slow request {trace.request_id} ({trace.duration_ms:.0f}ms) traced to {path}")
+
+
+def read_slow_traces(limit: int = 20, path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """The most recent slow-request traces, newest first"""
+    path = path or SLOW_REQUEST_LOG
+    try:
+        with open(path) as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return []
+    traces = []
+    for line in reversed(lines):
+        try:
+            traces.append(json.loads(line))
+        except ValueError:
+            continue  # partially written line
+    return traces
@@ -0,0 +1,243 @@
+"""
+Array-native formula engine.
+Computes composites and probabilities for many profiles and colleges at once
+using the same weights, policy gates and calibration as the scalar pipeline.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from .weights import FACTOR_WEIGHTS, CLUSTER_FACTORS
+
+# Fixed factor order used by every array in this module
+FACTOR_ORDER: Tuple[str, ...] = tuple(FACTOR_WEIGHTS.keys())
+FACTOR_INDEX: Dict[str, int] = {factor: i for i, factor in enumerate(FACTOR_ORDER)}
+
+# Compiled weight vector and factor masks (same order as FACTOR_ORDER)
+WEIGHT_VECTOR = np.array([FACTOR_WEIGHTS[f] for f in FACTOR_ORDER], dtype=np.float64)
+CLUSTER_MASK = np.array([f in CLUSTER_FACTORS for f in FACTOR_ORDER])
+TESTING_INDEX = FACTOR_INDEX["testing"]
+ABILITY_TO_PAY_INDEX = FACTOR_INDEX["ability_to_pay"]
+CONDUCT_INDEX = FACTOR_INDEX["conduct_record"]
+
+NEUTRAL_SCORE = 5.0
+CLUSTER_DAMPENING = 0.85
+
+
+def scores_to_matrix(
+    profiles: Sequence[Dict[str, Optional[float]]]
+) -> np.ndarray:
+    """
+    Pack factor score dicts into an (M, F) matrix in FACTOR_ORDER.
+
+    Missing or None scores become NaN so the engine can tell them apart
+    from real values (neutral defaults are applied later).
+
+    Args:
+        profiles: List of factor score dicts (0-10 scale)
+
+    Returns:
+        float64 array of shape (len(profiles), len(FACTOR_ORDER))
+    """
+    matrix = np.full((len(profiles), len(FACTOR_ORDER)), np.nan)
+    for i, scores in enumerate(profiles):
+        for factor, value in scores.items():
+            j = FACTOR_INDEX.get(factor)
+            if j is not None and value is not None:
+                matrix[i, j] = value
+    return matrix
+
+
+def policy_weight_matrix(
+    uses_testing: np.ndarray,
+    need_aware: np.ndarray
+) -> np.ndarray:
+    """
+    Build per-policy weight vectors with the policy gates applied as masks.
+
+    Args:
+        uses_testing: Boolean array, one entry per policy
+        need_aware: Boolean array, one entry per policy
+
+    Returns:
+        Array of shape (P, F) with gated factors zeroed out
+    """
+    uses_testing = np.atleast_1d(np.asarray(uses_testing, dtype=bool))
+    need_aware = np.atleast_1d(np.asarray(need_aware, dtype=bool))
+
+    weights = np.broadcast_to(
+        WEIGHT_VECTOR, (len(uses_testing), len(FACTOR_ORDER))
+    ).copy()
+    weights[~uses_testing, TESTING_INDEX] = 0.0
+    weights[~need_aware, ABILITY_TO_PAY_INDEX] = 0.0
+    return weights
+
+
+def compute_composites(
+    score_matrix: np.ndarray,
+    uses_testing=True,
+    need_aware=False
+) -> np.ndarray:
+    """
+    Vectorized equivalent of compute_composite + apply_conduct_penalty.
+
+    Composites for all profiles come from one matrix product against the
+    policy-gated weights, split into non-cluster and cluster columns so the
+    anti-double-counting dampening can be applied per profile.
+
+    Args:
+        score_matrix: (M, F) raw scores from scores_to_matrix (NaN = missing)
+        uses_testing: Scalar or (P,) boolean array of college policies
+        need_aware: Scalar or (P,) boolean array of college policies
+
+    Returns:
+        (M,) composites for scalar policies, otherwise (M, P)
+    """
+    scalar_policy = np.ndim(uses_testing) == 0 and np.ndim(need_aware) == 0
+    uses_testing, need_aware = np.broadcast_arrays(
+        np.atleast_1d(uses_testing), np.atleast_1d(need_aware)
+    )
+
+    # Neutral defaults and clamping (policy gates are handled by zero weights)
+    raw_conduct = score_matrix[:, CONDUCT_INDEX]
+    scores = np.clip(np.where(np.isnan(score_matrix), NEUTRAL_SCORE, score_matrix), 0.0, 10.0)
+
+    # Cluster dampening: 2+ cluster factors scoring >= 8
+    high_cluster = (scores[:, CLUSTER_MASK] >= 8.0).sum(axis=1) >= 2
+    damp = np.where(high_cluster, CLUSTER_DAMPENING, 1.0)[:, None]
+
+    # One product yields both weighted-sum halves for every policy
+    weights = policy_weight_matrix(uses_testing, need_aware)
+    base_weights = np.where(CLUSTER_MASK, 0.0, weights)
+    cluster_weights = np.where(CLUSTER_MASK, weights, 0.0)
+    stacked = np.concatenate([base_weights, cluster_weights], axis=0).T
+    sums = scores @ stacked
+    n_policies = weights.shape[0]
+    weighted_sum = sums[:, :n_policies] + damp * sums[:, n_policies:]
+    sum_weights = base_weights.sum(axis=1) + damp * cluster_weights.sum(axis=1)
+
+    composite = (weighted_sum / (10.0 * sum_weights)) * 1000.0
+
+    # Conduct penalty uses the raw (unclamped, non-defaulted) score
+    with np.errstate(invalid="ignore"):
+        penalty = np.where(raw_conduct < 5, (5.0 - raw_conduct) * 8.0, 0.0)
+    composite = np.maximum(0.0, composite - penalty[:, None])
+
+    return composite[:, 0] if scalar_policy else composite
+
+
+def default_calibration_arrays(
+    acceptance_rates: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized equivalent of probability.default_calibration.
+
+    Args:
+        acceptance_rates: (N,) acceptance rates (0-1)
+
+    Returns:
+        Tuple of (A, C) arrays of shape (N,)
+    """
+    R = np.clip(np.asarray(acceptance_rates, dtype=np.float64), 0.03, 0.80)
+    A = np.where(R < 0.15, 0.012 + 0.02 * (0.15 - R), 0.012)
+    C = 600.0 - (1.0 / A) * np.log(R / (1.0 - R))
+    return A, C
+
+
+def calibration_arrays(
+    acceptance_rates: Sequence[float],
+    unitids: Optional[Sequence] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Logistic parameters (A, C) for N colleges, as the scalar pipeline picks them.
+
+    Colleges with a unitid take their row of the serving calibration table
+    (calibration_table.get_calibration_table); the rest, and colleges whose
+    acceptance rate is overridden, are derived from their rate.
+
+    Returns:
+        Tuple of (A, C) arrays of shape (N,)
+    """
+    if unitids is not None:
+        from .calibration_table import get_calibration_table
+        table = get_calibration_table()
+        if table is not None:
+            return table.calibration_arrays(unitids, acceptance_rates)
+    return default_calibration_arrays(acceptance_rates)
+
+
+def logistic_probs(
+    composites: np.ndarray,
+    A: np.ndarray,
+    C: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized equivalent of probability.logistic_prob.
+
+    Broadcasts composites against calibration parameters, e.g. (M, 1)
+    composites against (N,) parameters gives an (M, N) grid.
+
+    Returns:
+        Probabilities clamped to [0.02, 0.85]
+    """
+    exponent = np.clip(-A * (composites - C), -100.0, 100.0)
+    probability = 1.0 / (1.0 + np.exp(exponent))
+    return np.clip(probability, 0.02, 0.85)
+
+
+def calculate_probability_matrix(
+    profiles: Sequence[Dict[str, Optional[float]]],
+    colleges: List[dict]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score M profiles against N colleges in one pass.
+
+    Args:
+        profiles: List of factor score dicts
+        colleges: List of dicts with "acceptance_rate" and optional
+                  "uses_testing" / "need_aware" / "unitid" (same shape as
+                  batch_calculate_probabilities; see calibration_arrays)
+
+    Returns:
+        Tuple of (composites, probabilities), both of shape (M, N)
+    """
+    score_matrix = scores_to_matrix(profiles)
+    acceptance_rates = np.array([c["acceptance_rate"] for c in colleges], dtype=np.float64)
+    uses_testing = np.array([c.get("uses_testing", True) for c in colleges], dtype=bool)
+    need_aware = np.array([c.get("need_aware", False) for c in colleges], dtype=bool)
+
+    composites = compute_composites(score_matrix, uses_testing, need_aware)
+    A, C = calibration_arrays(acceptance_rates, [c.get("unitid") for c in colleges])
+    probabilities = logistic_probs(composites, A, C)
+
+    return composites, probabilities
+
+
+# Example usage and parity check against the scalar pipeline
+if __name__ == "__main__":
+    from .pipeline import calculate_admission_probability
+
+    rng = np.random.default_rng(0)
+    profiles = [
+        {factor: float(rng.uniform(0, 10)) for factor in FACTOR_ORDER if rng.random() > 0.2}
+        for _ in range(200)
+    ]
+    colleges = [
+        {"name": f"College {i}", "acceptance_rate": float(rate),
+         "uses_testing": bool(rng.random() > 0.3), "need_aware": bool(rng.random() > 0.5)}
+        for i, rate in enumerate(rng.uniform(0.02, 0.9, size=50))
+    ]
+
+    composites, probabilities = calculate_probability_matrix(profiles, colleges)
+
+    max_diff = 0.0
+    for i, scores in enumerate(profiles):
+        for j, college in enumerate(colleges):
+            report = calculate_admission_probability(
+                scores, college["acceptance_rate"],
+                college["uses_testing"], college["need_aware"]
+            )
+            max_diff = max(max_diff, abs(report.probability - probabilities[i, j]))
+
+    print(f"Scored {probabilities.size} profile x college pairs")
+    print(f"Max |vectorized - scalar| probability difference: {max_diff:.2e}")
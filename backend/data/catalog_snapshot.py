@@ -0,0 +1,176 @@
+"""
+Binary columnar snapshot of the college catalog.
+
+real_colleges_integrated.csv used to be text-parsed with dtype inference by
+every consumer at every startup (and by get_college_data on every call).
+The snapshot compiles it once into fixed-dtype numpy columns and UTF-8
+string tables in the shared data segment (see data.shared_store); workers
+map it read-only, so opening the catalog is a handful of mmap calls.
+
+The snapshot version is the content hash of the CSV: it names the segment
+directory, and caches derived from catalog data can key on it. Build it
+ahead of a deploy with:
+
+    python -m data.catalog_snapshot [path/to/catalog.csv]
+"""
+
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_versions import current_bundle
+from .shared_store import SHARED_DATA_DIR, StringColumn, attach, encode_strings, source_hash
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CSV_PATH = os.path.join(os.path.dirname(__file__), 'raw', 'real_colleges_integrated.csv')
+
+# Fixed column dtypes; columns not listed are stored as float64 when numeric, else text
+CATALOG_SCHEMA = {
+    'name': 'str',
+    'city': 'str',
+    'state': 'str',
+    'tuition_in_state_usd': 'float64',
+    'tuition_out_of_state_usd': 'float64',
+    'avg_net_price_usd': 'float64',
+    'selectivity_tier': 'str',
+    'acceptance_rate': 'float64',
+    'accepted_per_year': 'float64',
+    'applicants_total': 'float64',
+    'student_body_size': 'float64',
+    'unitid': 'int64',
+    'data_completeness': 'float64',
+    'gpa_average': 'float64',
+    'test_policy': 'str',
+    'financial_aid_policy': 'str',
+    'control': 'str',
+    'major_1': 'str',
+    'major_2': 'str',
+    'major_3': 'str',
+}
+
+
+def compile_catalog(csv_path: str = CATALOG_CSV_PATH) -> Dict[str, np.ndarray]:
+    """
+    Parse the catalog CSV into snapshot arrays.
+
+    Numeric columns are stored as '<column>' arrays; text columns as a
+    '<column>.blob'/'<column>.offsets' string table plus a '<column>.valid'
+    mask for missing cells. 'columns' keeps the CSV column order.
+
+    Raises:
+        ValueError: if a column does not fit its schema dtype
+    """
+    text_columns = [name for name, dtype in CATALOG_SCHEMA.items() if dtype == 'str']
+    df = pd.read_csv(csv_path, dtype={name: object for name in text_columns})
+
+    arrays = {f'columns.{key}': value for key, value in encode_strings([str(c) for c in df.columns]).items()}
+    for name in df.columns:
+        dtype = CATALOG_SCHEMA.get(name) or ('float64' if pd.api.types.is_numeric_dtype(df[name]) else 'str')
+        if dtype == 'str':
+            values = df[name].tolist()
+            valid = np.array([isinstance(v, str) for v in values], dtype=bool)
+            strings = encode_strings([v if isinstance(v, str) else '' for v in values])
+            arrays.update({f'{name}.{key}': value for key, value in strings.items()})
+            arrays[f'{name}.valid'] = valid
+            continue
+        try:
+            arrays[name] = df[name].to_numpy(dtype=dtype)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Catalog column {name!r} does not fit dtype {dtype}: {e}") from e
+    return arrays
+
+
+class CatalogSnapshot:
+    """Read-only view of one catalog version"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], version: str, source: str):
+        self.arrays = arrays
+        self.version = version
+        self.source = source
+        self.columns = StringColumn(arrays, 'columns').tolist()
+        first = self.columns[0] if self.columns else None
+        if first is None:
+            self.num_rows = 0
+        else:
+            self.num_rows = len(self._valid(first) if self.is_text(first) else arrays[first])
+        self._text: Dict[str, List[Optional[str]]] = {}
+        self._positions: Dict[str, Dict] = {}
+        self._frame: Optional[pd.DataFrame] = None
+
+    def is_text(self, name: str) -> bool:
+        return f'{name}.blob' in self.arrays
+
+    def _valid(self, name: str) -> np.ndarray:
+        return self.arrays[f'{name}.valid']
+
+    def column(self, name: str) -> Union[np.ndarray, List[Optional[str]]]:
+        """
+        One column: a read-only array for numbers, a list of str/None for text.
+
+        Raises:
+            KeyError: if the column is not in the catalog
+        """
+        if name not in self.columns:
+            raise KeyError(name)
+        if not self.is_text(name):
+            return self.arrays[name]
+        if name not in self._text:
+            values = StringColumn(self.arrays, name).tolist()
+            self._text[name] = [
+                value if valid else None for value, valid in zip(values, self._valid(name).tolist())
+            ]
+        return self._text[name]
+
+    def position(self, column: str, value) -> Optional[int]:
+        """Row of the first exact match of value in column, or None"""
+        if column not in self._positions:
+            values = self.column(column)
+            positions: Dict = {}
+            for i, v in enumerate(values.tolist() if isinstance(values, np.ndarray) else values):
+                positions.setdefault(v, i)
+            self._positions[column] = positions
+        return self._positions[column].get(value)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The catalog as a DataFrame, built once per worker and shared.
+
+        Numeric columns are views of the mapped arrays (no copy); text
+        columns get the same dtype read_csv would give them. Treat it as
+        read-only.
+        """
+        if self._frame is None:
+            data = {}
+            for name in self.columns:
+                if self.is_text(name):
+                    data[name] = pd.Series([np.nan if v is None else v for v in self.column(name)])
+                else:
+                    data[name] = self.arrays[name]
+            self._frame = pd.DataFrame(data, columns=self.columns, copy=False)
+        return self._frame
+
+
+def load_catalog_snapshot(csv_path: str = CATALOG_CSV_PATH) -> CatalogSnapshot:
+    """Attach to the snapshot of csv_path, compiling it if this version is new"""
+    version = source_hash([csv_path])
+    arrays = attach('catalog', [csv_path], lambda: compile_catalog(csv_path), version=version)
+    snapshot = CatalogSnapshot(arrays, version, csv_path)
+    logger.info(f"Opened catalog snapshot {version}: {snapshot.num_rows} rows, {len(snapshot.columns)} columns")
+    return snapshot
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """The catalog snapshot of the data version serving this request"""
+    return current_bundle().catalog
+
+
+if __name__ == "__main__":
+    # Pre-build the snapshot (e.g. in the deploy step) so no worker compiles it at startup
+    snapshot = load_catalog_snapshot(sys.argv[1] if len(sys.argv) > 1 else CATALOG_CSV_PATH)
+    print(f"Catalog snapshot {snapshot.version}: {snapshot.num_rows} rows x {len(snapshot.columns)} columns")
+    print(f"Stored under {os.path.join(SHARED_DATA_DIR, 'catalog-' + snapshot.version)}")
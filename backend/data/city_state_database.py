@@ -7,10 +7,17 @@ Provides mapping between colleges and their states for accurate zipcode-based tu
 import pandas as pd
 import os
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+
+from core.startup import startup_components
+from .derived_cache import cached_index
 
 logger = logging.getLogger(__name__)
 
+COLLEGE_STATE_ZIP_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'College_State_Zip.csv')
+if not os.path.exists(COLLEGE_STATE_ZIP_PATH):
+    COLLEGE_STATE_ZIP_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'College_State_Zip.csv')
+
 class CityStateDatabase:
     def __init__(self):
         """Initialize the city-state database"""
@@ -19,31 +26,35 @@ class CityStateDatabase:
         self.load_database()
     
     def load_database(self):
-        """Load the college-to-state mapping from CSV files"""
+        """Load the college-to-state mapping from CSV files (the built index is cached on disk)"""
         try:
-            # Load from College_State_Zip.csv
-            csv_path = os.path.join(os.path.dirname(__file__), '..', '..', 'College_State_Zip.csv')
-            if not os.path.exists(csv_path):
-                csv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'College_State_Zip.csv')
-            
-            df = pd.read_csv(csv_path)
-            logger.info(f"Loaded college-state mapping: {len(df)} colleges")
-            
-            for _, row in df.iterrows():
-                college_name = str(row['College']).strip()
-                state = str(row['State']).strip()
-                
-                # Store college to state mapping
-                self.college_to_state[college_name.lower()] = state
-                
-                # Extract city name from college name (simplified approach)
-                city_name = self.extract_city_from_college_name(college_name)
-                if city_name:
-                    self.city_to_state[city_name.lower()] = state
-                    
+            self.college_to_state, self.city_to_state = cached_index(
+                'city-state', [COLLEGE_STATE_ZIP_PATH], self._build_index
+            )
+            logger.info(f"Loaded college-state mapping: {len(self.college_to_state)} colleges")
         except Exception as e:
             logger.error(f"Error loading city-state database: {e}")
     
+    def _build_index(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """College -> state and city -> state, from College_State_Zip.csv"""
+        df = pd.read_csv(COLLEGE_STATE_ZIP_PATH)
+        college_to_state = {}
+        city_to_state = {}
+        
+        for college, state in zip(df['College'].tolist(), df['State'].tolist()):
+            college_name = str(college).strip()
+            state = str(state).strip()
+            
+            # Store college to state mapping
+            college_to_state[college_name.lower()] = state
+            
+            # Extract city name from college name (simplified approach)
+            city_name = self.extract_city_from_college_name(college_name)
+            if city_name:
+                city_to_state[city_name.lower()] = state
+        
+        return college_to_state, city_to_state
+    
     def extract_city_from_college_name(self, college_name: str) -> Optional[str]:
         """
         Extract city name from college name using common patterns
@@ -132,5 +143,5 @@ class CityStateDatabase:
             return False
         return city_state.upper() == target_state.upper()
 
-# Global instance
-city_state_database = CityStateDatabase()
+# Global instance (built on first use or by startup warm-up)
+city_state_database = startup_components.add('city_state_database', CityStateDatabase)
@@ -11,6 +11,37 @@ import os
 from typing import Dict, List, Optional, Tuple
 import re
 
+from .data_versions import VersionedService
+from .derived_cache import cached_index
+from .shared_store import StringColumn, attach, encode_strings
+
+NAMES_SHEET_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'therealdatabase', 'College_Names_and_Nicknames.xlsx')
+# Alternative path if the above doesn't work
+if not os.path.exists(NAMES_SHEET_PATH):
+    NAMES_SHEET_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'therealdatabase', 'College_Names_and_Nicknames.xlsx')
+
+
+def compile_names_sheet(path: str = NAMES_SHEET_PATH) -> Dict:
+    """Every sheet column as a string table (blank cells become '')"""
+    df = pd.read_excel(path)
+    arrays = {f'columns.{key}': value for key, value in encode_strings([str(c) for c in df.columns]).items()}
+    for i, column in enumerate(df.columns):
+        values = [str(v).strip() if pd.notna(v) else '' for v in df[column].tolist()]
+        arrays.update({f'col{i}.{key}': value for key, value in encode_strings(values).items()})
+    return arrays
+
+
+def load_names_sheet(path: str = NAMES_SHEET_PATH) -> Dict[str, List[str]]:
+    """
+    Column name -> cell values of the names/nicknames sheet.
+
+    The sheet is parsed by the first worker only; the others decode the
+    shared segment, which skips the Excel reader entirely.
+    """
+    arrays = attach('college-names', [path], lambda: compile_names_sheet(path))
+    columns = StringColumn(arrays, 'columns')
+    return {name: StringColumn(arrays, f'col{i}').tolist() for i, name in enumerate(columns)}
+
 class CollegeNamesMapping:
     def __init__(self):
         """Initialize the college names mapping system"""
@@ -19,37 +50,13 @@ class CollegeNamesMapping:
         self.load_mapping_data()
     
     def load_mapping_data(self):
-        """Load college names and nicknames from Excel file"""
+        """Load college names and nicknames (the built mapping is cached on disk)"""
         try:
-            # Load the Excel file
-            excel_path = os.path.join(os.path.dirname(__file__), '..', '..', 'therealdatabase', 'College_Names_and_Nicknames.xlsx')
-            # Alternative path if the above doesn't work
-            if not os.path.exists(excel_path):
-                excel_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'therealdatabase', 'College_Names_and_Nicknames.xlsx')
-            df = pd.read_excel(excel_path)
-            
-            print(f"Loaded college names mapping: {len(df)} colleges")
-            
-            # Build mapping dictionary
-            for _, row in df.iterrows():
-                official_name = str(row['Official_Name']).strip()
-                common_name = str(row['Common_Name']).strip() if pd.notna(row['Common_Name']) else None
-                abbreviation = str(row['Abbreviation']).strip() if pd.notna(row['Abbreviation']) else None
-                
-                # Add official name to set
-                self.official_names.add(official_name)
-                
-                # Map official name to itself
-                self.college_mapping[official_name.lower()] = official_name
-                
-                # Map common name to official name if it exists
-                if common_name and common_name != 'nan':
-                    self.college_mapping[common_name.lower()] = official_name
-                
-                # Map abbreviation to official name if it exists
-                if abbreviation and abbreviation != 'nan':
-                    self.college_mapping[abbreviation.lower()] = official_name
+            rows, self.college_mapping, self.official_names = cached_index(
+                'college-names-mapping', [NAMES_SHEET_PATH], self._build_mapping
+            )
             
+            print(f"Loaded college names mapping: {rows} colleges")
             print(f"Built mapping with {len(self.college_mapping)} name variations")
             
         except Exception as e:
@@ -57,6 +64,34 @@ class CollegeNamesMapping:
             self.college_mapping = {}
             self.official_names = set()
     
+    @staticmethod
+    def _build_mapping() -> Tuple[int, Dict[str, str], set]:
+        """Sheet rows, name variation -> official name, and the official names"""
+        # Load the sheet (shared across workers)
+        sheet = load_names_sheet(NAMES_SHEET_PATH)
+        college_mapping = {}
+        official_names = set()
+        
+        # Build mapping dictionary
+        for official_name, common_name, abbreviation in zip(
+            sheet['Official_Name'], sheet['Common_Name'], sheet['Abbreviation']
+        ):
+            # Add official name to set
+            official_names.add(official_name)
+            
+            # Map official name to itself
+            college_mapping[official_name.lower()] = official_name
+            
+            # Map common name to official name if it exists
+            if common_name and common_name != 'nan':
+                college_mapping[common_name.lower()] = official_name
+            
+            # Map abbreviation to official name if it exists
+            if abbreviation and abbreviation != 'nan':
+                college_mapping[abbreviation.lower()] = official_name
+        
+        return len(sheet['Official_Name']), college_mapping, official_names
+    
     def find_college_by_name(self, search_term: str) -> Optional[str]:
         """
         Find the official college name by searching through all name variations.
@@ -144,5 +179,5 @@ class CollegeNamesMapping:
         
         return variations
 
-# Global instance
-college_names_mapping = CollegeNamesMapping()
+# Global instance (resolves to the serving data version)
+college_names_mapping = VersionedService('names_mapping')
@@ -4,9 +4,11 @@ College Nickname Mapping System
 Maps common nicknames and abbreviations to official college names
 """
 
-import pandas as pd
-import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .college_names_mapping import NAMES_SHEET_PATH, load_names_sheet
+from .data_versions import VersionedService
+from .derived_cache import cached_index
 
 class CollegeNicknameMapper:
     def __init__(self):
@@ -15,31 +17,13 @@ class CollegeNicknameMapper:
         self.load_nickname_mapping()
     
     def load_nickname_mapping(self):
-        """Load college nicknames from Excel file and create comprehensive mapping"""
+        """Load college nicknames and create comprehensive mapping (sheet part cached on disk)"""
         try:
-            # Load the Excel file
-            excel_path = os.path.join(os.path.dirname(__file__), '..', '..', 'therealdatabase', 'College_Names_and_Nicknames.xlsx')
-            df = pd.read_excel(excel_path)
-            
-            print(f"Loaded college nicknames: {len(df)} colleges")
+            rows, self.nickname_mapping = cached_index(
+                'college-nicknames', [NAMES_SHEET_PATH], self._build_sheet_mapping
+            )
             
-            # Build comprehensive mapping
-            for _, row in df.iterrows():
-                official_name = str(row.get('Official Name', '')).strip()
-                common_name = str(row.get('Common Name', '')).strip()
-                abbreviation = str(row.get('Abbreviation', '')).strip()
-                
-                if official_name and official_name != 'nan':
-                    # Map official name to itself
-                    self.nickname_mapping[official_name.lower()] = official_name
-                    
-                    # Map common name to official name
-                    if common_name and common_name != 'nan':
-                        self.nickname_mapping[common_name.lower()] = official_name
-                    
-                    # Map abbreviation to official name
-                    if abbreviation and abbreviation != 'nan':
-                        self.nickname_mapping[abbreviation.lower()] = official_name
+            print(f"Loaded college nicknames: {rows} colleges")
             
             # Add additional common mappings
             self.add_common_mappings()
@@ -50,6 +34,33 @@ class CollegeNicknameMapper:
             print(f"Error loading nickname mapping: {e}")
             self.add_common_mappings()
     
+    @staticmethod
+    def _build_sheet_mapping() -> Tuple[int, Dict[str, str]]:
+        """Sheet rows and the name -> official name mapping read from the sheet"""
+        # Load the sheet (shared across workers)
+        sheet = load_names_sheet(NAMES_SHEET_PATH)
+        rows = len(next(iter(sheet.values()), []))
+        nickname_mapping = {}
+        
+        # Build comprehensive mapping
+        blank = [''] * rows
+        for official_name, common_name, abbreviation in zip(
+            sheet.get('Official Name', blank), sheet.get('Common Name', blank), sheet.get('Abbreviation', blank)
+        ):
+            if official_name and official_name != 'nan':
+                # Map official name to itself
+                nickname_mapping[official_name.lower()] = official_name
+                
+                # Map common name to official name
+                if common_name and common_name != 'nan':
+                    nickname_mapping[common_name.lower()] = official_name
+                
+                # Map abbreviation to official name
+                if abbreviation and abbreviation != 'nan':
+                    nickname_mapping[abbreviation.lower()] = official_name
+        
+        return rows, nickname_mapping
+    
     def add_common_mappings(self):
         """Add common college nickname mappings"""
         common_mappings = {
@@ -190,5 +201,5 @@ class CollegeNicknameMapper:
         """Get all nickname mappings"""
         return self.nickname_mapping.copy()
 
-# Global instance
-nickname_mapper = CollegeNicknameMapper()
+# Global instance (resolves to the serving data version)
+nickname_mapper = VersionedService('nickname_mapper')
@@ -0,0 +1,372 @@
+"""
+Versioned data bundles with read-copy-update swaps.
+
+The catalog snapshot, the IPEDS major mappings, the names/nicknames
+mappings, the suggestion index built on them and the per-college
+calibration table are loaded together as one immutable DataBundle. Serving
+code never holds a bundle across requests: each request pins the bundle
+that is current when it first reads data (see pinned()), and every
+accessor below resolves through the pinned bundle, so a request sees one
+version from start to finish. Components of a bundle are built
+concurrently where they do not depend on each other (see core.startup).
+
+DataVersionManager.reload() builds a complete new bundle off the request
+path, validates it, and publishes it with a single reference assignment.
+Requests already running keep the bundle they pinned; new requests get the
+new one, and the old bundle is freed once the last of them finishes.
+Nothing is mutated in place, so there is no lock on the read path and no
+mixed-version response. VersionedCache drops entries made under an older
+version automatically.
+
+The names/nicknames sheet (therealdatabase/) is optional: deployments that
+ship only backend/ serve with an empty names mapping and the built-in
+nicknames.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+from core.costs import count
+from core.startup import ComponentGraph, ComponentTiming, startup_components
+from core.tracing import span, tracing_active
+
+logger = logging.getLogger(__name__)
+
+# Catalog columns the services read; a snapshot without them is rejected
+REQUIRED_CATALOG_COLUMNS = ('name', 'unitid', 'acceptance_rate', 'selectivity_tier')
+
+# Seconds before a failed first load is retried (requests in between get its error)
+LOAD_RETRY_SECONDS = 30.0
+
+
+@dataclass
+class DataBundle:
+    """One consistent version of the serving data (never mutated after publish)"""
+    catalog: Any  # CatalogSnapshot
+    ipeds_mapping: Any  # RealIPEDSMajorMapping
+    names_mapping: Any  # CollegeNamesMapping
+    nickname_mapper: Any  # CollegeNicknameMapper
+    suggestions: Any  # RealCollegeSuggestions
+    calibration: Any  # CalibrationTable or None
+    sources: Dict[str, str] = field(default_factory=dict)  # component -> content hash
+    loaded_at: float = field(default_factory=time.time)
+    timings: List[ComponentTiming] = field(default_factory=list)  # per-component build times
+
+    @property
+    def version(self) -> str:
+        """Combined hash of the component versions"""
+        text = ';'.join(f'{name}={value}' for name, value in sorted(self.sources.items()))
+        return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+def _optional_source_hash(paths: List[str]) -> str:
+    """source_hash of optional sources, or 'missing' when one is absent"""
+    from .shared_store import source_hash
+    try:
+        return source_hash(paths)
+    except FileNotFoundError:
+        return 'missing'
+
+
+def build_bundle() -> DataBundle:
+    """Load every component from disk (shared segments are reused when unchanged)"""
+    from core.calibration_table import DEFAULT_TABLE_PATH, load_calibration_table
+    from .catalog_snapshot import load_catalog_snapshot
+    from .college_names_mapping import NAMES_SHEET_PATH, CollegeNamesMapping
+    from .college_nickname_mapper import CollegeNicknameMapper
+    from .real_college_suggestions import RealCollegeSuggestions
+    from .real_ipeds_major_mapping import COLLEGE_DATA_PATH, MAPPING_PATH, RealIPEDSMajorMapping
+    from .shared_store import source_hash
+
+    graph = ComponentGraph()
+    graph.add('catalog', load_catalog_snapshot)
+    graph.add('ipeds_mapping', RealIPEDSMajorMapping)
+    graph.add('calibration', lambda: load_calibration_table(DEFAULT_TABLE_PATH))
+    graph.add('names_mapping', CollegeNamesMapping)
+    # Reads the same names sheet, so it attaches to the segment names_mapping built
+    graph.add('nickname_mapper', CollegeNicknameMapper, depends_on=('names_mapping',))
+    graph.add('suggestions', lambda: RealCollegeSuggestions(
+        catalog=graph.get('catalog'), ipeds_mapping=graph.get('ipeds_mapping')
+    ), depends_on=('catalog', 'ipeds_mapping'))
+    graph.load_all()
+
+    # get() re-raises the error of any component that failed to build
+    catalog = graph.get('catalog')
+    calibration = graph.get('calibration')
+    sources = {
+        'catalog': catalog.version,
+        'major_mappings': source_hash([MAPPING_PATH, COLLEGE_DATA_PATH]),
+        'names': _optional_source_hash([NAMES_SHEET_PATH]),
+        'calibration': source_hash([DEFAULT_TABLE_PATH]) if calibration is not None else 'none',
+    }
+    names_mapping = graph.get('names_mapping')
+    if not names_mapping.college_mapping:
+        logger.warning(f"College names mapping is empty (sheet {sources['names']}); serving without it")
+    return DataBundle(
+        catalog=catalog,
+        ipeds_mapping=graph.get('ipeds_mapping'),
+        names_mapping=names_mapping,
+        nickname_mapper=graph.get('nickname_mapper'),
+        suggestions=graph.get('suggestions'),
+        calibration=calibration,
+        sources=sources,
+        timings=graph.timings()
+    )
+
+
+def validate_bundle(bundle: DataBundle) -> List[str]:
+    """Problems that make a bundle unfit to serve (empty list if it is fine)"""
+    problems = []
+    catalog = bundle.catalog
+    if catalog.num_rows == 0:
+        problems.append("catalog is empty")
+    missing = [name for name in REQUIRED_CATALOG_COLUMNS if name not in catalog.columns]
+    if missing:
+        problems.append(f"catalog is missing columns {missing}")
+    if bundle.ipeds_mapping.shared is None or len(bundle.ipeds_mapping.major_mapping) == 0:
+        problems.append("major mappings did not load")
+    if not bundle.suggestions.college_by_name:
+        problems.append("suggestion index is empty")
+    if bundle.calibration is not None and not missing and catalog.num_rows:
+        covered = sum(unitid in bundle.calibration for unitid in catalog.column('unitid')[:50].tolist())
+        if covered == 0:
+            problems.append("calibration table covers none of the catalog")
+    return problems
+
+
+class DataVersionManager:
+    """Holds the current DataBundle and swaps in new ones"""
+
+    def __init__(self, loader: Callable[[], DataBundle] = build_bundle):
+        self._loader = loader
+        self._current: Optional[DataBundle] = None
+        self._lock = threading.Lock()  # serializes loads/swaps, never taken by readers
+        self._listeners: List[Callable[[DataBundle], None]] = []
+        self.last_error: Optional[str] = None
+        self._failure: Optional[Exception] = None  # error of the last failed first load
+        self._failed_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._current is not None
+
+    @property
+    def current(self) -> DataBundle:
+        """
+        The bundle new requests pin (loaded on first use).
+
+        Raises:
+            Exception: the load error while no bundle could be loaded (a
+                failed load is retried after LOAD_RETRY_SECONDS, not on
+                every access)
+        """
+        bundle = self._current
+        if bundle is None:
+            with self._lock:
+                if self._current is None:
+                    if self._failure is not None and time.monotonic() - self._failed_at < LOAD_RETRY_SECONDS:
+                        raise self._failure
+                    try:
+                        self._current = self._load()
+                    except Exception as e:
+                        self._failure, self._failed_at = e, time.monotonic()
+                        self.last_error = str(e)
+                        logger.error(f"Loading the data bundle failed: {e}")
+                        raise
+                    self._failure = None
+                bundle = self._current
+        return bundle
+
+    def _load(self) -> DataBundle:
+        started = time.perf_counter()
+        bundle = self._loader()
+        problems = validate_bundle(bundle)
+        if problems:
+            raise ValueError("; ".join(problems))
+        logger.info(f"Loaded data version {bundle.version} in {time.perf_counter() - started:.2f}s")
+        return bundle
+
+    def reload(self) -> bool:
+        """
+        Build, validate and publish a new bundle (call off the event loop).
+
+        Returns:
+            True if a new bundle is now current; False if loading or
+            validation failed, in which case the current bundle stays
+        """
+        with self._lock:
+            try:
+                bundle = self._load()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Data reload failed, keeping version "
+                             f"{self._current.version if self._current else None}: {e}")
+                return False
+            self._current = bundle  # the swap: one reference assignment
+            self.last_error = None
+        for listener in list(self._listeners):
+            try:
+                listener(bundle)
+            except Exception as e:
+                logger.warning(f"Data version listener failed: {e}")
+        return True
+
+    def reload_in_background(self) -> threading.Thread:
+        """Start reload() on a daemon thread"""
+        thread = threading.Thread(target=self.reload, name='data-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def add_listener(self, listener: Callable[[DataBundle], None]) -> None:
+        """Call listener(bundle) after each successful swap"""
+        self._listeners.append(listener)
+
+
+data_versions = DataVersionManager()
+
+# Holder of the running request's bundle; empty until the request first reads data
+_pinned_bundle: ContextVar[Optional[List[DataBundle]]] = ContextVar('pinned_data_bundle', default=None)
+
+
+def current_bundle() -> DataBundle:
+    """The bundle pinned by the running request, else the current one"""
+    holder = _pinned_bundle.get()
+    if holder is None:
+        return data_versions.current
+    if not holder:
+        holder.append(data_versions.current)
+    return holder[0]
+
+
+@contextmanager
+def pinned(bundle: Optional[DataBundle] = None):
+    """
+    Serve everything inside the block from one bundle.
+
+    Without a bundle, the one current at the first data access is pinned,
+    so blocks that never read data (health checks) never wait for a load.
+    """
+    token = _pinned_bundle.set([bundle] if bundle is not None else [])
+    try:
+        yield
+    finally:
+        _pinned_bundle.reset(token)
+
+
+class VersionedService:
+    """Module-level stand-in for a service that lives in the data bundle"""
+
+    def __init__(self, component: str):
+        self._component = component
+
+    def __getattr__(self, name: str):
+        value = getattr(getattr(current_bundle(), self._component), name)
+        if callable(value) and tracing_active():
+            # Service calls made while tracing a request show up as spans
+            label = f"{self._component}.{name}"
+
+            @wraps(value)
+            def traced_call(*args, **kwargs):
+                with span(label):
+                    return value(*args, **kwargs)
+            return traced_call
+        return value
+
+    def __repr__(self) -> str:
+        return f"<VersionedService {self._component}>"
+
+
+class VersionedCache(MutableMapping):
+    """
+    Dict whose entries belong to the data version they were made under.
+
+    Reads and writes go to the bucket of the caller's bundle; buckets of
+    versions that are neither current nor the caller's are dropped. With
+    max_entries, each bucket keeps only its most recently used entries
+    (for caches keyed by user input). Lookups count as request cache hits
+    or misses (core/costs.py).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._buckets: Dict[str, OrderedDict] = {}
+
+    def _bucket(self) -> OrderedDict:
+        version = current_bundle().version
+        bucket = self._buckets.get(version)
+        if bucket is None:
+            live = {version, data_versions.current.version}
+            self._buckets = {v: b for v, b in self._buckets.items() if v in live}
+            bucket = self._buckets.setdefault(version, OrderedDict())
+        return bucket
+
+    def __getitem__(self, key):
+        bucket = self._bucket()
+        try:
+            value = bucket[key]
+        except KeyError:
+            count('cache_misses')
+            raise
+        count('cache_hits')
+        if self.max_entries is not None:
+            try:
+                bucket.move_to_end(key)
+            except KeyError:  # evicted by another thread meanwhile
+                pass
+        return value
+
+    def __contains__(self, key) -> bool:
+        # A hit is counted by the lookup that follows
+        found = key in self._bucket()
+        if not found:
+            count('cache_misses')
+        return found
+
+    def __setitem__(self, key, value):
+        bucket = self._bucket()
+        bucket[key] = value
+        if self.max_entries is not None:
+            bucket.move_to_end(key)
+            while len(bucket) > self.max_entries:
+                try:
+                    bucket.popitem(last=False)
+                except KeyError:
+                    break
+
+    def __delitem__(self, key):
+        del self._bucket()[key]
+
+    def __iter__(self):
+        return iter(list(self._bucket()))
+
+    def __len__(self) -> int:
+        return len(self._bucket())
+
+
+# Warm-up loads the first bundle alongside the other startup components
+startup_components.add('data_bundle', lambda: data_versions.current)
+
+
+def _register_calibration_provider() -> None:
+    from core.calibration_table import DEFAULT_TABLE_PATH, get_calibration_table, set_calibration_provider
+
+    def bundle_calibration():
+        try:
+            return current_bundle().calibration
+        except Exception:
+            # No servable bundle: fall back to the table file rather than failing the prediction
+            return get_calibration_table(DEFAULT_TABLE_PATH)
+
+    set_calibration_provider(bundle_calibration)
+
+
+_register_calibration_provider()
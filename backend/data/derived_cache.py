@@ -0,0 +1,102 @@
+"""
+On-disk cache of indexes derived from source data files.
+
+Several services build lookup dictionaries from a spreadsheet or CSV at
+every process start. With cached_index() a service declares the files an
+index is derived from and the function that builds it; the result is
+pickled under DERIVED_CACHE_DIR, keyed by the content hash of the sources
+plus a code version, and later starts load the pickle instead of parsing
+the sources again (warm starts never open the Excel reader).
+
+The code version defaults to the hash of the module that defines the
+build function, so editing either the data or the code that derives from
+it produces a new key; an index built from other inputs is never served.
+Writes go through a temp file and an atomic rename, so concurrent workers
+at most build the same index twice.
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, List, Optional
+
+from .shared_store import source_hash
+
+logger = logging.getLogger(__name__)
+
+DERIVED_CACHE_DIR = os.environ.get(
+    'CHANCIFY_DERIVED_CACHE_DIR', os.path.join(os.path.dirname(__file__), '.cache')
+)
+
+
+def code_version(build: Callable) -> str:
+    """Hash of the source file that defines build"""
+    try:
+        return source_hash([inspect.getsourcefile(build)])
+    except (TypeError, OSError):
+        # Builtins and dynamically created functions: fall back to the qualified name
+        return hashlib.sha256(getattr(build, '__qualname__', repr(build)).encode()).hexdigest()[:12]
+
+
+def cached_index(name: str, sources: List[str], build: Callable[[], Any], version: Optional[str] = None) -> Any:
+    """
+    The index build() derives from sources, loaded from the cache when current.
+
+    Args:
+        name: Index name (file prefix under DERIVED_CACHE_DIR)
+        sources: Files the index is derived from
+        build: Builds the index from the sources (must return a picklable value)
+        version: Code version (defaults to code_version(build))
+
+    Returns:
+        The cached or freshly built index
+    """
+    try:
+        sources_key = source_hash(sources)
+    except OSError as e:
+        # A missing source is the build's problem to report; never cache around it
+        logger.warning(f"Not caching {name} index: {e}")
+        return build()
+
+    key = hashlib.sha256(f'{sources_key}:{version or code_version(build)}'.encode()).hexdigest()[:12]
+    path = os.path.join(DERIVED_CACHE_DIR, f'{name}-{key}.pickle')
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Discarding unreadable cached index {path}: {e}")
+
+    index = build()
+    _store(name, path, index)
+    return index
+
+
+def _store(name: str, path: str, index: Any) -> None:
+    """Write index to path atomically and drop older versions of it"""
+    try:
+        os.makedirs(DERIVED_CACHE_DIR, exist_ok=True)
+        fd, scratch = tempfile.mkstemp(prefix=f'.{name}-', dir=DERIVED_CACHE_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(scratch, path)
+        except BaseException:
+            os.unlink(scratch)
+            raise
+    except (OSError, pickle.PicklingError) as e:
+        logger.warning(f"Could not cache {name} index: {e}")
+        return
+    logger.info(f"Cached {name} index at {path}")
+
+    for entry in os.listdir(DERIVED_CACHE_DIR):
+        stale = os.path.join(DERIVED_CACHE_DIR, entry)
+        if entry.startswith(f'{name}-') and stale != path and len(entry) == len(os.path.basename(path)):
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
@@ -0,0 +1,303 @@
+"""
+Declarative improvement rules.
+
+The recommendations made by ImprovementAnalysisService are data, not code:
+data/models/improvement_rules.json lists each rule's conditions, heuristic
+impact, text templates, actionable steps and the profile change it asks for.
+The table is compiled once into a list of predicates that are evaluated for
+every college of a request at once (one numpy comparison per clause), and
+text is only formatted for the rules that match. Editing the JSON and
+calling ImprovementAnalysisService.reload_rules() changes the
+recommendations without a deploy.
+
+Rule conditions and templates refer to metrics by name:
+
+    profile fields   every key of "profile_fields" (parsed once per request)
+    college fields   every key of "college_fields" (one value per college)
+    tier values      every key of "selectivity_tiers.values", picked by the
+                     college's acceptance rate
+    derived          user_gpa, gpa_field, ec_level, is_<major group>,
+                     target_gpa, target_gpa_final, gpa_close_floor
+                     (0.1 below target), gpa_gap, gpa_gap_rounded (2
+                     places), sat_gap, sat_target_low, sat_target_high,
+                     act_gap, act_target_low, act_target_high, ec_gap, ap_gap
+
+Conditions are evaluated on float arrays. Text, impacts and profile
+changes of a matching rule are computed from the college's own values
+instead, so templates render numbers as the values are ("1090.0 SAT" for
+a parsed score, "5/10" for a defaulted one), as the hand-written analyses
+did. Rules are listed in the order those analyses ran, which is the
+order of equal-ranked recommendations.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import string
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_OPERATORS = {
+    'lt': np.less,
+    'le': np.less_equal,
+    'gt': np.greater,
+    'ge': np.greater_equal,
+    'eq': np.equal,
+    'ne': np.not_equal,
+}
+
+_DERIVED_PROFILE_METRICS = ('user_gpa', 'gpa_field', 'ec_level')
+_DERIVED_COLLEGE_METRICS = (
+    'target_gpa', 'target_gpa_final', 'gpa_close_floor', 'gpa_gap', 'gpa_gap_rounded',
+    'sat_gap', 'sat_target_low', 'sat_target_high',
+    'act_gap', 'act_target_low', 'act_target_high',
+    'ec_gap', 'ap_gap'
+)
+
+
+@dataclass
+class ImprovementArea:
+    area: str
+    current: str
+    target: str
+    heuristic_impact: int  # Rule table's estimate, used to order rules before measuring
+    priority: str  # 'high', 'medium', 'low'
+    description: str
+    actionable_steps: List[str]
+    profile_changes: Dict[str, Any] = field(default_factory=dict)  # Profile fields at the target
+    probability_delta: Optional[float] = None  # Measured change in admit probability (None if unmeasurable)
+    impact: Optional[int] = None  # probability_delta in percentage points
+
+
+def _number(value: Any, default: float) -> float:
+    """Form value as float; blanks and bad values become the default"""
+    try:
+        return float(value) if value else default
+    except (ValueError, TypeError):
+        return default
+
+
+def _compile_template(text: str, metrics: set) -> Callable[[Dict[str, Any]], str]:
+    """Interned constant for plain text, else a bound formatter (fields checked now)"""
+    fields = {name for _, name, _, _ in string.Formatter().parse(text) if name}
+    if not fields:
+        constant = sys.intern(text)
+        return lambda context: constant
+    unknown = fields - metrics
+    if unknown:
+        raise ValueError(f"Unknown metrics in template {text!r}: {sorted(unknown)}")
+    return text.format_map
+
+
+def _compile_operand(operand: Any, metrics: set) -> Callable[[Dict[str, Any]], Any]:
+    if isinstance(operand, str):
+        if operand not in metrics:
+            raise ValueError(f"Unknown metric {operand!r}")
+        return lambda context: context[operand]
+    if isinstance(operand, dict):
+        # {"max": [operand, ...]}, for profile changes (scalar context only)
+        parts = [_compile_operand(part, metrics) for part in operand['max']]
+        return lambda context: max(part(context) for part in parts)
+    return lambda context: operand
+
+
+def _derive(context: Dict[str, Any], minimum: Callable, round_to: Callable) -> None:
+    """Add the derived college metrics (arrays with np.minimum/np.round, scalars with min/round)"""
+    uses_unweighted = context['gpa_field'] == 'gpa_unweighted'
+    context['target_gpa'] = context['gpa_unweighted_avg'] if uses_unweighted else context['gpa_avg']
+    context['target_gpa_final'] = minimum(context['target_gpa'] + 0.05, 4.0 if uses_unweighted else 5.0)
+    context['gpa_close_floor'] = context['target_gpa'] - 0.1
+    context['gpa_gap'] = context['target_gpa'] - context['user_gpa']
+    context['gpa_gap_rounded'] = round_to(context['gpa_gap'], 2)
+
+    sat, act = context['sat'], context['act']
+    context['sat_gap'] = context['sat_25th'] - sat
+    context['sat_target_low'] = minimum(context['sat_75th'], sat + 100)
+    context['sat_target_high'] = minimum(context['sat_75th'] + 50, 1600)
+    context['act_gap'] = context['act_25th'] - act
+    context['act_target_low'] = minimum(context['act_75th'], act + 3)
+    context['act_target_high'] = minimum(context['act_75th'] + 1, 36)
+
+    context['ec_gap'] = context['ec_target'] - context['ec_level']
+    context['ap_gap'] = context['ap_target'] - context['ap_count']
+
+
+def _compile_scalar(spec: Any, metrics: set, kind: str) -> Callable[[Dict[str, Any]], Any]:
+    """Impact / priority: a constant or a small formula over one metric"""
+    if not isinstance(spec, dict):
+        return lambda context: spec
+    metric = _compile_operand(spec['metric'], metrics)
+    if kind == 'impact':
+        multiplier = _compile_operand(spec.get('multiplier', 1.0), metrics)
+        scale, cap = spec.get('scale', 1.0), spec.get('cap')
+
+        def impact(context: Dict[str, Any]) -> int:
+            value = int(metric(context) * scale * multiplier(context))
+            return value if cap is None else min(value, cap)
+        return impact
+
+    above, then, otherwise = spec['above'], spec['then'], spec['else']
+    return lambda context: then if metric(context) > above else otherwise
+
+
+class CompiledRule:
+    """One table row: vectorized predicate plus lazily formatted output"""
+
+    def __init__(self, spec: Dict[str, Any], metrics: set):
+        self.area = sys.intern(spec['area'])
+        self.clauses: List[Tuple[Callable, Callable, Callable]] = []
+        for left, op, right in spec['when']:
+            if op not in _OPERATORS:
+                raise ValueError(f"Unknown operator {op!r} in rule {self.area!r}")
+            self.clauses.append((_compile_operand(left, metrics), _OPERATORS[op], _compile_operand(right, metrics)))
+
+        self.current = _compile_template(spec['current'], metrics)
+        self.target = _compile_template(spec['target'], metrics)
+        self.description = _compile_template(spec['description'], metrics)
+        self.impact = _compile_scalar(spec['impact'], metrics, 'impact')
+        self.priority = _compile_scalar(spec['priority'], metrics, 'priority')
+        self.actionable_steps = tuple(sys.intern(step) for step in spec['actionable_steps'])
+        self.profile_changes = [
+            (_compile_template(key, metrics), _compile_operand(value, metrics))
+            for key, value in spec.get('profile_changes', {}).items()
+        ]
+
+    def matches(self, context: Dict[str, Any], n_colleges: int) -> np.ndarray:
+        """(N,) bool: does the rule fire for each college"""
+        mask = np.ones(n_colleges, dtype=bool)
+        for left, op, right in self.clauses:
+            mask &= op(left(context), right(context))
+        return mask
+
+    def build(self, context: Dict[str, Any]) -> ImprovementArea:
+        """Recommendation for one college (context holds scalars)"""
+        return ImprovementArea(
+            area=self.area,
+            current=self.current(context),
+            target=self.target(context),
+            heuristic_impact=self.impact(context),
+            priority=self.priority(context),
+            description=self.description(context),
+            actionable_steps=list(self.actionable_steps),
+            profile_changes={key(context): float(value(context)) for key, value in self.profile_changes}
+        )
+
+
+class RuleTable:
+    """Compiled improvement rules"""
+
+    def __init__(self, table: Dict[str, Any], version: str = ""):
+        """
+        Compile a rule table (parsed improvement_rules.json).
+
+        Raises:
+            ValueError/KeyError: if a rule refers to unknown metrics or operators
+        """
+        self.version = version
+        self.profile_fields = table['profile_fields']
+        self.college_fields = table['college_fields']
+        self.tier_cutoffs = np.asarray(table['selectivity_tiers']['acceptance_cutoffs'], dtype=float)
+        self.tier_values = {
+            name: np.asarray(values, dtype=float)
+            for name, values in table['selectivity_tiers']['values'].items()
+        }
+        self._tier_cutoff_list = list(table['selectivity_tiers']['acceptance_cutoffs'])
+        self._tier_value_lists = dict(table['selectivity_tiers']['values'])
+        self.major_groups = {name: [m.lower() for m in majors] for name, majors in table['major_groups'].items()}
+
+        metrics = (
+            set(self.profile_fields) | set(self.college_fields) | set(self.tier_values) |
+            {f'is_{group}' for group in self.major_groups} |
+            set(_DERIVED_PROFILE_METRICS) | set(_DERIVED_COLLEGE_METRICS)
+        )
+        self.rules = [CompiledRule(spec, metrics) for spec in table['rules'] if spec.get('enabled', True)]
+
+    def profile_context(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the profile once into scalar metrics"""
+        context: Dict[str, Any] = {}
+        for name, spec in self.profile_fields.items():
+            # A missing field is parsed as its default (a float, like a submitted value)
+            value = spec['default']
+            for key in spec.get('keys', [name]):
+                if key in profile:
+                    value = profile[key]
+                    break
+            number = _number(value, spec['default'])
+            context[name] = int(number) if spec.get('integer') else number
+
+        uses_unweighted = context['gpa_unweighted'] > 0
+        context['user_gpa'] = context['gpa_unweighted'] if uses_unweighted else context['gpa_weighted']
+        context['gpa_field'] = 'gpa_unweighted' if uses_unweighted else 'gpa_weighted'
+        context['ec_level'] = (
+            context['extracurricular_depth'] + context['leadership_positions'] + context['passion_projects']
+        ) / 3
+
+        major = str(profile.get('intended_major', profile.get('major', 'General Studies')) or '').lower()
+        for group, majors in self.major_groups.items():
+            context[f'is_{group}'] = any(m in major for m in majors)
+        return context
+
+    def college_context(self, context: Dict[str, Any], colleges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add (N,) college threshold arrays and the derived gaps/targets"""
+        context = dict(context)
+        for name, default in self.college_fields.items():
+            context[name] = np.array([c.get(name, default) for c in colleges], dtype=float)
+
+        tier = np.searchsorted(self.tier_cutoffs, context['acceptance_rate'], side='right')
+        for name, values in self.tier_values.items():
+            context[name] = values[tier]
+        _derive(context, np.minimum, np.round)
+        return context
+
+    def college_scalars(self, context: Dict[str, Any], college: Dict[str, Any]) -> Dict[str, Any]:
+        """One college's metrics as plain Python values (what matched rules are built from)"""
+        context = dict(context)
+        for name, default in self.college_fields.items():
+            context[name] = college.get(name, default)
+
+        tier = bisect.bisect_right(self._tier_cutoff_list, context['acceptance_rate'])
+        for name, values in self._tier_value_lists.items():
+            context[name] = values[tier]
+        _derive(context, min, round)
+        return context
+
+    def evaluate(self, profile: Dict[str, Any], colleges: List[Dict[str, Any]]) -> List[List[ImprovementArea]]:
+        """
+        Matched recommendations for one profile against many colleges.
+
+        Args:
+            profile: User's profile (frontend field names)
+            colleges: Threshold dicts (resolve_college_data output), one per college
+
+        Returns:
+            Per college, the ImprovementAreas of every matching rule in table order
+        """
+        n = len(colleges)
+        profile_context = self.profile_context(profile)
+        context = self.college_context(profile_context, colleges)
+        matched = np.vstack([rule.matches(context, n) for rule in self.rules]) if self.rules else np.zeros((0, n), bool)
+
+        results: List[List[ImprovementArea]] = []
+        for j in range(n):
+            rows = np.flatnonzero(matched[:, j])
+            if not len(rows):
+                results.append([])
+                continue
+            scalars = self.college_scalars(profile_context, colleges[j])
+            results.append([self.rules[r].build(scalars) for r in rows])
+        return results
+
+
+def load_rule_table(path: str) -> RuleTable:
+    """Read and compile a rule table; the version is a hash of the file"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    table = RuleTable(json.loads(raw), version=hashlib.sha256(raw).hexdigest()[:12])
+    logger.info(f"Compiled {len(table.rules)} improvement rules (version {table.version}) from {path}")
+    return table
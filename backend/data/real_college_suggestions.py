@@ -3,46 +3,87 @@ Real College Suggestions System
 Uses real IPEDS data to suggest colleges based on major strength
 """
 
-import os
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
+from .catalog_snapshot import get_catalog_snapshot
+from .data_versions import VersionedService
 from .real_ipeds_major_mapping import real_ipeds_mapping
 
+# Catalog fields copied into each suggestion: output key -> (catalog column, default if the column is absent)
+SUGGESTION_FIELDS = {
+    'unitid': ('unitid', 0),
+    'city': ('city', ''),
+    'state': ('state', ''),
+    'selectivity_tier': ('selectivity_tier', 'Moderately Selective'),
+    'acceptance_rate': ('acceptance_rate', 0.5),
+    'tuition_in_state': ('tuition_in_state_usd', 0),
+    'tuition_out_of_state': ('tuition_out_of_state_usd', 0),
+    'student_body_size': ('student_body_size', 0),
+}
+
 class RealCollegeSuggestions:
-    def __init__(self):
-        """Initialize with real college and major data"""
+    def __init__(self, catalog=None, ipeds_mapping=None):
+        """
+        Initialize with real college and major data.
+        
+        Args:
+            catalog: CatalogSnapshot to index (defaults to the serving one)
+            ipeds_mapping: RealIPEDSMajorMapping of the same data version
+        """
+        self.catalog = catalog or get_catalog_snapshot()
+        self.ipeds_mapping = ipeds_mapping or real_ipeds_mapping
         self.college_df = None
-        self.college_by_name = {}  # Index for fast lookup by name
+        self.college_by_name = {}  # Name -> catalog row (last row with that name)
+        self._first_row_by_name = {}  # Name -> first catalog row with that name
+        self._fields = {}  # Suggestion key -> (column values as a list, default)
         self.load_college_data()
     
     def load_college_data(self):
         """Load the college data and create indexes for fast lookup"""
         try:
-            # Get the directory of this file and construct the path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            csv_path = os.path.join(current_dir, 'raw', 'real_colleges_integrated.csv')
-            self.college_df = pd.read_csv(csv_path)
+            # Mapped catalog snapshot (compiled from real_colleges_integrated.csv)
+            self.college_df = self.catalog.frame()
             print(f"Loaded college data: {self.college_df.shape}")
             
-            # Create index for fast lookup by name
-            for idx, row in self.college_df.iterrows():
-                college_name = row.get('name', '')
-                if college_name:
-                    self.college_by_name[college_name] = row
+            # Name -> row index, built column-wise (no per-row Series)
+            names = self.college_df['name']
+            named = names.fillna('') != ''
+            last = (named & ~names.duplicated(keep='last')).to_numpy()
+            first = (named & ~names.duplicated(keep='first')).to_numpy()
+            self.college_by_name = dict(zip(names[last].tolist(), np.flatnonzero(last).tolist()))
+            self._first_row_by_name = dict(zip(names[first].tolist(), np.flatnonzero(first).tolist()))
+            
+            # The suggestion fields as plain lists, indexed by row
+            self._fields = {
+                key: (self.college_df[column].tolist() if column in self.college_df.columns else None, default)
+                for key, (column, default) in SUGGESTION_FIELDS.items()
+            }
             
             print(f"Indexed {len(self.college_by_name)} colleges by name")
         except Exception as e:
             print(f"Error loading college data: {e}")
             self.college_df = pd.DataFrame()
+            self.college_by_name = {}
+            self._first_row_by_name = {}
+            self._fields = {}
+    
+    def _college_info(self, row: int, college_name: str, major_fit_score: float, ipeds_major: str) -> Dict:
+        """Suggestion entry for one catalog row"""
+        college_info = {'name': college_name}
+        for key, (values, default) in self._fields.items():
+            college_info[key] = values[row] if values is not None else default
+        college_info['major_fit_score'] = major_fit_score
+        college_info['ipeds_major'] = ipeds_major
+        return college_info
     
     def get_colleges_for_major_and_tier(self, major: str, tier: str, limit: int = None) -> List[Dict]:
         """Get colleges that offer a specific major in a specific tier"""
         # Map user major to IPEDS major
-        ipeds_major = real_ipeds_mapping.map_major_name(major)
+        ipeds_major = self.ipeds_mapping.map_major_name(major)
         
         # Get colleges from IPEDS data
-        ipeds_colleges = real_ipeds_mapping.get_colleges_for_major(ipeds_major, tier, limit)
+        ipeds_colleges = self.ipeds_mapping.get_colleges_for_major(ipeds_major, tier, limit)
         
         # Convert to college data format (using index for fast lookup)
         college_suggestions = []
@@ -52,21 +93,9 @@ class RealCollegeSuggestions:
             
             if row is not None:
                 # Get major strength score
-                major_fit_score = real_ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
+                major_fit_score = self.ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
                 
-                college_data = {
-                    'name': college_name,
-                    'unitid': row.get('unitid', 0),
-                    'city': row.get('city', ''),
-                    'state': row.get('state', ''),
-                    'selectivity_tier': row.get('selectivity_tier', 'Moderately Selective'),
-                    'acceptance_rate': row.get('acceptance_rate', 0.5),
-                    'tuition_in_state': row.get('tuition_in_state_usd', 0),
-                    'tuition_out_of_state': row.get('tuition_out_of_state_usd', 0),
-                    'student_body_size': row.get('student_body_size', 0),
-                    'major_fit_score': major_fit_score,
-                    'ipeds_major': ipeds_major
-                }
+                college_data = self._college_info(row, college_name, major_fit_score, ipeds_major)
                 
                 college_suggestions.append(college_data)
         
@@ -107,8 +136,8 @@ class RealCollegeSuggestions:
         suggestions = []
         
         # Get all colleges that offer this major
-        ipeds_major = real_ipeds_mapping.map_major_name(major)
-        all_colleges = real_ipeds_mapping.get_colleges_for_major(ipeds_major, limit=100)
+        ipeds_major = self.ipeds_mapping.map_major_name(major)
+        all_colleges = self.ipeds_mapping.get_colleges_for_major(ipeds_major, limit=100)
         
         # Convert to college data with probabilities
         college_data = []
@@ -116,21 +145,9 @@ class RealCollegeSuggestions:
             row = self.college_by_name.get(college_name)
             
             if row is not None:
-                major_fit_score = real_ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
+                major_fit_score = self.ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
                 
-                college_info = {
-                    'name': college_name,
-                    'unitid': row.get('unitid', 0),
-                    'city': row.get('city', ''),
-                    'state': row.get('state', ''),
-                    'selectivity_tier': row.get('selectivity_tier', 'Moderately Selective'),
-                    'acceptance_rate': row.get('acceptance_rate', 0.5),
-                    'tuition_in_state': row.get('tuition_in_state_usd', 0),
-                    'tuition_out_of_state': row.get('tuition_out_of_state_usd', 0),
-                    'student_body_size': row.get('student_body_size', 0),
-                    'major_fit_score': major_fit_score,
-                    'ipeds_major': ipeds_major
-                }
+                college_info = self._college_info(row, college_name, major_fit_score, ipeds_major)
                 
                 # Calculate probability for this student
                 probability = self.calculate_probability(college_info, academic_strength)
@@ -192,31 +209,18 @@ class RealCollegeSuggestions:
         suggestions = []
         
         # Get all colleges that offer this major
-        ipeds_major = real_ipeds_mapping.map_major_name(major)
-        all_colleges = real_ipeds_mapping.get_colleges_for_major(ipeds_major, limit=50)
+        ipeds_major = self.ipeds_mapping.map_major_name(major)
+        all_colleges = self.ipeds_mapping.get_colleges_for_major(ipeds_major, limit=50)
         
         # Convert to college data and sort by major fit score
         college_data = []
         for college_name in all_colleges:
-            college_row = self.college_df[self.college_df['name'] == college_name]
+            row = self._first_row_by_name.get(college_name)
             
-            if len(college_row) > 0:
-                row = college_row.iloc[0]
-                major_fit_score = real_ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
+            if row is not None:
+                major_fit_score = self.ipeds_mapping.get_major_strength_score(college_name, ipeds_major)
                 
-                college_info = {
-                    'name': college_name,
-                    'unitid': row.get('unitid', 0),
-                    'city': row.get('city', ''),
-                    'state': row.get('state', ''),
-                    'selectivity_tier': row.get('selectivity_tier', 'Moderately Selective'),
-                    'acceptance_rate': row.get('acceptance_rate', 0.5),
-                    'tuition_in_state': row.get('tuition_in_state_usd', 0),
-                    'tuition_out_of_state': row.get('tuition_out_of_state_usd', 0),
-                    'student_body_size': row.get('student_body_size', 0),
-                    'major_fit_score': major_fit_score,
-                    'ipeds_major': ipeds_major
-                }
+                college_info = self._college_info(row, college_name, major_fit_score, ipeds_major)
                 
                 college_data.append(college_info)
         
@@ -239,5 +243,5 @@ class RealCollegeSuggestions:
         
         return suggestions
 
-# Global instance
-real_college_suggestions = RealCollegeSuggestions()
+# Global instance (resolves to the serving data version)
+real_college_suggestions = VersionedService('suggestions')
@@ -1,39 +1,219 @@
 """
 Real IPEDS Major Mapping System
 Uses actual IPEDS data for accurate major-college mappings
+
+The two JSON mappings are compiled once into a shared read-only segment
+(see data.shared_store) that every worker maps instead of parsing its own
+copy; major_mapping and college_major_data are read-only views over it
+that decode entries on access.
 """
 
 import json
 import os
+from collections.abc import Mapping
 from typing import Dict, List, Optional
-import pandas as pd
+import numpy as np
+
+from .catalog_snapshot import get_catalog_snapshot
+from .data_versions import VersionedService
+from .shared_store import StringColumn, attach, encode_strings
+
+MAPPING_PATH = os.path.join(os.path.dirname(__file__), 'real_major_mapping.json')
+COLLEGE_DATA_PATH = os.path.join(os.path.dirname(__file__), 'college_major_data.json')
+
+
+def compile_major_mappings(mapping_path: str = MAPPING_PATH, college_data_path: str = COLLEGE_DATA_PATH) -> Dict[str, np.ndarray]:
+    """
+    Flatten both JSON mappings into CSR-style arrays.
+
+    College and major names are stored once each in a string table; every
+    list becomes a slice [offsets[i], offsets[i + 1]) of typed columns.
+    """
+    with open(mapping_path, 'r') as f:
+        major_mapping = json.load(f)
+    with open(college_data_path, 'r') as f:
+        college_major_data = json.load(f)
+
+    colleges: Dict[str, int] = {}
+    majors: Dict[str, int] = {}
+    for name in college_major_data:
+        colleges.setdefault(name, len(colleges))
+    for name, entries in major_mapping.items():
+        majors.setdefault(name, len(majors))
+        for entry in entries:
+            colleges.setdefault(entry['college'], len(colleges))
+    for data in college_major_data.values():
+        for entry in data.get('majors', []):
+            majors.setdefault(entry['name'], len(majors))
+
+    arrays: Dict[str, np.ndarray] = {}
+    for prefix, names in (('college', colleges), ('major', majors)):
+        arrays.update({f'{prefix}.{key}': value for key, value in encode_strings(list(names)).items()})
+
+    # major -> [{college, percentage, count, rank, total_bachelors}, ...]
+    entries = [entry for name in major_mapping for entry in major_mapping[name]]
+    major_slot = np.full(len(majors), -1, dtype=np.int32)
+    major_slot[[majors[name] for name in major_mapping]] = np.arange(len(major_mapping))
+    arrays['mapping.major'] = np.array([majors[name] for name in major_mapping], dtype=np.int32)
+    arrays['mapping.major_slot'] = major_slot
+    arrays['mapping.offsets'] = np.cumsum([0] + [len(v) for v in major_mapping.values()]).astype(np.int64)
+    arrays['mapping.college'] = np.array([colleges[e['college']] for e in entries], dtype=np.int32)
+    arrays['mapping.percentage'] = np.array([e['percentage'] for e in entries], dtype=np.float64)
+    for key in ('count', 'rank', 'total_bachelors'):
+        arrays[f'mapping.{key}'] = np.array([e[key] for e in entries], dtype=np.int64)
+
+    # college -> {unitid, majors: [{name, percentage, count, rank}], total_bachelors}
+    data = list(college_major_data.values())
+    entries = [entry for value in data for entry in value.get('majors', [])]
+    college_slot = np.full(len(colleges), -1, dtype=np.int32)
+    college_slot[[colleges[name] for name in college_major_data]] = np.arange(len(college_major_data))
+    arrays['colleges.college'] = np.array([colleges[name] for name in college_major_data], dtype=np.int32)
+    arrays['colleges.college_slot'] = college_slot
+    arrays['colleges.unitid'] = np.array([value.get('unitid') if value.get('unitid') is not None else -1 for value in data], dtype=np.int64)
+    arrays['colleges.total_bachelors'] = np.array([value.get('total_bachelors', -1) for value in data], dtype=np.int64)
+    arrays['colleges.offsets'] = np.cumsum([0] + [len(value.get('majors', [])) for value in data]).astype(np.int64)
+    arrays['colleges.major'] = np.array([majors[e['name']] for e in entries], dtype=np.int32)
+    arrays['colleges.percentage'] = np.array([e['percentage'] for e in entries], dtype=np.float64)
+    for key in ('count', 'rank'):
+        arrays[f'colleges.{key}'] = np.array([e[key] for e in entries], dtype=np.int64)
+    return arrays
+
+
+class SharedMajorMappings:
+    """Typed views over the compiled mapping segment"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        # Names and name -> slot lookups are the only per-worker state (~1k strings)
+        self.colleges = StringColumn(arrays, 'college').tolist()
+        self.majors = StringColumn(arrays, 'major').tolist()
+        self.major_index = {name: i for i, name in enumerate(self.majors)}
+        self.major_slots = {self.majors[i]: slot for slot, i in enumerate(arrays['mapping.major'].tolist())}
+        self.college_slots = {self.colleges[i]: slot for slot, i in enumerate(arrays['colleges.college'].tolist())}
+
+    def major_slot(self, major: str) -> int:
+        return self.major_slots.get(major, -1)
+
+    def college_slot(self, college_name: str) -> int:
+        return self.college_slots.get(college_name, -1)
+
+    def span(self, table: str, slot: int) -> slice:
+        offsets = self.arrays[f'{table}.offsets']
+        return slice(int(offsets[slot]), int(offsets[slot + 1]))
+
+    def colleges_for_major(self, major: str) -> List[str]:
+        """College names of one major's entries, in mapping order"""
+        slot = self.major_slot(major)
+        if slot < 0:
+            return []
+        return [self.colleges[i] for i in self.arrays['mapping.college'][self.span('mapping', slot)].tolist()]
+
+    def college_major(self, college_name: str, major: str) -> Optional[Dict]:
+        """The college's entry for one major, without decoding the others"""
+        slot, major_index = self.college_slot(college_name), self.major_index.get(major)
+        if slot < 0 or major_index is None:
+            return None
+        span = self.span('colleges', slot)
+        majors = self.arrays['colleges.major'][span].tolist()
+        if major_index not in majors:
+            return None
+        i = span.start + majors.index(major_index)
+        return {
+            'name': major, 'percentage': float(self.arrays['colleges.percentage'][i]),
+            'count': int(self.arrays['colleges.count'][i]), 'rank': int(self.arrays['colleges.rank'][i])
+        }
+
+
+class _MajorMappingView(Mapping):
+    """major -> list of college entries, as in real_major_mapping.json"""
+
+    def __init__(self, shared: SharedMajorMappings):
+        self._shared = shared
+
+    def __getitem__(self, major: str) -> List[Dict]:
+        slot = self._shared.major_slot(major)
+        if slot < 0:
+            raise KeyError(major)
+        a, span = self._shared.arrays, self._shared.span('mapping', slot)
+        return [
+            {'college': self._shared.colleges[college], 'percentage': percentage, 'count': count,
+             'rank': rank, 'total_bachelors': total}
+            for college, percentage, count, rank, total in zip(
+                a['mapping.college'][span].tolist(), a['mapping.percentage'][span].tolist(),
+                a['mapping.count'][span].tolist(), a['mapping.rank'][span].tolist(),
+                a['mapping.total_bachelors'][span].tolist()
+            )
+        ]
+
+    def __contains__(self, major) -> bool:
+        return major in self._shared.major_slots
+
+    def __iter__(self):
+        return iter(self._shared.major_slots)
+
+    def __len__(self) -> int:
+        return len(self._shared.major_slots)
+
+
+class _CollegeMajorDataView(Mapping):
+    """college -> {unitid, majors, total_bachelors}, as in college_major_data.json"""
+
+    def __init__(self, shared: SharedMajorMappings):
+        self._shared = shared
+
+    def __getitem__(self, college_name: str) -> Dict:
+        slot = self._shared.college_slot(college_name)
+        if slot < 0:
+            raise KeyError(college_name)
+        a, span = self._shared.arrays, self._shared.span('colleges', slot)
+        unitid, total = int(a['colleges.unitid'][slot]), int(a['colleges.total_bachelors'][slot])
+        data = {
+            'unitid': unitid if unitid >= 0 else None,
+            'majors': [
+                {'name': self._shared.majors[major], 'percentage': percentage, 'count': count, 'rank': rank}
+                for major, percentage, count, rank in zip(
+                    a['colleges.major'][span].tolist(), a['colleges.percentage'][span].tolist(),
+                    a['colleges.count'][span].tolist(), a['colleges.rank'][span].tolist()
+                )
+            ]
+        }
+        if total >= 0:
+            data['total_bachelors'] = total
+        return data
+
+    def __contains__(self, college_name) -> bool:
+        return college_name in self._shared.college_slots
+
+    def __iter__(self):
+        return iter(self._shared.college_slots)
+
+    def __len__(self) -> int:
+        return len(self._shared.college_slots)
+
 
 class RealIPEDSMajorMapping:
     def __init__(self):
         """Initialize with real IPEDS data"""
+        self.shared = None
         self.major_mapping = {}
         self.college_major_data = {}
         self.load_mappings()
     
     def load_mappings(self):
-        """Load the pre-computed mappings"""
+        """Attach to the shared mapping segment (compiled from the JSON files on first use)"""
         try:
-            # Load major mapping
-            mapping_path = os.path.join(os.path.dirname(__file__), 'real_major_mapping.json')
-            if os.path.exists(mapping_path):
-                with open(mapping_path, 'r') as f:
-                    self.major_mapping = json.load(f)
-            
-            # Load college major data
-            college_data_path = os.path.join(os.path.dirname(__file__), 'college_major_data.json')
-            if os.path.exists(college_data_path):
-                with open(college_data_path, 'r') as f:
-                    self.college_major_data = json.load(f)
+            if os.path.exists(MAPPING_PATH) and os.path.exists(COLLEGE_DATA_PATH):
+                self.shared = SharedMajorMappings(
+                    attach('major-mappings', [MAPPING_PATH, COLLEGE_DATA_PATH], compile_major_mappings)
+                )
+                self.major_mapping = _MajorMappingView(self.shared)
+                self.college_major_data = _CollegeMajorDataView(self.shared)
             
             print(f"Loaded real major mapping: {len(self.major_mapping)} majors, {len(self.college_major_data)} colleges")
             
         except Exception as e:
             print(f"Error loading real major mappings: {e}")
+            self.shared = None
             self.major_mapping = {}
             self.college_major_data = {}
     
@@ -42,19 +222,19 @@ class RealIPEDSMajorMapping:
         if major not in self.major_mapping:
             return []
         
-        colleges = self.major_mapping[major]
+        if self.shared is not None:
+            colleges = self.shared.colleges_for_major(major)
+        else:
+            colleges = [college_info['college'] for college_info in self.major_mapping[major]]
         
         # Filter by tier if specified
         if tier:
             tier_colleges = []
-            for college_info in colleges:
-                college_name = college_info['college']
+            for college_name in colleges:
                 college_tier = self.get_college_tier(college_name)
                 if college_tier == tier:
                     tier_colleges.append(college_name)
             colleges = tier_colleges
-        else:
-            colleges = [college_info['college'] for college_info in colleges]
         
         # Apply limit
         if limit:
@@ -64,38 +244,52 @@ class RealIPEDSMajorMapping:
     
     def get_college_tier(self, college_name: str) -> str:
         """Get the selectivity tier for a college"""
-        # Load college data to get tier information
+        # Tier from the catalog snapshot (mapped once, indexed by name)
         try:
-            college_df = pd.read_csv(os.path.join(os.path.dirname(__file__), 'raw', 'real_colleges_integrated.csv'))
-            college_row = college_df[college_df['name'] == college_name]
+            catalog = get_catalog_snapshot()
+            position = catalog.position('name', college_name)
             
-            if len(college_row) == 0:
+            if position is None:
                 return 'moderately_selective'
             
-            tier = college_row.iloc[0]['selectivity_tier']
-            tier_mapping = {
-                'Elite': 'elite',
-                'Highly Selective': 'highly_selective',
-                'Moderately Selective': 'selective',
-                'Less Selective': 'moderately_selective'
-            }
-            return tier_mapping.get(tier, 'moderately_selective')
+            return self.normalize_tier(catalog.column('selectivity_tier')[position])
         except:
             return 'moderately_selective'
     
-    def get_major_strength_score(self, college_name: str, major: str) -> float:
-        """Get strength score for a college in a specific major based on real data"""
+    @staticmethod
+    def normalize_tier(selectivity_tier: str) -> str:
+        """Map a catalog selectivity_tier value to the tier names used here"""
+        tier_mapping = {
+            'Elite': 'elite',
+            'Highly Selective': 'highly_selective',
+            'Moderately Selective': 'selective',
+            'Less Selective': 'moderately_selective'
+        }
+        return tier_mapping.get(selectivity_tier, 'moderately_selective')
+    
+    def get_major_strength_score(self, college_name: str, major: str, tier: Optional[str] = None) -> float:
+        """
+        Get strength score for a college in a specific major based on real data.
+        
+        Pass the college's tier (see normalize_tier) when it is already known
+        to skip the catalog lookup.
+        """
         if college_name not in self.college_major_data:
             return 0.0
         
-        college_data = self.college_major_data[college_name]
-        
-        # Check if college_data has the expected structure
-        if 'majors' not in college_data:
-            return 0.0
+        if self.shared is not None:
+            major_info = self.shared.college_major(college_name, major)
+            major_infos = [major_info] if major_info else []
+        else:
+            college_data = self.college_major_data[college_name]
+            
+            # Check if college_data has the expected structure
+            if 'majors' not in college_data:
+                return 0.0
+            major_infos = college_data['majors']
         
         # Find the major in the college's data
-        for major_info in college_data['majors']:
+        for major_info in major_infos:
             if major_info['name'] == major:
                 # Calculate strength score based on percentage and rank
                 percentage = major_info['percentage']
@@ -111,7 +305,8 @@ class RealIPEDSMajorMapping:
                 final_score = base_score * rank_multiplier
                 
                 # Add selectivity bonus
-                tier = self.get_college_tier(college_name)
+                if tier is None:
+                    tier = self.get_college_tier(college_name)
                 selectivity_bonus = {
                     'elite': 0.2,
                     'highly_selective': 0.15,
@@ -444,8 +639,8 @@ class RealIPEDSMajorMapping:
         
         return major_mappings.get(user_major, user_major)
 
-# Global instance
-real_ipeds_mapping = RealIPEDSMajorMapping()
+# Global instance (resolves to the serving data version)
+real_ipeds_mapping = VersionedService('ipeds_mapping')
 
 # Convenience functions
 def get_colleges_for_major(major: str, tier: str = None, limit: int = None) -> List[str]:
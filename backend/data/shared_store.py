@@ -0,0 +1,165 @@
+"""
+Shared read-only data segment for all workers.
+
+Every uvicorn worker imports the data singletons, and each used to parse the
+same JSON/Excel sources into private Python objects. Instead, the first
+worker compiles a source into flat numpy arrays (numbers as fixed dtypes,
+strings as one UTF-8 blob plus offsets) under SHARED_DATA_DIR, and every
+worker maps that file read-only (one mmap, arrays are views into it). The pages
+live once in the OS page cache (tmpfs when /dev/shm exists), so adding a
+worker costs only the small per-worker lookup state.
+
+Segments are keyed by a hash of their source files: editing a source
+produces a new directory, and a stale one is never read. Directories are
+published with an atomic rename, so concurrent workers either see a
+complete segment or build their own copy and discard it.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SHARED_DATA_DIR = os.environ.get(
+    'CHANCIFY_SHARED_DATA_DIR',
+    os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'chancify-shared')
+)
+
+
+def source_hash(paths: Iterable[str]) -> str:
+    """Content hash of the source files (first 12 hex digits of sha256)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def encode_strings(values: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Pack strings into {'blob': uint8 UTF-8 bytes, 'offsets': int64 (n+1)}"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return {'blob': blob, 'offsets': offsets}
+
+
+class StringColumn:
+    """Read-only strings over a shared blob; decoded on access"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], prefix: str):
+        self._blob = arrays[f'{prefix}.blob']
+        self._bytes = memoryview(self._blob)
+        self._offsets = arrays[f'{prefix}.offsets']
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self._bytes[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tolist())
+
+    def tolist(self) -> List[str]:
+        offsets = self._offsets.tolist()
+        text = str(self._bytes, 'utf-8')
+        if len(text) == len(self._blob):
+            # ASCII: byte offsets are character offsets, slice the decoded text
+            return [text[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+        return [str(self._bytes[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(len(self))]
+
+    def positions(self) -> Dict[str, int]:
+        """Value -> first position (a small per-worker index for exact lookups)"""
+        positions: Dict[str, int] = {}
+        for i, value in enumerate(self.tolist()):
+            positions.setdefault(value, i)
+        return positions
+
+
+def attach(
+    name: str,
+    sources: List[str],
+    build: Callable[[], Dict[str, np.ndarray]],
+    version: Optional[str] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Map a shared segment read-only, building it first if no worker has yet.
+
+    Args:
+        name: Segment name (directory prefix under SHARED_DATA_DIR)
+        sources: Files the segment is compiled from; their hash is the version
+        build: Returns the arrays to store (called only when missing)
+        version: source_hash(sources), when the caller already computed it
+
+    Returns:
+        Array name -> read-only memory-mapped array
+    """
+    path = os.path.join(SHARED_DATA_DIR, f'{name}-{version or source_hash(sources)}')
+    if not os.path.isdir(path):
+        _publish(name, path, build())
+    return _map_segment(path)
+
+
+def _map_segment(path: str) -> Dict[str, np.ndarray]:
+    """One read-only mmap of data.bin; every array is a view at its index offset"""
+    with open(os.path.join(path, 'index.json')) as f:
+        index = json.load(f)
+    with open(os.path.join(path, 'data.bin'), 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    return {
+        key: np.frombuffer(buffer, dtype=entry['dtype'], count=int(np.prod(entry['shape'])),
+                           offset=entry['offset']).reshape(entry['shape'])
+        for key, entry in index.items()
+    }
+
+
+def _publish(name: str, path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Write arrays to a scratch directory and rename it into place.
+
+    Layout: data.bin holds every array back to back (64-byte aligned) and
+    index.json maps array name -> dtype, shape and byte offset.
+    """
+    os.makedirs(SHARED_DATA_DIR, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=f'.{name}-', dir=SHARED_DATA_DIR)
+    try:
+        index, offset = {}, 0
+        with open(os.path.join(scratch, 'data.bin'), 'wb') as f:
+            for key, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                if array.dtype.hasobject:
+                    raise TypeError(f"Shared array {key!r} has object dtype")
+                padding = -offset % 64
+                f.write(b'\0' * padding)
+                offset += padding
+                index[key] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+                f.write(array.tobytes())
+                offset += array.nbytes
+        with open(os.path.join(scratch, 'index.json'), 'w') as f:
+            json.dump(index, f)
+        os.rename(scratch, path)
+        logger.info(f"Built shared segment {os.path.basename(path)} ({len(arrays)} arrays, {offset} bytes)")
+    except OSError:
+        # Another worker published the same version first
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+        return
+
+    # Older versions of this segment are no longer needed (mapped files stay valid)
+    prefix = f'{name}-'
+    for entry in os.listdir(SHARED_DATA_DIR):
+        stale = os.path.join(SHARED_DATA_DIR, entry)
+        if entry.startswith(prefix) and stale != path and len(entry) == len(os.path.basename(path)):
+            shutil.rmtree(stale, ignore_errors=True)
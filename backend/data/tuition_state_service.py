@@ -5,38 +5,55 @@ Determines in-state vs out-of-state tuition based on zipcode and college locatio
 """
 
 from .zippopotam_service import zippopotam_service
-from .city_state_database import city_state_database
+from .city_state_database import COLLEGE_STATE_ZIP_PATH, city_state_database
+from .derived_cache import cached_index
 import logging
 import pandas as pd
 import os
 from typing import Dict, Optional, Tuple
 
+from core.costs import count
+from core.startup import startup_components
+
 logger = logging.getLogger(__name__)
 
+TUITION_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'Tuition_InOut_2023.csv')
+if not os.path.exists(TUITION_CSV_PATH):
+    TUITION_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'Tuition_InOut_2023.csv')
+
 class TuitionStateService:
     def __init__(self):
-        """Initialize the tuition state service"""
+        """Initialize the tuition state service (the built indexes are cached on disk)"""
+        self.tuition_data, self.college_states, self.zipcode_states = cached_index(
+            'tuition-state', [TUITION_CSV_PATH, COLLEGE_STATE_ZIP_PATH], self._build_indexes
+        )
+        logger.info(f"Tuition state service ready: {len(self.tuition_data)} tuition names, "
+                    f"{len(self.college_states)} college states")
+    
+    def _build_indexes(self) -> Tuple[Dict[str, Dict], Dict[str, str], Dict[str, str]]:
+        """Tuition by college name, college -> state and zip prefix -> state, from both CSVs"""
         self.tuition_data = {}
         self.college_states = {}
         self.zipcode_states = {}
         self.load_tuition_data()
         self.load_zipcode_state_mapping()
+        return self.tuition_data, self.college_states, self.zipcode_states
     
     def load_tuition_data(self):
         """Load tuition data from CSV file"""
         try:
-            csv_path = os.path.join(os.path.dirname(__file__), '..', '..', 'Tuition_InOut_2023.csv')
-            if not os.path.exists(csv_path):
-                csv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'Tuition_InOut_2023.csv')
-            
-            df = pd.read_csv(csv_path)
+            count('file_reads')
+            df = pd.read_csv(TUITION_CSV_PATH)
             logger.info(f"Loaded tuition data: {len(df)} colleges")
             
-            for _, row in df.iterrows():
-                college_name = str(row['College']).strip()
-                matched_name = str(row['Matched_INSTNM']).strip()
-                in_state_tuition = float(row['In-State Tuition (tuition+fees)']) if pd.notna(row['In-State Tuition (tuition+fees)']) else None
-                out_state_tuition = float(row['Out-of-State Tuition (tuition+fees)']) if pd.notna(row['Out-of-State Tuition (tuition+fees)']) else None
+            for college, matched, in_state, out_state in zip(
+                df['College'].tolist(), df['Matched_INSTNM'].tolist(),
+                df['In-State Tuition (tuition+fees)'].tolist(), df['Out-of-State Tuition (tuition+fees)'].tolist()
+            ):
+                college_name = str(college).strip()
+                matched_name = str(matched).strip()
+                in_state_tuition = float(in_state) if pd.notna(in_state) else None
+                out_state_tuition = float(out_state) if pd.notna(out_state) else None
                 
                 # Store both college name and matched name
                 self.tuition_data[college_name.lower()] = {
@@ -86,18 +103,15 @@ class TuitionStateService:
     def load_zipcode_state_mapping(self):
         """Load zipcode to state mapping from College_State_Zip.csv"""
         try:
-            csv_path = os.path.join(os.path.dirname(__file__), '..', '..', 'College_State_Zip.csv')
-            if not os.path.exists(csv_path):
-                csv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'College_State_Zip.csv')
-            
-            df = pd.read_csv(csv_path)
+            count('file_reads')
+            df = pd.read_csv(COLLEGE_STATE_ZIP_PATH)
             logger.info(f"Loaded college state mapping: {len(df)} colleges")
             
             # Create college to state mapping
-            for _, row in df.iterrows():
-                college_name = str(row['College']).strip()
-                state = str(row['State']).strip()
-                zipcode = str(row['ZIP']).strip()
+            for college, state, zipcode in zip(df['College'].tolist(), df['State'].tolist(), df['ZIP'].tolist()):
+                college_name = str(college).strip()
+                state = str(state).strip()
+                zipcode = str(zipcode).strip()
                 
                 # Store college to state mapping
                 self.college_states[college_name.lower()] = state
@@ -214,5 +228,7 @@ class TuitionStateService:
                 'tuition': None
             }
 
-# Global instance
-tuition_state_service = TuitionStateService()
+# Global instance (built on first use or by startup warm-up)
+tuition_state_service = startup_components.add(
+    'tuition_state_service', TuitionStateService, depends_on=('city_state_database',)
+)
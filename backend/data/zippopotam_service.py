@@ -9,6 +9,8 @@ import logging
 import time
 from typing import Dict, Optional, Tuple
 
+from core.costs import count
+
 logger = logging.getLogger(__name__)
 
 class ZippopotamService:
@@ -36,7 +38,9 @@ class ZippopotamService:
         cache_key = zipcode
         if cache_key in self.cache:
             logger.info(f"Returning cached location for zipcode {zipcode}")
+            count('cache_hits')
             return self.cache[cache_key]
+        count('cache_misses')
         
         try:
             # Add rate limiting delay
@@ -46,6 +50,7 @@ class ZippopotamService:
             url = f"{self.base_url}/{zipcode}"
             logger.info(f"Fetching location data for zipcode {zipcode} from {url}")
             
+            count('http_calls')
             response = requests.get(url, timeout=10)
             response.raise_for_status()
             
@@ -3,18 +3,28 @@ Chancify AI - Backend API
 FastAPI application for college admissions probability calculations
 """
 
+import asyncio
 import os
 import logging
 import time
+from dataclasses import asdict
 import numpy as np
 import pandas as pd
-from typing import Dict, Any
-from fastapi import FastAPI, Request
-from starlette.responses import Response
+from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, HTTPException, Request
+from starlette.responses import FileResponse, JSONResponse, Response
 # CORSMiddleware import removed - using ONLY custom middleware
 from config import settings
 from database import create_tables
-from data.real_ipeds_major_mapping import get_colleges_for_major, get_major_strength_score, get_major_relevance_info
+from core.costs import COST_HEADER, collect_costs, cost_metrics, count, format_costs
+from core.metrics import collect_stages, latency_metrics, stage, timed
+from core.prefork import request_reload
+from core.startup import report as startup_report, startup_components
+from core.profiler import PROFILE_HEADER, is_admin, list_profiles, profile_path, profile_request, should_profile
+from core.tracing import SLOW_REQUEST_MS, current_trace, flush_writes, read_slow_traces, trace_request, valid_request_id
+from data.catalog_snapshot import get_catalog_snapshot
+from data.data_versions import VersionedCache, data_versions, pinned
+from data.real_ipeds_major_mapping import get_colleges_for_major, get_major_strength_score, get_major_relevance_info, real_ipeds_mapping
 from data.real_college_suggestions import real_college_suggestions
 from data.college_names_mapping import college_names_mapping
 from data.college_nickname_mapper import nickname_mapper
@@ -29,8 +39,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache for college suggestions
-suggestion_cache = {}
+# Simple in-memory cache for college suggestions (entries belong to the data version they were built from)
+suggestion_cache = VersionedCache()
 CACHE_DURATION = 300  # 5 minutes
 
 # Helper functions for JSON-compliant values
@@ -90,6 +100,17 @@ def safe_round(value, decimals=4, default=0.0):
 
 # Get environment
 ENV = os.getenv("ENVIRONMENT", "development")
+# Build data services in the background at startup (0 = build each on first use only)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") != "0"
+# Return per-request operation counts in the X-Request-Cost header (0 = metrics only)
+REQUEST_COST_HEADER = os.getenv("REQUEST_COST_HEADER", "1") != "0"
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response whose rendering is timed as the 'serialization' stage"""
+    
+    def render(self, content: Any) -> bytes:
+        with stage('serialization'):
+            return super().render(content)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -97,7 +118,8 @@ app = FastAPI(
     description="College admissions probability calculator with personalized game plans",
     version="0.1.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=TimedJSONResponse
 )
 
 """
@@ -258,11 +280,107 @@ async def custom_cors_middleware(request: Request, call_next):
         
         return response
 
+# Served while components are still loading (they touch no component)
+WARMUP_EXEMPT_PATHS = ('/', '/api/health', '/metrics')
+# How often a request held back during warm-up checks whether it has finished
+WARMUP_POLL_SECONDS = 0.05
+
+@app.middleware("http")
+async def warmup_middleware(request: Request, call_next):
+    """
+    Hold requests back while the startup warm-up runs.
+    
+    Handlers resolve components (core/startup.py) and the data bundle
+    synchronously, so a request arriving mid-warm-up would build or wait
+    for them on the event loop, blocking /api/health with it. Such
+    requests sleep until the warm-up thread is done instead. Components
+    that failed are then built (or retried) by the request that uses them.
+    """
+    if request.method != "OPTIONS" and request.url.path not in WARMUP_EXEMPT_PATHS:
+        while startup_components.warming_up():
+            await asyncio.sleep(WARMUP_POLL_SECONDS)
+    return await call_next(request)
+
+@app.middleware("http")
+async def data_version_middleware(request: Request, call_next):
+    """
+    Pin the current data bundle for the whole request.
+    
+    A data reload swaps in a new bundle for later requests; this one keeps
+    reading the catalog, mappings and calibration it started with.
+    """
+    with pinned():
+        return await call_next(request)
+
+@app.middleware("http")
+async def stage_metrics_middleware(request: Request, call_next):
+    """
+    Record the request's per-stage latencies under its route.
+    
+    Stages timed anywhere in the request (core/metrics.py) are summed per
+    stage and recorded once the response is ready, with the total as
+    stage 'request'. Exposed at /metrics.
+    
+    Operations counted in the request (core/costs.py) are added to the
+    endpoint's totals, returned in the X-Request-Cost header and attached
+    to the request's trace.
+    """
+    started = time.perf_counter()
+    with collect_stages() as stages, collect_costs() as costs:
+        response = await call_next(request)
+    endpoint = getattr(request.scope.get('route'), 'path', 'unmatched')
+    latency_metrics.observe_request(endpoint, stages, time.perf_counter() - started)
+    cost_metrics.observe_request(endpoint, costs)
+    if costs:
+        trace = current_trace()
+        if trace is not None:
+            trace.root.attrs['costs'] = dict(costs)
+        if REQUEST_COST_HEADER:
+            response.headers[COST_HEADER] = format_costs(costs)
+    return response
+
+def _request_id(request: Request) -> Optional[str]:
+    """Caller-supplied X-Request-ID, if it is a sane token ([A-Za-z0-9_-]{1,64})"""
+    supplied = request.headers.get("x-request-id", "")
+    return supplied if valid_request_id(supplied) else None
+
+def _require_admin(request: Request) -> None:
+    """Reject the request unless it carries the admin token (PROFILE_ADMIN_TOKEN) in X-Profile-Token"""
+    if not is_admin(request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.middleware("http")
+async def tracing_middleware(request: Request, call_next):
+    """
+    Trace the request (core/tracing.py) and return its id as X-Request-ID.
+    
+    Requests slower than SLOW_REQUEST_MS have their span tree written to
+    the slow-request log under that id. Requests selected by should_profile
+    (core/profiler.py) are also sampled, and the capture is saved under
+    the same id.
+    """
+    with trace_request(f"{request.method} {request.url.path}", _request_id(request)) as trace:
+        if should_profile(request.url.path, request.headers.get(PROFILE_HEADER)):
+            with profile_request(trace):
+                response = await call_next(request)
+        else:
+            response = await call_next(request)
+        route = request.scope.get('route')
+        trace.root.attrs.update(endpoint=getattr(route, 'path', 'unmatched'), status=response.status_code)
+    response.headers["X-Request-ID"] = trace.request_id
+    return response
+
 # REMOVED FastAPI CORSMiddleware - using ONLY custom middleware
 # FastAPI's CORSMiddleware was interfering with our custom CORS handling
 # Our custom middleware handles ALL CORS including exact matches and suffix-based matching
 # This ensures OPTIONS preflight requests are handled correctly with proper headers
 
+def _log_startup_timings(timings):
+    """Log the per-component startup timing table once warm-up finishes"""
+    logger.info("Startup component timings:\n" + startup_report(timings))
+    if data_versions.loaded:
+        logger.info("Data bundle component timings:\n" + startup_report(data_versions.current.timings))
+
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
@@ -278,8 +396,17 @@ async def startup_event():
         logger.warning(f"⚠ Database initialization failed: {e}")
         logger.warning("  API will continue without database features")
     
+    if STARTUP_WARMUP:
+        # Health checks are served meanwhile; other requests wait until the warm-up thread finishes
+        startup_components.load_in_background(on_done=_log_startup_timings)
+    
     logger.info("✓ Chancify AI API started successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Finish queued slow-trace writes before the worker exits."""
+    flush_writes()
+
 @app.get("/")
 async def root():
     """Root health check endpoint"""
@@ -290,6 +417,11 @@ async def root():
         "environment": ENV
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Per-endpoint stage latency histograms and operation counts in Prometheus text format"""
+    return Response(latency_metrics.render() + cost_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/api/health")
 async def health_check():
     """Detailed health check for Railway"""
@@ -313,6 +445,8 @@ async def health_check():
         "status": "healthy",
         "database": db_status,
         "scoring_system": "loaded",
+        "catalog_version": data_versions.current.sources['catalog'] if data_versions.loaded else None,
+        "components": startup_components.status(),
         "environment": ENV,
         "port": os.environ.get("PORT", "8000")
     }
@@ -362,6 +496,7 @@ async def search_colleges(q: str = "", limit: int = 20):
                         break
                 
                 if csv_path:
+                    count('file_reads')
                     college_df = pd.read_csv(csv_path)
                 else:
                     logger.warning(f"Could not find real_colleges_integrated.csv. Tried: {possible_paths}")
@@ -385,6 +520,7 @@ async def search_colleges(q: str = "", limit: int = 20):
         # If we found an official name from nickname mapping, search for that
         if official_name:
             logger.info(f"Searching for official name: {official_name}")
+            count('rows_scanned', len(college_df))
             for _, row in college_df.iterrows():
                 college_name = str(row.get('name', '')).lower()
                 if official_name.lower() in college_name or college_name in official_name.lower():
@@ -396,6 +532,7 @@ async def search_colleges(q: str = "", limit: int = 20):
             logger.info(f"No nickname matches, doing regular search for: {query}")
             
             # Search through college names
+            count('rows_scanned', len(college_df))
             for _, row in college_df.iterrows():
                 college_name = str(row.get('name', '')).lower()
                 if query in college_name:
@@ -404,6 +541,7 @@ async def search_colleges(q: str = "", limit: int = 20):
             # If still no matches, try broader search
             if not matching_colleges:
                 logger.info("No direct matches, trying broader search")
+                count('rows_scanned', len(college_df))
                 for _, row in college_df.iterrows():
                     college_name = str(row.get('name', '')).lower()
                     city = str(row.get('city', '')).lower()
@@ -615,27 +753,25 @@ async def get_improvement_analysis(college_name: str, user_profile: Dict[str, An
         # Get improvement recommendations
         improvements = improvement_analysis_service.analyze_user_profile(user_profile, college_name)
         
-        # Calculate combined impact
-        combined_impact = improvement_analysis_service.calculate_combined_impact(improvements)
+        # Measure every improvement by re-scoring the perturbed profiles in one batch, then rank by gain
+        measured = improvement_analysis_service.measure_probability_deltas(
+            user_profile, improvements, catalog_college_features(college_name), get_predictor()
+        )
+        improvements = measured["improvements"]
+        combined_impact = int(round(measured["combined_delta"] * 100))
         
         # Convert to JSON-serializable format
-        improvements_data = []
-        for imp in improvements:
-            improvements_data.append({
-                "area": imp.area,
-                "current": imp.current,
-                "target": imp.target,
-                "impact": imp.impact,
-                "priority": imp.priority,
-                "description": imp.description,
-                "actionable_steps": imp.actionable_steps
-            })
+        improvements_data = [format_improvement(imp) for imp in improvements]
         
         result = {
             "success": True,
             "college_name": college_name,
             "improvements": improvements_data,
             "combined_impact": combined_impact,
+            "base_probability": round(measured["base_probability"], 4),
+            "combined_probability": round(measured["combined_probability"], 4),
+            "combined_delta": round(measured["combined_delta"], 4),
+            "combined_areas": measured["combined_areas"],
             "total_improvements": len(improvements)
         }
         
@@ -655,8 +791,14 @@ async def get_improvement_analysis(college_name: str, user_profile: Dict[str, An
 # Include API routes
 from api.routes import calculations, ml_calculations, openai_routes, auth
 from services.openai_service import college_info_service
-from ml.models.predictor import get_predictor
+from ml.models.predictor import activate_model, active_model_version, get_predictor, load_version
+from ml.models.registry import model_registry
+from ml.models.shadow import shadow_scorer
+from ml.models.whatif_session import WhatIfSession, whatif_sessions
+from core.portfolio import DEFAULT_SEED, DEFAULT_STRENGTH_CORRELATION, DEFAULT_TRIALS, simulate_portfolio
+from core.list_optimizer import optimize_application_list
 from ml.preprocessing.feature_extractor import StudentFeatures, CollegeFeatures
+from ml.preprocessing.frontend_profile import frontend_profile_to_student_features
 from pydantic import BaseModel
 import pandas as pd
 
@@ -665,7 +807,46 @@ app.include_router(calculations.router, prefix="/api/calculations", tags=["Proba
 app.include_router(ml_calculations.router, prefix="/api/calculations", tags=["ML Predictions"])
 app.include_router(openai_routes.router, prefix="/api/openai", tags=["OpenAI College Info"])
 
+@timed('college_resolution')
+def find_college_row(college_name: str) -> Optional[pd.DataFrame]:
+    """Catalog rows matching a college id (college_<unitid>) or name; None or empty if no match."""
+    # Mapped catalog snapshot (no CSV parsing per call)
+    df = get_catalog_snapshot().frame()
+    
+    # Check if the input is a college ID (format: college_XXXXXX)
+    college_row = None
+    if college_name.startswith('college_'):
+        college_id = college_name.replace('college_', '')
+        logger.info(f"Looking for college ID: {college_id}")
+        
+        # Try to find by unitid (MOST COMMON CASE)
+        count('rows_scanned', len(df))
+        college_row = df[df['unitid'] == int(college_id)]
+        logger.info(f"Found by unitid: {len(college_row)} rows")
+        
+        if not college_row.empty:
+            logger.info(f"✅ SUCCESS: Found college by ID")
+        else:
+            logger.warning(f"❌ FAILED: No college found with unitid={college_id}")
+    else:
+        # Find the college by name (case-insensitive, with exact matching first)
+        college_name_lower = college_name.lower()
+        count('rows_scanned', len(df))
+        college_row = df[df['name'].str.lower() == college_name_lower]
+        logger.info(f"Exact match found: {len(college_row)} rows")
+        
+        # If exact match not found, try partial matching but prefer shorter matches
+        if college_row.empty:
+            count('rows_scanned', len(df))
+            college_row = df[df['name'].str.lower().str.contains(college_name_lower, na=False)]
+            logger.info(f"Partial match found: {len(college_row)} rows")
+            # If multiple matches, prefer the one with the shortest name (most specific)
+            if not college_row.empty and len(college_row) > 1:
+                college_row = college_row.loc[college_row['name'].str.len().idxmin():college_row['name'].str.len().idxmin()]
+    return college_row
+
 # College data mapping based on training data
+@timed('get_college_data')
 def get_college_data(college_name: str) -> Dict[str, Any]:
     """Get college data based on college name from integrated data."""
     
@@ -673,61 +854,16 @@ def get_college_data(college_name: str) -> Dict[str, Any]:
     
     # Load the integrated college data
     try:
-        # Try multiple possible paths
-        possible_paths = [
-            os.path.join(os.path.dirname(__file__), 'data', 'raw', 'real_colleges_integrated.csv'),  # Relative to main.py
-            'data/raw/real_colleges_integrated.csv',  # Relative to current working directory
-            os.path.join(os.getcwd(), 'backend', 'data', 'raw', 'real_colleges_integrated.csv'),  # From project root
-        ]
-        
-        csv_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                csv_path = path
-                break
-        
-        if csv_path:
-            df = pd.read_csv(csv_path)
-            logger.info(f"Loaded college data: {df.shape} from {csv_path}")
-        else:
-            raise FileNotFoundError(f"Could not find real_colleges_integrated.csv. Tried: {possible_paths}")
-        
-        # Check if the input is a college ID (format: college_XXXXXX)
-        college_row = None
-        if college_name.startswith('college_'):
-            college_id = college_name.replace('college_', '')
-            logger.info(f"Looking for college ID: {college_id}")
-            
-            # Try to find by unitid (MOST COMMON CASE)
-            college_row = df[df['unitid'] == int(college_id)]
-            logger.info(f"Found by unitid: {len(college_row)} rows")
-            
-            if not college_row.empty:
-                logger.info(f"✅ SUCCESS: Found college by ID")
-            else:
-                logger.warning(f"❌ FAILED: No college found with unitid={college_id}")
-        else:
-            # Find the college by name (case-insensitive, with exact matching first)
-            college_name_lower = college_name.lower()
-            college_row = df[df['name'].str.lower() == college_name_lower]
-            logger.info(f"Exact match found: {len(college_row)} rows")
-            
-            # If exact match not found, try partial matching but prefer shorter matches
-            if college_row.empty:
-                college_row = df[df['name'].str.lower().str.contains(college_name_lower, na=False)]
-                logger.info(f"Partial match found: {len(college_row)} rows")
-                # If multiple matches, prefer the one with the shortest name (most specific)
-                if not college_row.empty and len(college_row) > 1:
-                    college_row = college_row.loc[college_row['name'].str.len().idxmin():college_row['name'].str.len().idxmin()]
+        college_row = find_college_row(college_name)
         
         if college_row is not None and not college_row.empty:
             row = college_row.iloc[0]
             logger.info(f"Found college: {row['name']}")
             # Debug: Print all column names and the name value
-            logger.info(f"CSV columns: {list(row.index)}")
-            logger.info(f"Row name value: {row.get('name', 'MISSING_NAME_COLUMN')}")
-            logger.info(f"Row name type: {type(row.get('name'))}")
-            logger.info(f"Row name is NaN: {pd.isna(row.get('name'))}")
+            logger.debug(f"CSV columns: {list(row.index)}")
+            logger.debug(f"Row name value: {row.get('name', 'MISSING_NAME_COLUMN')}")
+            logger.debug(f"Row name type: {type(row.get('name'))}")
+            logger.debug(f"Row name is NaN: {pd.isna(row.get('name'))}")
             
             # Try to get name from different possible column names
             college_actual_name = None
@@ -742,6 +878,7 @@ def get_college_data(college_name: str) -> Dict[str, Any]:
             
             result = {
                 'name': college_actual_name,
+                'unitid': int(row['unitid']) if pd.notna(row.get('unitid')) else None,
                 'acceptance_rate': float(row.get('acceptance_rate', 0.5)) if pd.notna(row.get('acceptance_rate')) else (float(row.get('acceptance_rate_percent', 50)) / 100 if pd.notna(row.get('acceptance_rate_percent')) else 0.5),
                 'sat_25th': 1200,  # Default values since SAT/ACT data not available
                 'sat_75th': 1500,
@@ -758,7 +895,7 @@ def get_college_data(college_name: str) -> Dict[str, Any]:
                 'student_body_size': int(row.get('student_body_size', 5000)) if pd.notna(row.get('student_body_size')) else 5000,
                 'is_public': str(row.get('control', 'Private')).lower() == 'public' if pd.notna(row.get('control')) else False
             }
-            logger.info(f"Returning college data: {result}")
+            logger.debug(f"Returning college data: {result}")
             return result
         else:
             logger.warning(f"No college found for: {college_name}")
@@ -867,132 +1004,40 @@ async def predict_admission_frontend(request: FrontendProfileRequest):
         # Get predictor
         predictor = get_predictor()
         
-        # Convert frontend string values to appropriate types
-        def safe_int(value: str) -> int:
-            try:
-                return int(value) if value and value.strip() else 0
-            except (ValueError, TypeError):
-                return 0
-        
-        # Calculate derived factor scores from real data
-        gpa_unweighted = safe_float(request.gpa_unweighted)
-        gpa_weighted = safe_float(request.gpa_weighted)
-        sat_score = safe_int(request.sat)
-        act_score = safe_int(request.act)
-        
-        # Calculate grades score from GPA (0-10 scale)
-        def calculate_grades_score(gpa_unweighted, gpa_weighted):
-            if gpa_unweighted > 0:
-                # Convert 4.0 scale to 10.0 scale
-                return min(10.0, (gpa_unweighted / 4.0) * 10.0)
-            elif gpa_weighted > 0:
-                # Convert 5.0 scale to 10.0 scale
-                return min(10.0, (gpa_weighted / 5.0) * 10.0)
-            return 5.0  # Default neutral
-        
-        # Calculate testing score from SAT/ACT (0-10 scale)
-        def calculate_testing_score(sat, act):
-            if sat > 0:
-                # FIXED: More realistic SAT scoring - 1200=5.0, 1600=10.0
-                return min(10.0, max(0.0, ((sat - 1200) / 400) * 5.0 + 5.0))
-            elif act > 0:
-                # FIXED: More realistic ACT scoring - 20=5.0, 36=10.0
-                return min(10.0, max(0.0, ((act - 20) / 16) * 5.0 + 5.0))
-            return 5.0  # Default neutral
-        
-        # Calculate major fit score based on major relevance
-        def calculate_major_fit_score(major, college_name):
-            # This would ideally use a major-college relevance database
-            # For now, use a simple heuristic based on major popularity
-            popular_majors = ['Computer Science', 'Business', 'Engineering', 'Biology', 'Psychology']
-            if major in popular_majors:
-                return 7.0  # Good fit for popular majors
-            return 6.0  # Neutral fit
-        
         # Create student features from frontend data
-        student = StudentFeatures(
-            # Academic metrics
-            gpa_unweighted=gpa_unweighted,
-            gpa_weighted=gpa_weighted,
-            sat_total=sat_score,
-            act_composite=act_score,
-            
-            # Course rigor and class info
-            ap_count=int(safe_float(request.extracurricular_depth) * 2),  # Estimate based on extracurricular depth
-            honors_count=int(safe_float(request.extracurricular_depth) * 1.5),  # Estimate based on extracurricular depth
-            class_rank_percentile=safe_float(request.hs_reputation) * 10,  # Estimate based on HS reputation
-            class_size=500,  # Default class size
-            
-            # Extracurricular counts and commitment
-            ec_count=min(10, max(1, safe_int(request.extracurricular_depth) // 2)),  # Derive from extracurricular depth
-            leadership_positions_count=safe_int(request.leadership_positions),
-            years_commitment=min(6, max(1, safe_int(request.extracurricular_depth) // 2)),  # Derive from extracurricular depth
-            hours_per_week=min(20.0, max(2.0, safe_float(request.extracurricular_depth) * 1.5)),  # Derive from extracurricular depth
-            awards_count=safe_int(request.awards_publications),
-            national_awards=min(5, max(0, safe_int(request.awards_publications) // 2)),  # Derive from awards/publications
-            
-            # Demographics and diversity
-            first_generation=safe_float(request.firstgen_diversity) > 7.0,  # Derive from firstgen_diversity
-            underrepresented_minority=safe_float(request.firstgen_diversity) > 6.0,  # Derive from firstgen_diversity
-            geographic_diversity=safe_float(request.geographic_diversity),
-            legacy_status=bool(safe_int(request.legacy_status)),
-            recruited_athlete=safe_float(request.volunteer_work) > 7.0,  # Derive from volunteer_work
-            
-            # Factor scores (calculated from real data, not defaults)
-            factor_scores={
-                'grades': calculate_grades_score(gpa_unweighted, gpa_weighted),
-                'rigor': safe_float(request.extracurricular_depth),  # Use extracurricular depth as rigor proxy
-                'testing': calculate_testing_score(sat_score, act_score),
-                'essay': safe_float(request.essay_quality),
-                'ecs_leadership': safe_float(request.extracurricular_depth),
-                'recommendations': safe_float(request.recommendations),
-                'plan_timing': safe_float(request.plan_timing),
-                'athletic_recruit': safe_float(request.volunteer_work),  # Use volunteer_work as proxy
-                'major_fit': calculate_major_fit_score(request.major, "Unknown"),  # No specific college for suggestions
-                'geography_residency': safe_float(request.geography_residency),
-                'firstgen_diversity': safe_float(request.firstgen_diversity),
-                'ability_to_pay': safe_float(request.ability_to_pay),
-                'awards_publications': safe_float(request.awards_publications),
-                'portfolio_audition': safe_float(request.portfolio_audition),
-                'policy_knob': safe_float(request.policy_knob),
-                'demonstrated_interest': safe_float(request.demonstrated_interest),
-                'legacy': safe_float(request.legacy_status),
-                'interview': safe_float(request.interview),
-                'conduct_record': safe_float(request.conduct_record),
-                'hs_reputation': safe_float(request.hs_reputation)
-            }
-        )
+        student = frontend_profile_to_student_features(request.dict())
         
         # Get college data with real acceptance rate from OpenAI
         college_data = get_college_data(request.college)
-        logger.info(f"College data retrieved: {college_data}")
-        logger.info(f"College name: {college_data.get('name', 'MISSING')}")
-        logger.info(f"College city: {college_data.get('city', 'MISSING')}")
-        logger.info(f"College state: {college_data.get('state', 'MISSING')}")
+        logger.debug(f"College data retrieved: {college_data}")
+        logger.debug(f"College name: {college_data.get('name', 'MISSING')}")
+        logger.debug(f"College city: {college_data.get('city', 'MISSING')}")
+        logger.debug(f"College state: {college_data.get('state', 'MISSING')}")
         
         # Get real acceptance rate and subject emphasis from OpenAI API
-        try:
-            college_info = await college_info_service.get_college_info(college_data['name'])
-            real_acceptance_rate = college_info['academics']['acceptance_rate']
-            print(f"Using real acceptance rate for {college_data['name']}: {real_acceptance_rate:.1%}")
+        with stage('enrichment'):
+            try:
+                college_info = await college_info_service.get_college_info(college_data['name'])
+                real_acceptance_rate = college_info['academics']['acceptance_rate']
+                print(f"Using real acceptance rate for {college_data['name']}: {real_acceptance_rate:.1%}")
             
-            # Get subject emphasis data
-            subject_data = await college_info_service.get_college_subject_emphasis(college_data['name'])
-            subject_emphasis = subject_data['subject_emphasis']
-            print(f"Using real subject emphasis for {college_data['name']}: {len(subject_emphasis)} subjects")
-        except Exception as e:
-            print(f"Failed to get OpenAI data for {college_data['name']}: {e}")
-            real_acceptance_rate = college_data['acceptance_rate']  # Fallback to database value
-            subject_emphasis = [
-                {"label": "Computer Science", "value": 28},
-                {"label": "Engineering", "value": 24},
-                {"label": "Business", "value": 16},
-                {"label": "Biological Sciences", "value": 14},
-                {"label": "Mathematics & Stats", "value": 11},
-                {"label": "Social Sciences", "value": 9},
-                {"label": "Arts & Humanities", "value": 7},
-                {"label": "Education", "value": 5}
-            ]
+                # Get subject emphasis data
+                subject_data = await college_info_service.get_college_subject_emphasis(college_data['name'])
+                subject_emphasis = subject_data['subject_emphasis']
+                print(f"Using real subject emphasis for {college_data['name']}: {len(subject_emphasis)} subjects")
+            except Exception as e:
+                print(f"Failed to get OpenAI data for {college_data['name']}: {e}")
+                real_acceptance_rate = college_data['acceptance_rate']  # Fallback to database value
+                subject_emphasis = [
+                    {"label": "Computer Science", "value": 28},
+                    {"label": "Engineering", "value": 24},
+                    {"label": "Business", "value": 16},
+                    {"label": "Biological Sciences", "value": 14},
+                    {"label": "Mathematics & Stats", "value": 11},
+                    {"label": "Social Sciences", "value": 9},
+                    {"label": "Arts & Humanities", "value": 7},
+                    {"label": "Education", "value": 5}
+                ]
         
         college = CollegeFeatures(
             name=college_data['name'],
@@ -1004,11 +1049,14 @@ async def predict_admission_frontend(request: FrontendProfileRequest):
             test_policy=college_data['test_policy'],
             financial_aid_policy=college_data['financial_aid_policy'],
             selectivity_tier=college_data['selectivity_tier'],
-            gpa_average=college_data['gpa_average']
+            gpa_average=college_data['gpa_average'],
+            unitid=college_data.get('unitid')
         )
         
         # Make hybrid prediction
+        predict_started = time.perf_counter()
         result = predictor.predict(student, college, model_name='ensemble', use_formula=True)
+        shadow_scorer.submit(student, college, result, time.perf_counter() - predict_started)
         
         # Determine category based on final probability
         # Use same thresholds as suggestions endpoint: Safety: 75%+, Target: 25-75%, Reach: 10-25%
@@ -1066,6 +1114,373 @@ async def predict_admission_frontend(request: FrontendProfileRequest):
             "message": "Prediction failed. Please try again."
         }
 
+# What-if session request model: a frontend profile plus the colleges to track
+class WhatIfSessionRequest(FrontendProfileRequest):
+    colleges: List[str] = []
+
+def catalog_college_features(college_name: str) -> CollegeFeatures:
+    """CollegeFeatures for a college name or id, using catalog data only."""
+    college_data = get_college_data(college_name)
+    return CollegeFeatures(
+        name=college_data['name'],
+        acceptance_rate=college_data['acceptance_rate'],
+        sat_25th=college_data['sat_25th'],
+        sat_75th=college_data['sat_75th'],
+        act_25th=college_data['act_25th'],
+        act_75th=college_data['act_75th'],
+        test_policy=college_data['test_policy'],
+        financial_aid_policy=college_data['financial_aid_policy'],
+        selectivity_tier=college_data['selectivity_tier'],
+        gpa_average=college_data['gpa_average'],
+        unitid=college_data.get('unitid')
+    )
+
+def catalog_row_college_features(row: Dict[str, Any]) -> CollegeFeatures:
+    """CollegeFeatures from a loaded catalog row (same defaults as get_college_data)."""
+    return CollegeFeatures(
+        name=str(row['name']),
+        acceptance_rate=float(row['acceptance_rate']) if pd.notna(row.get('acceptance_rate')) else 0.5,
+        sat_25th=1200,
+        sat_75th=1500,
+        act_25th=25,
+        act_75th=35,
+        test_policy=str(row.get('test_policy', 'Required')),
+        financial_aid_policy=str(row.get('financial_aid_policy', 'Need-blind')),
+        selectivity_tier=str(row.get('selectivity_tier', 'Moderately Selective')),
+        gpa_average=float(row['gpa_average']) if pd.notna(row.get('gpa_average')) else 3.7,
+        unitid=int(row['unitid'])
+    )
+
+def format_whatif_results(session, results) -> List[Dict[str, Any]]:
+    """Per-college what-if results in the /api/predict/frontend field names."""
+    composites = session.composites()
+    formatted = []
+    for college, composite, result in zip(session.colleges, composites, results):
+        prob = float(result.probability)
+        formatted.append({
+            "college_name": college.name,
+            "probability": round(prob, 4),
+            "ml_probability": round(float(result.ml_probability), 4),
+            "formula_probability": round(float(result.formula_probability), 4),
+            "composite_score": round(float(composite), 1),
+            "category": "safety" if prob >= 0.75 else ("target" if prob >= 0.25 else "reach"),
+            "acceptance_rate": college.acceptance_rate
+        })
+    return formatted
+
+@app.post("/api/whatif/sessions")
+async def create_whatif_session(request: WhatIfSessionRequest):
+    """
+    Start a what-if session for slider-driven UIs.
+    
+    Loads the college data once and keeps the student's scores and the
+    per-college state server-side; slider moves then go to
+    /api/whatif/sessions/{session_id}/update with only the changed fields.
+    Uses catalog acceptance rates (no OpenAI lookups) so updates stay fast.
+    """
+    try:
+        if not request.colleges:
+            return {"success": False, "error": "No colleges given", "message": "Select at least one college."}
+        
+        colleges = [catalog_college_features(college_name) for college_name in request.colleges]
+        profile = request.dict(exclude={'colleges'})
+        session = WhatIfSession(get_predictor(), profile, colleges)
+        session_id = whatif_sessions.add(session)
+        
+        return {
+            "success": True,
+            "session_id": session_id,
+            "results": format_whatif_results(session, session.results())
+        }
+    except Exception as e:
+        logger.error(f"What-if session error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Could not start what-if session. Please try again."
+        }
+
+@app.post("/api/whatif/sessions/{session_id}/update")
+async def update_whatif_session(session_id: str, changes: Dict[str, Any]):
+    """Apply changed profile fields to a what-if session and re-score its colleges."""
+    session = whatif_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="What-if session not found or expired")
+    
+    unknown = sorted(set(changes) - set(FrontendProfileRequest.model_fields) - {'college'})
+    if unknown:
+        return {"success": False, "error": f"Unknown profile fields: {', '.join(unknown)}"}
+    
+    start = time.perf_counter()
+    results = session.update({field: str(value) for field, value in changes.items()})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    return {
+        "success": True,
+        "session_id": session_id,
+        "results": format_whatif_results(session, results),
+        "elapsed_ms": round(elapsed_ms, 3)
+    }
+
+@app.delete("/api/whatif/sessions/{session_id}")
+async def delete_whatif_session(session_id: str):
+    """End a what-if session."""
+    return {"success": whatif_sessions.remove(session_id), "session_id": session_id}
+
+# Portfolio simulation request: a profile plus colleges, or an open what-if session
+class PortfolioSimulationRequest(WhatIfSessionRequest):
+    session_id: Optional[str] = None
+    trials: int = DEFAULT_TRIALS
+    strength_correlation: float = DEFAULT_STRENGTH_CORRELATION
+    seed: int = DEFAULT_SEED
+
+@app.post("/api/portfolio/simulate")
+async def simulate_application_portfolio(request: PortfolioSimulationRequest):
+    """
+    Odds across a whole application list.
+    
+    Scores every college with the batched predictor (or reuses an open
+    what-if session), then simulates correlated outcomes with a shared
+    applicant-strength factor. Returns the distribution of the number of
+    admits, P(at least one admit) and P(at least one reach admit).
+    """
+    try:
+        if request.session_id:
+            session = whatif_sessions.get(request.session_id)
+            if session is None:
+                raise HTTPException(status_code=404, detail="What-if session not found or expired")
+            colleges, results = session.colleges, session.results()
+        else:
+            if not request.colleges:
+                return {"success": False, "error": "No colleges given", "message": "Select at least one college."}
+            colleges = [catalog_college_features(college_name) for college_name in request.colleges]
+            student = frontend_profile_to_student_features(request.dict())
+            results = get_predictor().predict_batch(student, colleges)
+        
+        probabilities = np.array([float(result.probability) for result in results])
+        simulation = simulate_portfolio(
+            probabilities,
+            reach_mask=probabilities < 0.25,
+            trials=request.trials,
+            strength_correlation=request.strength_correlation,
+            seed=request.seed
+        )
+        
+        return {
+            "success": True,
+            "colleges": [
+                {"college_name": college.name, "probability": round(prob, 4), "is_reach": bool(prob < 0.25)}
+                for college, prob in zip(colleges, probabilities.tolist())
+            ],
+            "simulation": simulation.to_dict()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Portfolio simulation error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Portfolio simulation failed. Please try again."
+        }
+
+# Application-list optimizer: utility components are each scaled to 0-1
+DEFAULT_UTILITY_WEIGHTS = {
+    'selectivity': 0.4,      # 1 - acceptance rate
+    'major_strength': 0.4,   # IPEDS strength of the student's major at the college
+    'affordability': 0.2     # 1 - net price relative to the priciest college in the pool
+}
+DEFAULT_APPLICATION_FEE = 75.0
+
+class CollegeListOptimizationRequest(FrontendProfileRequest):
+    colleges: List[str] = []  # Saved list (names or college_<unitid>); empty = colleges offering the major
+    max_applications: int = 10
+    budget: Optional[float] = None
+    application_fee: float = DEFAULT_APPLICATION_FEE
+    application_fees: Dict[str, float] = {}  # Per-college fee overrides by name
+    utility_weights: Dict[str, float] = {}
+
+@app.post("/api/optimize/college-list")
+async def optimize_college_list(request: CollegeListOptimizationRequest):
+    """
+    Choose the application list that maximizes expected outcome.
+    
+    Scores the whole candidate pool in one batch, builds a utility per
+    college from the weighted components in DEFAULT_UTILITY_WEIGHTS, then
+    greedily picks colleges (lazy evaluation) to maximize the expected
+    utility of the best admission offer, within max_applications and the
+    optional application-fee budget.
+    """
+    try:
+        unknown = sorted(set(request.utility_weights) - set(DEFAULT_UTILITY_WEIGHTS))
+        if unknown:
+            return {"success": False, "error": f"Unknown utility weights: {', '.join(unknown)}"}
+        weights = {**DEFAULT_UTILITY_WEIGHTS, **request.utility_weights}
+        
+        # Candidate pool straight from the loaded catalog (no per-college CSV reads)
+        catalog = real_college_suggestions.college_df
+        ipeds_major = real_ipeds_mapping.map_major_name(request.major)
+        if request.colleges:
+            ids = [int(c.replace('college_', '')) for c in request.colleges if c.startswith('college_') and c[8:].isdigit()]
+            pool = catalog[catalog['name'].isin(request.colleges) | catalog['unitid'].isin(ids)]
+        else:
+            pool = catalog[catalog['name'].isin(real_ipeds_mapping.get_colleges_for_major(ipeds_major))]
+            if pool.empty:
+                pool = catalog
+        pool = pool.drop_duplicates('unitid').reset_index(drop=True)
+        matched = set(pool['name']) | {f"college_{unitid}" for unitid in pool['unitid']}
+        unmatched = [c for c in request.colleges if c not in matched]
+        if pool.empty:
+            return {"success": False, "error": "No matching colleges", "message": "None of the colleges were found."}
+        
+        colleges = [catalog_row_college_features(row) for row in pool.to_dict('records')]
+        
+        student = frontend_profile_to_student_features(request.dict())
+        probabilities = get_predictor().predict_probabilities(student, colleges)
+        
+        acceptance = np.array([college.acceptance_rate for college in colleges])
+        net_price = pd.to_numeric(pool['avg_net_price_usd'], errors='coerce').to_numpy(dtype=float)
+        max_price = np.nanmax(net_price) if np.isfinite(net_price).any() else 0.0
+        affordability = np.where(np.isfinite(net_price) & (max_price > 0), 1.0 - net_price / (max_price or 1.0), 0.5)
+        major_strength = np.array([
+            real_ipeds_mapping.get_major_strength_score(
+                college.name, ipeds_major, tier=real_ipeds_mapping.normalize_tier(college.selectivity_tier)
+            )
+            for college in colleges
+        ])
+        utilities = (
+            weights['selectivity'] * (1.0 - acceptance) +
+            weights['major_strength'] * major_strength +
+            weights['affordability'] * affordability
+        )
+        costs = np.array([request.application_fees.get(college.name, request.application_fee) for college in colleges])
+        
+        plan = optimize_application_list(
+            probabilities,
+            utilities,
+            max_applications=max(0, request.max_applications),
+            costs=costs,
+            budget=request.budget
+        )
+        
+        selected = []
+        for i, gain in zip(plan.selected, plan.marginal_gains):
+            prob = float(probabilities[i])
+            selected.append({
+                "college_name": colleges[i].name,
+                "unitid": colleges[i].unitid,
+                "probability": round(prob, 4),
+                "utility": round(float(utilities[i]), 4),
+                "marginal_gain": round(gain, 4),
+                "application_fee": round(float(costs[i]), 2),
+                "category": "safety" if prob >= 0.75 else ("target" if prob >= 0.25 else "reach")
+            })
+        
+        return {
+            "success": True,
+            "pool_size": len(colleges),
+            "unmatched_colleges": unmatched,
+            "utility_weights": weights,
+            "colleges": selected,
+            "expected_utility": round(plan.expected_utility, 4),
+            "prob_at_least_one": round(plan.prob_at_least_one, 4),
+            "total_cost": round(plan.total_cost, 2)
+        }
+    except Exception as e:
+        logger.error(f"College list optimization error: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "College list optimization failed. Please try again."
+        }
+
+class ImprovementAnalysisListRequest(BaseModel):
+    profile: Dict[str, Any]
+    colleges: List[str]  # Names or college_<unitid>
+
+def format_improvement(imp) -> Dict[str, Any]:
+    """JSON fields of an ImprovementArea (same as /api/improvement-analysis/{college_name})."""
+    return {
+        "area": imp.area,
+        "current": imp.current,
+        "target": imp.target,
+        "impact": imp.impact,
+        "heuristic_impact": imp.heuristic_impact,
+        "probability_delta": None if imp.probability_delta is None else round(imp.probability_delta, 4),
+        "priority": imp.priority,
+        "description": imp.description,
+        "actionable_steps": imp.actionable_steps
+    }
+
+@app.post("/api/improvement-analysis",
+         summary="Improvement recommendations for a whole college list",
+         tags=["Improvement Analysis"])
+async def get_improvement_analysis_list(request: ImprovementAnalysisListRequest):
+    """
+    Improvement analysis for many colleges in one request.
+    
+    Colleges are resolved through the loaded catalog in one lookup, the
+    profile-only analyses run once, and every perturbed profile is scored
+    against every college in one batch. Returns per-college recommendations
+    plus list-level improvements ranked by aggregate gain (expected
+    additional admits across the list).
+    """
+    try:
+        if not request.colleges:
+            return {"success": False, "error": "No colleges provided", "colleges": [], "improvements": []}
+        
+        # Resolve every college through one catalog query; fall back to fuzzy lookup for the rest
+        catalog = real_college_suggestions.college_df
+        ids = [int(c[8:]) for c in request.colleges if c.startswith('college_') and c[8:].isdigit()]
+        rows = catalog[catalog['name'].isin(request.colleges) | catalog['unitid'].isin(ids)].to_dict('records')
+        by_key = {}
+        for row in rows:
+            by_key.setdefault(row['name'], row)
+            by_key.setdefault(f"college_{int(row['unitid'])}", row)
+        colleges = [
+            catalog_row_college_features(by_key[name]) if name in by_key else catalog_college_features(name)
+            for name in request.colleges
+        ]
+        
+        analysis = improvement_analysis_service.analyze_college_list(
+            request.profile, [college.name for college in colleges], colleges, get_predictor()
+        )
+        
+        return {
+            "success": True,
+            "colleges": [
+                {
+                    "college_name": entry["college_name"],
+                    "requested_as": requested,
+                    "base_probability": round(entry["base_probability"], 4),
+                    "combined_probability": round(entry["combined_probability"], 4),
+                    "improvements": [format_improvement(imp) for imp in entry["improvements"]]
+                }
+                for requested, entry in zip(request.colleges, analysis["colleges"])
+            ],
+            "improvements": [
+                {
+                    "area": entry["area"],
+                    "aggregate_gain": round(entry["aggregate_gain"], 4),
+                    "colleges": entry["colleges"],
+                    "priority": entry["priority"]
+                }
+                for entry in analysis["improvements"]
+            ],
+            "base_expected_admits": round(analysis["base_expected_admits"], 4),
+            "combined_expected_admits": round(analysis["combined_expected_admits"], 4),
+            "combined_areas": analysis["combined_areas"],
+            "total_colleges": len(colleges)
+        }
+    except Exception as e:
+        logger.error(f"Error getting list improvement analysis: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "colleges": [],
+            "improvements": []
+        }
+
 # College suggestions request model (simplified)
 # This model receives user profile data from the frontend and generates
 # AI-powered college suggestions based on academic strength and preferences
@@ -1313,7 +1728,8 @@ async def predict_admission(request: PredictionRequest):
             act_75th=college_data.get('act_75th', 35),
             test_policy=college_data.get('test_policy', 'Required'),
             financial_aid_policy=college_data.get('financial_aid_policy', 'Need-blind'),
-            selectivity_tier=college_data.get('selectivity_tier', 'Elite')
+            selectivity_tier=college_data.get('selectivity_tier', 'Elite'),
+            unitid=college_data.get('unitid')
         )
         
         # Make prediction
@@ -1379,15 +1795,18 @@ async def predict_admission(request: PredictionRequest):
         }
 
 # Debug endpoint to force reload predictor
-@app.get("/api/debug/reload-predictor")
-async def debug_reload_predictor():
-    """Debug endpoint to force reload the ML predictor."""
+@app.post("/api/debug/reload-predictor")
+async def debug_reload_predictor(request: Request):
+    """Debug endpoint to force reload the ML predictor (admin token required)."""
+    _require_admin(request)
+    from starlette.concurrency import run_in_threadpool
     try:
-        from ml.models.predictor import get_predictor
-        predictor = get_predictor(force_reload=True)
+        # Reload off the event loop; requests keep the current predictor until the swap
+        predictor = await run_in_threadpool(get_predictor, None, True)
         return {
             "status": "success",
             "message": "Predictor reloaded",
+            "workers_reloading": request_reload(),
             "models_available": len(predictor.models),
             "scaler_available": predictor.scaler is not None,
             "feature_selector_available": predictor.feature_selector is not None,
@@ -1399,6 +1818,142 @@ async def debug_reload_predictor():
             "message": f"Failed to reload predictor: {str(e)}"
         }
 
+@app.get("/api/debug/models")
+async def debug_models():
+    """Debug endpoint listing registered model versions, the served one and shadow stats."""
+    return {
+        "status": "success",
+        "message": f"{len(model_registry.versions())} registered model versions",
+        "serving": active_model_version(),
+        "active": model_registry.active_version(),
+        "versions": [asdict(version) for version in model_registry.versions()],
+        "shadow": shadow_scorer.stats()
+    }
+
+@app.post("/api/debug/models/activate")
+async def debug_activate_model(request: Request, version: str):
+    """Debug endpoint to load, warm and swap in a registered model version (admin token required)."""
+    _require_admin(request)
+    from starlette.concurrency import run_in_threadpool
+    try:
+        # Loading runs in a worker thread; requests keep the current predictor until the swap
+        predictor = await run_in_threadpool(activate_model, version)
+    except KeyError:
+        return {"status": "error", "message": f"Unknown model version {version}"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to activate model version {version}: {e}"}
+    return {
+        "status": "success",
+        "message": f"Serving model version {version}",
+        "workers_reloading": request_reload(),
+        "available_models": list(predictor.models.keys())
+    }
+
+@app.post("/api/debug/models/shadow")
+async def debug_shadow_model(request: Request, version: Optional[str] = None, rate: float = 0.05):
+    """Debug endpoint to shadow-score a candidate version on a sample of requests (no version stops it; admin token required)."""
+    _require_admin(request)
+    if version is None:
+        shadow_scorer.stop()
+        return {"status": "success", "message": "Shadow scoring stopped", "shadow": shadow_scorer.stats()}
+    from starlette.concurrency import run_in_threadpool
+    try:
+        candidate = await run_in_threadpool(load_version, version)
+        shadow_scorer.start(candidate, version, rate)
+    except KeyError:
+        return {"status": "error", "message": f"Unknown model version {version}"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to shadow model version {version}: {e}"}
+    return {
+        "status": "success",
+        "message": f"Shadow scoring {rate:.1%} of requests with model version {version}",
+        "shadow": shadow_scorer.stats()
+    }
+
+@app.post("/api/debug/reload-improvement-rules")
+async def debug_reload_improvement_rules(request: Request):
+    """Debug endpoint to recompile the improvement rule table from disk (admin token required)."""
+    _require_admin(request)
+    reloaded = improvement_analysis_service.reload_rules()
+    return {
+        "status": "success" if reloaded else "error",
+        "message": "Improvement rules reloaded" if reloaded else "Rule table failed to compile; previous rules kept",
+        "workers_reloading": reloaded and request_reload(),
+        "rules": len(improvement_analysis_service.rules.rules),
+        "version": improvement_analysis_service.rules.version
+    }
+
+@app.get("/api/debug/startup")
+async def debug_startup():
+    """Debug endpoint with the per-component startup timings."""
+    bundle_timings = data_versions.current.timings if data_versions.loaded else []
+    return {
+        "status": "success",
+        "message": "Startup component timings",
+        "components": [asdict(timing) for timing in startup_components.timings()],
+        "data_bundle": [asdict(timing) for timing in bundle_timings]
+    }
+
+@app.get("/api/debug/memory")
+async def debug_memory():
+    """Debug endpoint with this worker's unique vs shared resident memory (kB)."""
+    from core.prefork import process_memory
+    memory = process_memory(os.getpid())
+    return {
+        "status": "success" if memory is not None else "error",
+        "message": "Worker memory" if memory is not None else "Memory breakdown needs /proc (Linux)",
+        "pid": os.getpid(),
+        "memory_kb": memory
+    }
+
+@app.get("/api/debug/slow-requests")
+async def debug_slow_requests(request: Request, limit: int = 20):
+    """Debug endpoint returning the most recent slow-request span trees (admin token required)."""
+    _require_admin(request)
+    traces = read_slow_traces(min(max(1, limit), 200))
+    return {
+        "status": "success",
+        "message": f"{len(traces)} slow requests (threshold {SLOW_REQUEST_MS:.0f}ms)",
+        "traces": traces
+    }
+
+@app.get("/api/debug/profiles")
+async def debug_profiles(request: Request):
+    """Debug endpoint listing the saved request profiles (admin token required)."""
+    _require_admin(request)
+    profiles = list_profiles()
+    return {
+        "status": "success",
+        "message": f"{len(profiles)} request profiles",
+        "profiles": profiles
+    }
+
+@app.get("/api/debug/profiles/{request_id}")
+async def debug_profile_download(request: Request, request_id: str):
+    """Download a request profile as collapsed stacks (flamegraph.pl / speedscope input; admin token required)."""
+    _require_admin(request)
+    try:
+        path = profile_path(request_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No profile for request {request_id}") from None
+    return FileResponse(path, media_type="text/plain", filename=f"{request_id}.collapsed")
+
+@app.post("/api/debug/reload-data")
+async def debug_reload_data(request: Request):
+    """Debug endpoint to reload the catalog, mappings and calibration table from disk (admin token required)."""
+    _require_admin(request)
+    from starlette.concurrency import run_in_threadpool
+    reloaded = await run_in_threadpool(data_versions.reload)
+    bundle = data_versions.current
+    return {
+        "status": "success" if reloaded else "error",
+        "message": "Data reloaded" if reloaded else "New data failed to load or validate; previous version kept",
+        "workers_reloading": reloaded and request_reload(),
+        "version": bundle.version,
+        "sources": bundle.sources,
+        "error": data_versions.last_error
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -10,10 +10,18 @@ from .preprocessing import (
     StudentFeatures,
     CollegeFeatures
 )
-from .training import (
-    SyntheticDataGenerator,
-    generate_initial_dataset
-)
+
+# Training code is only needed offline; import it on first access so
+# importing the ML package for serving does not load it
+_TRAINING_EXPORTS = ('SyntheticDataGenerator', 'generate_initial_dataset')
+
+
+def __getattr__(name):
+    if name in _TRAINING_EXPORTS:
+        from . import training
+        return getattr(training, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Preprocessing
@@ -5,14 +5,38 @@ ML models module.
 from .predictor import (
     AdmissionPredictor,
     PredictionResult,
+    activate_model,
     get_predictor,
     model_available
 )
+from .registry import (
+    ModelRegistry,
+    ModelVersion,
+    model_registry
+)
+from .shadow import (
+    ShadowScorer,
+    shadow_scorer
+)
+from .whatif_session import (
+    WhatIfSession,
+    WhatIfSessionStore,
+    whatif_sessions
+)
 
 __all__ = [
     'AdmissionPredictor',
     'PredictionResult',
+    'activate_model',
     'get_predictor',
     'model_available',
+    'ModelRegistry',
+    'ModelVersion',
+    'model_registry',
+    'ShadowScorer',
+    'shadow_scorer',
+    'WhatIfSession',
+    'WhatIfSessionStore',
+    'whatif_sessions',
 ]
 
@@ -0,0 +1,258 @@
+"""
+Memory-mappable model artifacts.
+
+The legacy layout is one joblib file per model. Loading it unpickles every
+array into the process heap, so each worker pays for its own copy of the
+random forest, and the ensemble file stores the same fitted estimators a
+second time. The bundle layout fixes both:
+
+- All models, the scaler and the feature selector go into one
+  uncompressed joblib file (model_bundle.joblib) that
+  joblib.load(mmap_mode='r') maps instead of reading. Its pages live in
+  the page cache and are shared by every worker on the machine.
+- sklearn trees copy their nodes into their own heap buffers when
+  unpickled, which would defeat the mapping, so random forests are stored
+  as a MappedForest: flat node arrays with a numpy traversal that gives
+  the same predict_proba.
+- Ensemble members that are identical to a standalone model (same
+  joblib.hash) are replaced by that model before saving, so the pickle
+  stores them once and both names load as the same object.
+
+XGBoost boosters serialize themselves to an opaque byte buffer and are
+still loaded into the heap.
+
+joblib (and, through unpickling, sklearn) is imported inside the functions
+that need it, so importing this module costs nothing at API startup.
+
+Convert an existing model directory with:
+
+    python -m ml.models.artifacts [model_dir]
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_BUNDLE_FILE = 'model_bundle.joblib'
+MODEL_BUNDLE_FORMAT = 1
+
+# Legacy per-model files (model name -> file name)
+LEGACY_MODEL_FILES = {
+    'logistic_regression': 'logistic_regression.joblib',
+    'random_forest': 'random_forest.joblib',
+    'xgboost': 'xgboost.joblib',
+    'ensemble': 'ensemble.joblib'
+}
+
+
+class MappedForest:
+    """
+    RandomForestClassifier inference over flat node arrays.
+
+    Nodes of all trees are concatenated; child indices are global, -1 marks
+    a leaf. Each node stores its normalized class distribution, so a
+    prediction is the mean over trees of the reached leaves' rows.
+    """
+
+    def __init__(self, forest):
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be mapped")
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+        left, right, feature, threshold, missing_left, proba = [], [], [], [], [], []
+        for tree, offset in zip(trees, self.offsets[:-1]):
+            leaf = tree.children_left < 0
+            left.append(np.where(leaf, -1, tree.children_left + offset))
+            right.append(np.where(leaf, -1, tree.children_right + offset))
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            nodes = tree.__getstate__()['nodes']
+            if 'missing_go_to_left' in nodes.dtype.names:
+                missing_left.append(nodes['missing_go_to_left'].astype(bool))
+            else:
+                missing_left.append(np.zeros(tree.node_count, dtype=bool))
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            proba.append(value / normalizer)
+
+        self.left = np.concatenate(left).astype(np.int32)
+        self.right = np.concatenate(right).astype(np.int32)
+        self.feature = np.concatenate(feature).astype(np.int32)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.missing_left = np.concatenate(missing_left)
+        self.proba = np.concatenate(proba)
+        self.classes_ = forest.classes_
+        self.n_features_in_ = forest.n_features_in_
+        self.feature_importances_ = forest.feature_importances_
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.offsets) - 1
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities for the rows of X (same result as the source forest)"""
+        # Trees split on float32 features, as sklearn does
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        n_trees = self.n_estimators
+        values = X.ravel()
+        has_missing = bool(np.isnan(values).any())
+        # One (row, tree) walker per entry; only walkers still at inner nodes are advanced
+        node = np.tile(self.offsets[:-1], n_rows)
+        base = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, n_trees)
+        active = np.arange(n_rows * n_trees)
+        while active.size:
+            current = node.take(active)
+            left = self.left.take(current)
+            inner = left >= 0
+            if not inner.all():
+                active, current, left = active[inner], current[inner], left[inner]
+            x = values.take(base.take(active) + self.feature.take(current))
+            go_left = x <= self.threshold.take(current)
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_left.take(current)
+            node[active] = np.where(go_left, left, self.right.take(current))
+        return self.proba[node].reshape(n_rows, n_trees, -1).mean(axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _is_meta_ensemble(model) -> bool:
+    """Voting/stacking ensembles (their fitted members are full models)"""
+    return hasattr(model, 'named_estimators_') and isinstance(getattr(model, 'estimators_', None), list)
+
+
+def dedupe_ensemble_members(models: Dict[str, Any]) -> int:
+    """
+    Point ensemble members at identical standalone models (in place).
+
+    Returns:
+        Number of members replaced
+    """
+    import joblib
+
+    standalone = {joblib.hash(model): model for model in models.values() if not _is_meta_ensemble(model)}
+    replaced = 0
+    for model in models.values():
+        if not _is_meta_ensemble(model):
+            continue
+        for i, member in enumerate(model.estimators_):
+            twin = standalone.get(joblib.hash(member))
+            if twin is not None and twin is not member:
+                model.estimators_[i] = twin
+                replaced += 1
+        for name, member in list(model.named_estimators_.items()):
+            twin = standalone.get(joblib.hash(member))
+            if twin is not None:
+                model.named_estimators_[name] = twin
+    return replaced
+
+
+def _map_forests(models: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace random forests (standalone and inside ensembles) with MappedForest, one per forest"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    mapped: Dict[int, MappedForest] = {}
+
+    def convert(model):
+        if isinstance(model, RandomForestClassifier):
+            if id(model) not in mapped:
+                mapped[id(model)] = MappedForest(model)
+            return mapped[id(model)]
+        return model
+
+    for model in models.values():
+        if _is_meta_ensemble(model):
+            model.estimators_[:] = [convert(member) for member in model.estimators_]
+            for name, member in list(model.named_estimators_.items()):
+                model.named_estimators_[name] = convert(member)
+    return {name: convert(model) for name, model in models.items()}
+
+
+def save_model_bundle(output_dir: str, models: Dict[str, Any], scaler=None, feature_selector=None) -> str:
+    """
+    Write models, scaler and feature selector as one memory-mappable bundle.
+
+    Ensemble members are deduplicated and random forests are stored as
+    MappedForest. The models passed in are modified in place.
+
+    Returns:
+        Path of the bundle file
+    """
+    import joblib
+
+    replaced = dedupe_ensemble_members(models)
+    bundle = {
+        'format': MODEL_BUNDLE_FORMAT,
+        'models': _map_forests(models),
+        'scaler': scaler,
+        'feature_selector': feature_selector
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, MODEL_BUNDLE_FILE)
+    scratch = path + '.tmp'
+    joblib.dump(bundle, scratch)  # uncompressed, so arrays can be mapped
+    os.replace(scratch, path)
+    logger.info(f"Saved model bundle {path} ({len(models)} models, {replaced} shared ensemble members)")
+    return path
+
+
+def load_model_bundle(model_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Map the bundle in model_dir read-only, or None if there is none.
+
+    Raises:
+        ValueError: if the bundle has an unknown format
+    """
+    import joblib
+
+    path = os.path.join(model_dir, MODEL_BUNDLE_FILE)
+    if not os.path.exists(path):
+        return None
+    started = time.perf_counter()
+    bundle = joblib.load(path, mmap_mode='r')
+    if not isinstance(bundle, dict) or bundle.get('format') != MODEL_BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format in {path}")
+    logger.info(f"Mapped model bundle {path} in {time.perf_counter() - started:.3f}s")
+    return bundle
+
+
+def load_legacy_models(model_dir: str) -> Tuple[Dict[str, Any], Any, Any]:
+    """Models, scaler and feature selector from the per-model files in model_dir (missing ones are empty/None)"""
+    import joblib
+
+    def optional(filename):
+        path = os.path.join(model_dir, filename)
+        return joblib.load(path) if os.path.exists(path) else None
+
+    models = {}
+    for name, filename in LEGACY_MODEL_FILES.items():
+        model = optional(filename)
+        if model is not None:
+            models[name] = model
+    return models, optional('scaler.joblib'), optional('feature_selector.joblib')
+
+
+def convert_model_dir(model_dir: str) -> Optional[str]:
+    """Build the bundle from the legacy per-model files in model_dir (None if there are none)"""
+    models, scaler, feature_selector = load_legacy_models(model_dir)
+    if not models:
+        return None
+    return save_model_bundle(model_dir, models, scaler, feature_selector)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'models')
+    bundle_path = convert_model_dir(directory)
+    print(f"Wrote {bundle_path}" if bundle_path else f"No legacy model files in {directory}")
@@ -2,16 +2,43 @@
 ML Model Predictor with hybrid formula+ML approach.
 """
 
+import itertools
+import logging
+import threading
+import time
 import numpy as np
-import joblib
 import json
 import os
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from ml.models.artifacts import LEGACY_MODEL_FILES, MODEL_BUNDLE_FILE, load_model_bundle
+from ml.models.registry import model_registry
+from core.startup import startup_components
 from ml.preprocessing.feature_extractor import StudentFeatures, CollegeFeatures, FeatureExtractor
 from core import calculate_admission_probability
+from core.vectorized import calculate_probability_matrix
+from core.calibration_table import elite_calibration_by_name, get_calibration_table
+from core.costs import count
+from core.metrics import stage
+from core.tracing import traced
+from core.elite_matcher import EliteNameMatcher
+
+logger = logging.getLogger(__name__)
+
+# Per-prediction debug lines are sampled: only every Nth one is logged
+DEBUG_LOG_SAMPLE_EVERY = max(1, int(os.environ.get('PREDICTOR_DEBUG_SAMPLE_EVERY', '100')))
+_debug_log_counter = itertools.count()
+
+# Upper bound on memoized name -> elite index resolutions
+ELITE_NAME_CACHE_SIZE = 10000
+
+
+def _sampled_debug(message: str, *args) -> None:
+    """Log a debug message for a sample of calls (no-op unless DEBUG is enabled)."""
+    if logger.isEnabledFor(logging.DEBUG) and next(_debug_log_counter) % DEBUG_LOG_SAMPLE_EVERY == 0:
+        logger.debug(message, *args)
 
 
 @dataclass
@@ -57,13 +84,22 @@ class AdmissionPredictor:
         self.metadata = {}
         self.feature_names = []
         
-        # Load elite calibration data
+        # Load elite calibration data and compile the name matcher
         self.elite_calibration = self._load_elite_calibration()
+        self.elite_matcher = EliteNameMatcher(list(self.elite_calibration))
+        self._elite_factor = np.array([c['factor'] for c in self.elite_calibration.values()])
+        self._elite_max_prob = np.array([c['max_prob'] for c in self.elite_calibration.values()])
+        self._elite_index_by_name: Dict[str, int] = {}
         
         # Load models if available
         if self.model_dir.exists():
             self._load_models()
     
+    @property
+    def calibration_table(self):
+        """Precomputed per-college calibration (A, C, elite factor/cap) keyed by unitid, for the serving data version"""
+        return get_calibration_table()
+    
     def _load_elite_calibration(self):
         """Load enhanced elite university calibration data for realistic probabilities."""
         # Load from the enhanced calibration system
@@ -77,40 +113,7 @@ class AdmissionPredictor:
                     enhanced_data = json.load(f)
                 
                 # Convert to the format expected by the calibration method
-                elite_calibration = {}
-                for college, data in enhanced_data.items():
-                    # Map short names to full names for better matching
-                    name_mapping = {
-                        'MIT': 'massachusetts institute of technology',
-                        'Harvard': 'harvard university',
-                        'Stanford': 'stanford university',
-                        'Yale': 'yale university',
-                        'Princeton': 'princeton university',
-                        'Columbia': 'columbia university',
-                        'UPenn': 'university of pennsylvania',
-                        'Dartmouth': 'dartmouth college',
-                        'Brown': 'brown university',
-                        'Cornell': 'cornell university',
-                        'Duke': 'duke university',
-                        'Northwestern': 'northwestern university',
-                        'Vanderbilt': 'vanderbilt university',
-                        'Rice': 'rice university',
-                        'Emory': 'emory university',
-                        'Georgetown': 'georgetown university',
-                        'CMU': 'carnegie mellon university',
-                        'NYU': 'new york university',
-                        'UChicago': 'university of chicago',
-                        'Boston University': 'boston university'
-                    }
-                    
-                    # Use mapped name if available, otherwise use original
-                    mapped_name = name_mapping.get(college, college.lower())
-                    elite_calibration[mapped_name] = {
-                        'factor': data['calibration_factor'],
-                        'max_prob': data['max_probability'],
-                        'acceptance_rate': data['acceptance_rate'],
-                        'category': data['category']
-                    }
+                elite_calibration = elite_calibration_by_name(enhanced_data)
                 return elite_calibration
         except Exception as e:
             print(f"Warning: Could not load enhanced calibration data: {e}")
@@ -158,36 +161,37 @@ class AdmissionPredictor:
         Returns:
             Calibrated probability
         """
-        college_name = college.name.lower()
-        
-        # Debug: Print what we're looking for
-        print(f"ELITE CALIBRATION DEBUG:")
-        print(f"  College name: '{college.name}'")
-        print(f"  College name (lower): '{college_name}'")
-        print(f"  Raw probability: {probability:.3f}")
-        
-        # Check if this is an elite university
-        for elite_name, calibration_data in self.elite_calibration.items():
-            print(f"  Checking against: '{elite_name}'")
-            if elite_name in college_name or college_name in elite_name:
-                # Apply calibration factor
-                calibrated_prob = probability * calibration_data['factor']
-                
-                # Cap at maximum probability
-                calibrated_prob = min(calibrated_prob, calibration_data['max_prob'])
-                
-                # Log the calibration for debugging
-                print(f"ELITE CALIBRATION MATCH: {college.name}")
-                print(f"  Raw probability: {probability:.3f}")
-                print(f"  Calibrated: {calibrated_prob:.3f}")
-                print(f"  Factor: {calibration_data['factor']}")
-                print(f"  Max prob: {calibration_data['max_prob']}")
-                print(f"  Acceptance rate: {calibration_data['acceptance_rate']:.1%}")
-                
-                return calibrated_prob
+        # Catalog colleges: calibration membership was resolved when the table was built
+        if self.calibration_table is not None and college.unitid in self.calibration_table:
+            elite_params = self.calibration_table.elite_params(college.unitid)
+            if elite_params is None:
+                return probability
+            factor, max_prob = elite_params
+        else:
+            # Other colleges: membership resolved once per name, then an array lookup
+            index = self._resolve_elite_index(college.name)
+            if index < 0:
+                _sampled_debug("No elite calibration match for %r", college.name)
+                return probability
+            factor, max_prob = self._elite_factor[index], self._elite_max_prob[index]
         
-        print(f"  No elite calibration match found for '{college_name}'")
-        return probability
+        calibrated_prob = min(probability * factor, max_prob)
+        _sampled_debug(
+            "Elite calibration for %r: raw=%.3f calibrated=%.3f factor=%.4f max_prob=%.4f",
+            college.name, probability, calibrated_prob, factor, max_prob
+        )
+        return calibrated_prob
+    
+    def _resolve_elite_index(self, college_name: str) -> int:
+        """Index into the elite calibration arrays for a college name, or -1."""
+        index = self._elite_index_by_name.get(college_name)
+        if index is None:
+            match = self.elite_matcher.match_index(college_name)
+            index = -1 if match is None else match
+            if len(self._elite_index_by_name) >= ELITE_NAME_CACHE_SIZE:
+                self._elite_index_by_name.clear()
+            self._elite_index_by_name[college_name] = index
+        return index
     
     def _load_models(self):
         """Load all trained models from disk."""
@@ -206,37 +210,15 @@ class AdmissionPredictor:
                 self.feature_names = self.metadata.get('feature_names', self.metadata.get('selected_features', []))
                 print(f"DEBUG: Loaded metadata with {len(self.feature_names)} features")
             
-            # Load scaler
-            scaler_file = self.model_dir / 'scaler.joblib'
-            print(f"DEBUG: Looking for scaler file: {scaler_file}")
-            print(f"DEBUG: Scaler file exists: {scaler_file.exists()}")
-            if scaler_file.exists():
-                self.scaler = joblib.load(scaler_file)
-                print("DEBUG: Successfully loaded scaler")
-            
-            # Load feature selector
-            selector_file = self.model_dir / 'feature_selector.joblib'
-            print(f"DEBUG: Looking for feature selector file: {selector_file}")
-            print(f"DEBUG: Feature selector file exists: {selector_file.exists()}")
-            if selector_file.exists():
-                self.feature_selector = joblib.load(selector_file)
-                print("DEBUG: Successfully loaded feature selector")
-            
-            # Load models
-            model_files = {
-                'logistic_regression': 'logistic_regression.joblib',
-                'random_forest': 'random_forest.joblib',
-                'xgboost': 'xgboost.joblib',
-                'ensemble': 'ensemble.joblib'
-            }
-            
-            for name, filename in model_files.items():
-                filepath = self.model_dir / filename
-                print(f"DEBUG: Looking for {name} model: {filepath}")
-                print(f"DEBUG: {name} model exists: {filepath.exists()}")
-                if filepath.exists():
-                    self.models[name] = joblib.load(filepath)
-                    print(f"DEBUG: Successfully loaded {name} model")
+            # Prefer the memory-mapped bundle (one shared copy across workers)
+            bundle = load_model_bundle(str(self.model_dir))
+            if bundle is not None:
+                self.models = dict(bundle['models'])
+                self.scaler = bundle['scaler']
+                self.feature_selector = bundle['feature_selector']
+                print(f"DEBUG: Mapped model bundle {self.model_dir / MODEL_BUNDLE_FILE}")
+            else:
+                self._load_legacy_files()
             
             print(f"DEBUG: Final result - Loaded {len(self.models)} models from {self.model_dir}")
             print(f"DEBUG: Available models: {list(self.models.keys())}")
@@ -247,10 +229,40 @@ class AdmissionPredictor:
             print(f"Warning: Could not load models: {e}")
             print("Will use formula-only predictions")
     
+    def _load_legacy_files(self):
+        """Load the scaler, feature selector and models from one joblib file each."""
+        import joblib
+        
+        # Load scaler
+        scaler_file = self.model_dir / 'scaler.joblib'
+        print(f"DEBUG: Looking for scaler file: {scaler_file}")
+        print(f"DEBUG: Scaler file exists: {scaler_file.exists()}")
+        if scaler_file.exists():
+            self.scaler = joblib.load(scaler_file)
+            print("DEBUG: Successfully loaded scaler")
+        
+        # Load feature selector
+        selector_file = self.model_dir / 'feature_selector.joblib'
+        print(f"DEBUG: Looking for feature selector file: {selector_file}")
+        print(f"DEBUG: Feature selector file exists: {selector_file.exists()}")
+        if selector_file.exists():
+            self.feature_selector = joblib.load(selector_file)
+            print("DEBUG: Successfully loaded feature selector")
+        
+        # Load models
+        for name, filename in LEGACY_MODEL_FILES.items():
+            filepath = self.model_dir / filename
+            print(f"DEBUG: Looking for {name} model: {filepath}")
+            print(f"DEBUG: {name} model exists: {filepath.exists()}")
+            if filepath.exists():
+                self.models[name] = joblib.load(filepath)
+                print(f"DEBUG: Successfully loaded {name} model")
+    
     def is_available(self) -> bool:
         """Check if ML models are available."""
         return len(self.models) > 0 and self.scaler is not None
     
+    @traced('predictor.predict')
     def predict(
         self,
         student: StudentFeatures,
@@ -270,13 +282,21 @@ class AdmissionPredictor:
         Returns:
             PredictionResult with probability and metadata
         """
+        # Precomputed logistic parameters for catalog colleges
+        calibration = None
+        if self.calibration_table is not None:
+            calibration = self.calibration_table.calibration_params(college.unitid, college.acceptance_rate)
+        
         # Get formula-based prediction first
-        formula_result = calculate_admission_probability(
-            factor_scores=student.factor_scores,
-            acceptance_rate=college.acceptance_rate,
-            uses_testing=(college.test_policy != 'Test-blind'),
-            need_aware=(college.financial_aid_policy == 'Need-aware')
-        )
+        with stage('formula'):
+            formula_result = calculate_admission_probability(
+                factor_scores=student.factor_scores,
+                acceptance_rate=college.acceptance_rate,
+                uses_testing=(college.test_policy != 'Test-blind'),
+                need_aware=(college.financial_aid_policy == 'Need-aware'),
+                lazy_audit=True,
+                calibration=calibration
+            )
         formula_prob = formula_result.probability
         
         # Keep formula probabilities as-is for realistic ranges
@@ -285,29 +305,51 @@ class AdmissionPredictor:
         
         # If ML not available, return formula only
         if not self.is_available():
-            return PredictionResult(
-                probability=formula_prob,
-                confidence_interval=(max(0.02, formula_prob - 0.10), 
-                                   min(0.98, formula_prob + 0.10)),
-                ml_probability=formula_prob,
-                formula_probability=formula_prob,
-                ml_confidence=0.0,
-                blend_weights={'ml': 0.0, 'formula': 1.0},
-                model_used='formula_only',
-                explanation="Formula-based prediction (ML not available)"
-            )
+            return self.formula_only_result(formula_prob)
         
         # Extract features for ML
-        features, _ = FeatureExtractor.extract_features(student, college)
+        with stage('feature_extraction'):
+            features, _ = FeatureExtractor.extract_features(student, college)
+        ml_probs, model, model_name = self.predict_ml_probabilities(features.reshape(1, -1), model_name)
         
-        # Apply feature selection if available
-        if self.feature_selector is not None:
-            features = self.feature_selector.transform(features.reshape(1, -1))
-        else:
-            features = features.reshape(1, -1)
+        return self.blend_prediction(formula_prob, ml_probs[0], college, model, model_name, use_formula)
+    
+    def formula_only_result(self, formula_prob: float) -> PredictionResult:
+        """Prediction result from the formula alone (no ML model loaded)."""
+        return PredictionResult(
+            probability=formula_prob,
+            confidence_interval=(max(0.02, formula_prob - 0.10), 
+                               min(0.98, formula_prob + 0.10)),
+            ml_probability=formula_prob,
+            formula_probability=formula_prob,
+            ml_confidence=0.0,
+            blend_weights={'ml': 0.0, 'formula': 1.0},
+            model_used='formula_only',
+            explanation="Formula-based prediction (ML not available)"
+        )
+    
+    def predict_ml_probabilities(
+        self,
+        feature_matrix: np.ndarray,
+        model_name: str = 'ensemble'
+    ) -> Tuple[np.ndarray, object, str]:
+        """
+        Run the ML model on a batch of raw feature rows.
         
-        # Scale features
-        features_scaled = self.scaler.transform(features)
+        Args:
+            feature_matrix: (N, num_features) rows from FeatureExtractor.extract_features
+            model_name: Which ML model to use
+            
+        Returns:
+            Tuple of (admit probabilities (N,), model, name of the model used)
+        """
+        with stage('scaling'):
+            # Apply feature selection if available
+            if self.feature_selector is not None:
+                feature_matrix = self.feature_selector.transform(feature_matrix)
+            
+            # Scale features
+            features_scaled = self.scaler.transform(feature_matrix)
         
         # Get ML model
         model = self.models.get(model_name, self.models.get('ensemble'))
@@ -316,9 +358,33 @@ class AdmissionPredictor:
             model = list(self.models.values())[0]
             model_name = list(self.models.keys())[0]
         
-        # ML prediction
-        ml_prob = model.predict_proba(features_scaled)[0, 1]
+        count('model_invocations')
+        with stage('model_inference'):
+            return model.predict_proba(features_scaled)[:, 1], model, model_name
+    
+    def blend_prediction(
+        self,
+        formula_prob: float,
+        ml_prob: float,
+        college: CollegeFeatures,
+        model,
+        model_name: str,
+        use_formula: bool = True
+    ) -> PredictionResult:
+        """
+        Blend ML and formula probabilities and apply elite calibration.
         
+        Args:
+            formula_prob: Formula probability (already clipped)
+            ml_prob: ML model probability
+            college: College features (for elite calibration)
+            model: ML model that produced ml_prob
+            model_name: Name of that model
+            use_formula: Whether to blend with formula
+            
+        Returns:
+            PredictionResult with probability and metadata
+        """
         # Estimate ML confidence based on prediction certainty
         # More extreme predictions (close to 0 or 1) = higher confidence
         ml_confidence = 1.0 - 4 * ml_prob * (1 - ml_prob)  # 0 at 0.5, 1 at 0 or 1
@@ -359,11 +425,8 @@ class AdmissionPredictor:
         # Keep blended probabilities as-is for realistic ranges
         
         # Apply elite university calibration for realistic probabilities
-        print(f"DEBUG: About to apply elite calibration")
-        print(f"DEBUG: College object: {college}")
-        print(f"DEBUG: College name: {college.name}")
-        print(f"DEBUG: College type: {type(college)}")
-        final_prob = self._apply_elite_calibration(final_prob, college)
+        with stage('calibration'):
+            final_prob = self._apply_elite_calibration(final_prob, college)
         
         # Allow probabilities up to 98% for exceptional applicants
         final_prob = np.clip(final_prob, 0.02, 0.98)
@@ -420,6 +483,83 @@ class AdmissionPredictor:
             results.append(result)
         return results
     
+    def predict_probabilities(
+        self,
+        student: StudentFeatures,
+        colleges: List[CollegeFeatures],
+        model_name: str = 'ensemble'
+    ) -> np.ndarray:
+        """
+        Final admit probabilities for many colleges (same values as predict()).
+        
+        Args:
+            student: Student features
+            colleges: List of colleges
+            model_name: ML model to use
+            
+        Returns:
+            (N,) array of probabilities in college order
+        """
+        return self.predict_probability_grid([student], colleges, model_name)[0]
+    
+    @traced('predictor.predict_probability_grid')
+    def predict_probability_grid(
+        self,
+        students: List[StudentFeatures],
+        colleges: List[CollegeFeatures],
+        model_name: str = 'ensemble'
+    ) -> np.ndarray:
+        """
+        Final admit probabilities for every student x college pair.
+        
+        The formula side is scored for all pairs in one vectorized pass and
+        the ML side in one model call, so large candidate pools and batches
+        of what-if profiles cost about as much as a single prediction.
+        
+        Args:
+            students: Student features (e.g. one profile and its perturbations)
+            colleges: List of colleges
+            model_name: ML model to use
+            
+        Returns:
+            (M, N) array of probabilities, same values as predict() per pair
+        """
+        if not students or not colleges:
+            return np.zeros((len(students), len(colleges)))
+        
+        with stage('formula'):
+            _, formula_probs = calculate_probability_matrix(
+                [student.factor_scores for student in students],
+                [
+                    {
+                        'acceptance_rate': college.acceptance_rate,
+                        'uses_testing': college.test_policy != 'Test-blind',
+                        'need_aware': college.financial_aid_policy == 'Need-aware',
+                        'unitid': college.unitid
+                    }
+                    for college in colleges
+                ]
+            )
+        formula_probs = np.clip(formula_probs, 0.01, 0.98)
+        if not self.is_available():
+            return formula_probs
+        
+        with stage('feature_extraction'):
+            feature_matrix = np.vstack([
+                FeatureExtractor.extract_features(student, college)[0]
+                for student in students
+                for college in colleges
+            ])
+        ml_probs, model, model_name = self.predict_ml_probabilities(feature_matrix, model_name)
+        ml_probs = ml_probs.reshape(len(students), len(colleges))
+        return np.array([
+            [
+                self.blend_prediction(formula_probs[i, j], ml_probs[i, j], college, model, model_name).probability
+                for j, college in enumerate(colleges)
+            ]
+            for i in range(len(students))
+        ])
+    
     def get_model_info(self) -> Dict:
         """Get information about loaded models."""
         return {
@@ -434,12 +574,55 @@ class AdmissionPredictor:
 
 # Global predictor instance (lazy loaded)
 _predictor: Optional[AdmissionPredictor] = None
+_predictor_version: Optional[str] = None
+_predictor_lock = threading.Lock()  # serializes loads/swaps, never taken by readers
+
+
+def _default_model_dir() -> str:
+    """Model directory used when the registry has no active version"""
+    # Try different possible paths
+    possible_paths = [
+        'data/models',  # When running from backend/
+        'backend/data/models',  # When running from root/
+        os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'models'),  # Relative to this file
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            print(f"DEBUG: Auto-detected model directory: {path}")
+            return path
+    
+    print("DEBUG: Using fallback model directory: data/models")
+    return 'data/models'  # Fallback
+
+
+def warm_up(predictor: AdmissionPredictor) -> float:
+    """
+    Run one prediction so lazily built state is ready before real traffic.
+    
+    Also checks that the models accept the features FeatureExtractor
+    produces (a feature schema mismatch raises here, not in a request).
+    
+    Returns:
+        Seconds the warm-up prediction took
+    """
+    started = time.perf_counter()
+    predictor.predict(
+        StudentFeatures(factor_scores={}),
+        CollegeFeatures(name='Warm-up College', acceptance_rate=0.5)
+    )
+    return time.perf_counter() - started
 
 
 def get_predictor(model_dir: str = None, force_reload: bool = False) -> AdmissionPredictor:
     """
     Get global predictor instance (singleton pattern).
     
+    Without model_dir, the registry's active version is loaded, falling
+    back to the plain model directory when nothing is active. A reload
+    builds the new predictor first; requests keep using the old one until
+    the swap.
+    
     Args:
         model_dir: Directory containing models (if None, auto-detect)
         force_reload: Force re-initialization even if predictor exists
@@ -447,32 +630,78 @@ def get_predictor(model_dir: str = None, force_reload: bool = False) -> Admissio
     Returns:
         AdmissionPredictor instance
     """
-    global _predictor
+    global _predictor, _predictor_version
     if _predictor is None or force_reload:
-        # Auto-detect model directory if not provided
-        if model_dir is None:
-            # Try different possible paths
-            possible_paths = [
-                'data/models',  # When running from backend/
-                'backend/data/models',  # When running from root/
-                os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'models'),  # Relative to this file
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    model_dir = path
-                    print(f"DEBUG: Auto-detected model directory: {model_dir}")
-                    break
-            
-            if model_dir is None:
-                model_dir = 'data/models'  # Fallback
-                print(f"DEBUG: Using fallback model directory: {model_dir}")
-        
-        print(f"DEBUG: Initializing predictor with model_dir: {model_dir}")
-        _predictor = AdmissionPredictor(model_dir=model_dir)
+        with _predictor_lock:
+            if _predictor is None or force_reload:
+                version = None
+                if model_dir is None:
+                    version = model_registry.active_version()
+                    try:
+                        model_dir = model_registry.path(version) if version else _default_model_dir()
+                    except KeyError:
+                        logger.warning(f"Active model version {version} is not registered; using the default directory")
+                        version, model_dir = None, _default_model_dir()
+                
+                print(f"DEBUG: Initializing predictor with model_dir: {model_dir}")
+                predictor = AdmissionPredictor(model_dir=model_dir)
+                try:
+                    warm_up(predictor)
+                except Exception as e:
+                    logger.warning(f"Predictor warm-up failed: {e}")
+                _predictor, _predictor_version = predictor, version  # the swap
+                force_reload = False
     return _predictor
 
 
+def active_model_version() -> Optional[str]:
+    """Registry version the global predictor serves (None for the plain model directory)"""
+    return _predictor_version
+
+
+def load_version(version: str) -> AdmissionPredictor:
+    """
+    Load and warm up a registered version without serving it.
+    
+    Raises:
+        KeyError: if the version is not registered
+        ValueError: if its models fail to load or to predict
+    """
+    predictor = AdmissionPredictor(model_dir=model_registry.path(version))
+    if not predictor.is_available():
+        raise ValueError(f"Model version {version} has no usable models")
+    try:
+        warm_up(predictor)
+    except Exception as e:
+        raise ValueError(f"Model version {version} failed its warm-up prediction: {e}") from e
+    return predictor
+
+
+def activate_model(version: str) -> AdmissionPredictor:
+    """
+    Serve a registered version: load and warm it, then swap it in.
+    
+    The slow part runs before the swap, so requests never wait on a model
+    load; the ACTIVE pointer is only moved once the version is proven to
+    work, and a failed activation leaves the current predictor in place.
+    
+    Raises:
+        KeyError: if the version is not registered
+        ValueError: if its models fail to load or to predict
+    """
+    global _predictor, _predictor_version
+    predictor = load_version(version)
+    with _predictor_lock:
+        model_registry.set_active(version)
+        _predictor, _predictor_version = predictor, version
+    logger.info(f"Now serving model version {version}")
+    return predictor
+
+
+# Warm the predictor with the other startup components (imports the ML stack off the request path)
+startup_components.add('ml_predictor', get_predictor)
+
+
 def model_available() -> bool:
     """Check if ML models are available."""
     predictor = get_predictor()
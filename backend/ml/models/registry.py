@@ -0,0 +1,189 @@
+"""
+Versioned model registry.
+
+Each training run is stored in its own directory under the registry root:
+
+    registry/
+        ACTIVE                  name of the version the predictor serves
+        20251012-234504/
+            model_bundle.joblib models, scaler, feature selector (see artifacts.py)
+            metadata.json       metrics, feature schema, training metadata
+
+Versions are written to a staging directory and renamed into place, and
+the ACTIVE pointer is replaced with os.replace, so readers never see a
+half-written version or pointer. Swapping the predictor that serves
+requests is done by activate_model() in predictor.py, which loads and
+warms the new version before touching the pointer.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ml.models.artifacts import MODEL_BUNDLE_FILE, load_legacy_models, load_model_bundle, save_model_bundle
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = os.environ.get(
+    'CHANCIFY_MODEL_REGISTRY_DIR',
+    os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'models', 'registry')
+)
+ACTIVE_POINTER_FILE = 'ACTIVE'
+METADATA_FILE = 'metadata.json'
+
+
+@dataclass
+class ModelVersion:
+    """One registered training run"""
+    version: str
+    path: str
+    registered_at: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    feature_names: List[str] = field(default_factory=list)
+    active: bool = False
+
+
+class ModelRegistry:
+    """Versioned model directories plus the active-version pointer"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or REGISTRY_DIR)
+
+    def path(self, version: str) -> str:
+        """
+        Directory of a registered version.
+
+        Raises:
+            KeyError: if the version is not registered
+        """
+        if not version or os.sep in version or version.startswith('.'):
+            raise KeyError(version)
+        path = os.path.join(self.root, version)
+        if not os.path.exists(os.path.join(path, MODEL_BUNDLE_FILE)):
+            raise KeyError(version)
+        return path
+
+    def register(self, models: Dict[str, Any], scaler=None, feature_selector=None,
+                 metadata: Optional[Dict[str, Any]] = None, version: Optional[str] = None) -> str:
+        """
+        Store a training run as a new version (not activated).
+
+        The models are rewritten in place by save_model_bundle(); pass a copy
+        if they are still needed.
+
+        Args:
+            models: Model name -> fitted model
+            scaler: Fitted scaler
+            feature_selector: Fitted feature selector
+            metadata: Training metadata; 'metrics' and 'feature_names' (or
+                'selected_features') are surfaced by versions()
+            version: Version name (default: registration timestamp)
+
+        Returns:
+            The version name
+
+        Raises:
+            ValueError: if the version already exists
+        """
+        version = version or time.strftime('%Y%m%d-%H%M%S')
+        final = os.path.join(self.root, version)
+        if os.path.exists(final):
+            raise ValueError(f"Model version {version} already exists")
+
+        staging = os.path.join(self.root, f'.staging-{version}-{os.getpid()}')
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            save_model_bundle(staging, models, scaler, feature_selector)
+            metadata = dict(metadata or {})
+            metadata['version'] = version
+            metadata['registered_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            metadata.setdefault('feature_names', metadata.get('selected_features', []))
+            with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+                json.dump(metadata, f, indent=2)
+            os.rename(staging, final)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        logger.info(f"Registered model version {version} at {final}")
+        return version
+
+    def register_dir(self, model_dir: str, version: Optional[str] = None) -> str:
+        """
+        Register the models in a plain model directory (bundle or per-model files).
+
+        Raises:
+            ValueError: if model_dir holds no models or the version exists
+        """
+        bundle = load_model_bundle(model_dir)
+        if bundle is not None:
+            models, scaler, feature_selector = dict(bundle['models']), bundle['scaler'], bundle['feature_selector']
+        else:
+            models, scaler, feature_selector = load_legacy_models(model_dir)
+        if not models:
+            raise ValueError(f"No models in {model_dir}")
+        metadata = {}
+        metadata_path = os.path.join(model_dir, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        return self.register(models, scaler, feature_selector, metadata, version)
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        """metadata.json of a version (empty if it has none)"""
+        path = os.path.join(self.path(version), METADATA_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def versions(self) -> List[ModelVersion]:
+        """All registered versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        active = self.active_version()
+        versions = []
+        for name in sorted(os.listdir(self.root)):
+            try:
+                path = self.path(name)
+            except KeyError:
+                continue  # pointer file, staging directories
+            metadata = self.metadata(name)
+            versions.append(ModelVersion(
+                version=name,
+                path=path,
+                registered_at=metadata.get('registered_at'),
+                metrics=metadata.get('metrics', {}),
+                feature_names=metadata.get('feature_names', []),
+                active=name == active
+            ))
+        return versions
+
+    def active_version(self) -> Optional[str]:
+        """Version the ACTIVE pointer names, or None"""
+        try:
+            with open(os.path.join(self.root, ACTIVE_POINTER_FILE)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def set_active(self, version: str) -> None:
+        """
+        Point ACTIVE at a version (atomic replace of the pointer file).
+
+        Raises:
+            KeyError: if the version is not registered
+        """
+        self.path(version)
+        pointer = os.path.join(self.root, ACTIVE_POINTER_FILE)
+        scratch = f'{pointer}.{os.getpid()}.tmp'
+        with open(scratch, 'w') as f:
+            f.write(version + '\n')
+        os.replace(scratch, pointer)
+        logger.info(f"Active model version is now {version}")
+
+
+# Global registry instance
+model_registry = ModelRegistry()
@@ -0,0 +1,154 @@
+"""
+Shadow scoring of a candidate model version against live traffic.
+
+While a candidate is set, a sampled fraction of live predictions is
+queued (with the live result and its latency) and re-scored by the
+candidate on a background thread, so the request that produced the sample
+never waits for it. A full queue drops the sample instead of blocking.
+stats() summarizes the recent samples: candidate vs live latency and the
+difference in predicted probability.
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Samples waiting for the candidate; more are dropped
+SHADOW_QUEUE_SIZE = 256
+# Recent samples kept for stats()
+SHADOW_WINDOW = 2000
+
+
+class ShadowScorer:
+    """Scores sampled live requests with a candidate predictor off the request path"""
+
+    def __init__(self, queue_size: int = SHADOW_QUEUE_SIZE, window: int = SHADOW_WINDOW):
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._window = window
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.candidate = None
+        self.version: Optional[str] = None
+        self.sample_rate = 0.0
+        self._reset_counts()
+
+    def _reset_counts(self) -> None:
+        self.scored = 0
+        self.dropped = 0
+        self.errors = 0
+        self._samples: deque = deque(maxlen=self._window)  # (live s, candidate s, delta)
+
+    @property
+    def enabled(self) -> bool:
+        return self.candidate is not None and self.sample_rate > 0
+
+    def start(self, candidate, version: str, sample_rate: float) -> None:
+        """
+        Shadow-score sample_rate of live requests with candidate (resets stats).
+
+        Args:
+            candidate: Loaded and warmed AdmissionPredictor
+            version: Registry version of the candidate (for reporting)
+            sample_rate: Fraction of requests to score, 0-1
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        with self._lock:
+            self.candidate, self.version, self.sample_rate = candidate, version, sample_rate
+            self._reset_counts()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='model-shadow', daemon=True)
+                self._thread.start()
+        logger.info(f"Shadow scoring {sample_rate:.1%} of requests with model version {version}")
+
+    def stop(self) -> None:
+        """Stop sampling; queued samples are discarded"""
+        with self._lock:
+            self.candidate, self.sample_rate = None, 0.0
+        logger.info(f"Stopped shadow scoring of model version {self.version}")
+
+    def submit(self, student, college, live_result, live_seconds: float, model_name: str = 'ensemble') -> bool:
+        """
+        Offer a live prediction for shadow scoring (cheap; never raises).
+
+        Returns:
+            True if the request was sampled and queued
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        try:
+            self._queue.put_nowait((self.candidate, student, college, float(live_result.probability),
+                                    live_seconds, model_name))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            sample = self._queue.get()
+            try:
+                self._score(*sample)
+            finally:
+                self._queue.task_done()
+
+    def _score(self, candidate, student, college, live_probability: float, live_seconds: float,
+               model_name: str) -> None:
+        if candidate is not self.candidate:
+            return  # queued for a candidate that has since been replaced or stopped
+        started = time.perf_counter()
+        try:
+            result = candidate.predict(student, college, model_name=model_name, use_formula=True)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Shadow prediction failed for model version {self.version}: {e}")
+            return
+        self._samples.append((live_seconds, time.perf_counter() - started,
+                              float(result.probability) - live_probability))
+        self.scored += 1
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued sample is scored (for tests and reports)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts plus latency (ms) and probability-delta summaries over the recent samples"""
+        summary: Dict[str, Any] = {
+            'version': self.version,
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'scored': self.scored,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': self._queue.qsize(),
+        }
+        samples = np.array(list(self._samples), dtype=float).reshape(-1, 3)
+        if len(samples):
+            live_ms, candidate_ms, delta = samples[:, 0] * 1000, samples[:, 1] * 1000, samples[:, 2]
+            summary['latency_ms'] = {
+                'live_p50': round(float(np.percentile(live_ms, 50)), 3),
+                'live_p95': round(float(np.percentile(live_ms, 95)), 3),
+                'candidate_p50': round(float(np.percentile(candidate_ms, 50)), 3),
+                'candidate_p95': round(float(np.percentile(candidate_ms, 95)), 3),
+            }
+            summary['probability_delta'] = {
+                'mean': round(float(delta.mean()), 5),
+                'mean_abs': round(float(np.abs(delta).mean()), 5),
+                'max_abs': round(float(np.abs(delta).max()), 5),
+            }
+        return summary
+
+
+# Global shadow scorer
+shadow_scorer = ShadowScorer()
@@ -0,0 +1,252 @@
+"""
+Incremental what-if sessions for slider-driven UIs.
+
+A session keeps one student's factor scores, the per-college policy weights,
+the weighted partial sums behind each composite and (when ML models are
+loaded) the per-college feature rows. A slider move then only touches what
+it changes: each changed factor shifts the partial sums by delta x weight,
+only the affected feature columns are rewritten, and the colleges are
+re-scored as one batch.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.metrics import stage, timed
+from core.vectorized import (
+    CLUSTER_DAMPENING,
+    CLUSTER_MASK,
+    CONDUCT_INDEX,
+    FACTOR_ORDER,
+    NEUTRAL_SCORE,
+    calibration_arrays,
+    logistic_probs,
+    policy_weight_matrix,
+    scores_to_matrix
+)
+from ml.preprocessing.feature_extractor import CollegeFeatures, FeatureExtractor, StudentFeatures
+from ml.preprocessing.frontend_profile import frontend_profile_to_student_features
+from .predictor import AdmissionPredictor, PredictionResult
+
+# Sessions idle for longer than this are dropped
+WHATIF_SESSION_TTL_SECONDS = 30 * 60
+WHATIF_MAX_SESSIONS = 1000
+
+# Feature-matrix column of each factor score (FeatureExtractor order)
+_FACTOR_FEATURE_COLUMN = {
+    factor: FeatureExtractor.FACTOR_SCORE_FEATURES.index(f'{factor}_score')
+    for factor in FACTOR_ORDER
+}
+
+# StudentFeatures fields other than the factor scores; a change to any of
+# them invalidates the raw-metric and interaction feature columns
+_RAW_STUDENT_FIELDS = tuple(f.name for f in fields(StudentFeatures) if f.name != 'factor_scores')
+
+
+class WhatIfSession:
+    """One student's what-if state against a fixed list of colleges."""
+
+    def __init__(
+        self,
+        predictor: AdmissionPredictor,
+        profile: Dict[str, Any],
+        colleges: List[CollegeFeatures],
+        model_name: str = 'ensemble'
+    ):
+        """
+        Build the session state.
+
+        Args:
+            predictor: Predictor providing ML models and blending
+            profile: Frontend profile fields (FrontendProfileRequest as a dict)
+            colleges: Colleges to score on every update
+            model_name: ML model to use when models are available
+        """
+        self.predictor = predictor
+        self.profile = dict(profile)
+        self.colleges = list(colleges)
+        self.model_name = model_name
+        self.student = frontend_profile_to_student_features(self.profile)
+        self.last_used = time.monotonic()
+
+        # Per-college policy gates -> (N, F) weights split into non-cluster / cluster halves
+        uses_testing = np.array([c.test_policy != 'Test-blind' for c in self.colleges], dtype=bool)
+        need_aware = np.array([c.financial_aid_policy == 'Need-aware' for c in self.colleges], dtype=bool)
+        weights = policy_weight_matrix(uses_testing, need_aware)
+        self._base_weights = np.where(CLUSTER_MASK, 0.0, weights)
+        self._cluster_weights = np.where(CLUSTER_MASK, weights, 0.0)
+        self._base_weight_total = self._base_weights.sum(axis=1)
+        self._cluster_weight_total = self._cluster_weights.sum(axis=1)
+
+        self._A, self._C = calibration_arrays(
+            [c.acceptance_rate for c in self.colleges], [c.unitid for c in self.colleges]
+        )
+
+        # Raw scores (NaN = missing) and the clamped, neutral-filled scores the sums use
+        self._raw = scores_to_matrix([self.student.factor_scores])[0]
+        self._scores = _effective_scores(self._raw)
+        self._base_sum = self._base_weights @ self._scores
+        self._cluster_sum = self._cluster_weights @ self._scores
+
+        self._features: Optional[np.ndarray] = None
+        if self.predictor.is_available():
+            self._features = self._extract_feature_rows()
+
+    @timed('feature_extraction')
+    def _extract_feature_rows(self) -> np.ndarray:
+        return np.vstack([
+            FeatureExtractor.extract_features(self.student, college)[0]
+            for college in self.colleges
+        ])
+
+    def update(self, changes: Dict[str, Any]) -> List[PredictionResult]:
+        """
+        Apply profile field changes and re-score every college.
+
+        Args:
+            changes: Frontend profile fields to overwrite (e.g. {'essay_quality': '8'})
+
+        Returns:
+            One PredictionResult per session college, in session order
+        """
+        self.last_used = time.monotonic()
+        self.profile.update(changes)
+        student = frontend_profile_to_student_features(self.profile)
+
+        raw = scores_to_matrix([student.factor_scores])[0]
+        changed = np.flatnonzero(~((raw == self._raw) | (np.isnan(raw) & np.isnan(self._raw))))
+        if len(changed):
+            scores = _effective_scores(raw)
+            delta = scores[changed] - self._scores[changed]
+            self._base_sum += self._base_weights[:, changed] @ delta
+            self._cluster_sum += self._cluster_weights[:, changed] @ delta
+            self._raw, self._scores = raw, scores
+
+        previous = self.student
+        self.student = student
+        if self._features is not None:
+            if any(getattr(student, name) != getattr(previous, name) for name in _RAW_STUDENT_FIELDS):
+                # Raw metrics feed the interaction columns of every college
+                self._features = self._extract_feature_rows()
+            else:
+                for k in changed:
+                    factor = FACTOR_ORDER[k]
+                    self._features[:, _FACTOR_FEATURE_COLUMN[factor]] = student.factor_scores.get(factor, 5.0)
+
+        return self.results()
+
+    def composites(self) -> np.ndarray:
+        """Composite score (0-1000) for each session college."""
+        high_cluster = (self._scores[CLUSTER_MASK] >= 8.0).sum() >= 2
+        damp = CLUSTER_DAMPENING if high_cluster else 1.0
+
+        weighted_sum = self._base_sum + damp * self._cluster_sum
+        sum_weights = self._base_weight_total + damp * self._cluster_weight_total
+        composite = (weighted_sum / (10.0 * sum_weights)) * 1000.0
+
+        # Conduct penalty uses the raw (unclamped, non-defaulted) score
+        conduct = self._raw[CONDUCT_INDEX]
+        if conduct < 5:
+            composite = composite - (5.0 - conduct) * 8.0
+        return np.maximum(0.0, composite)
+
+    def results(self) -> List[PredictionResult]:
+        """Score every session college from the current state."""
+        with stage('formula'):
+            composites = self.composites()
+            formula_probs = np.clip(logistic_probs(composites, self._A, self._C), 0.01, 0.98)
+
+        if self._features is None:
+            return [self.predictor.formula_only_result(p) for p in formula_probs]
+
+        ml_probs, model, model_name = self.predictor.predict_ml_probabilities(self._features, self.model_name)
+        return [
+            self.predictor.blend_prediction(formula_prob, ml_prob, college, model, model_name)
+            for formula_prob, ml_prob, college in zip(formula_probs, ml_probs, self.colleges)
+        ]
+
+
+def _effective_scores(raw: np.ndarray) -> np.ndarray:
+    """Neutral defaults for missing scores, clamped to 0-10."""
+    return np.clip(np.where(np.isnan(raw), NEUTRAL_SCORE, raw), 0.0, 10.0)
+
+
+class WhatIfSessionStore:
+    """In-memory what-if sessions keyed by id, with idle expiry and an LRU cap."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = WHATIF_SESSION_TTL_SECONDS,
+        max_sessions: int = WHATIF_MAX_SESSIONS
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, WhatIfSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session: WhatIfSession) -> str:
+        """Store a session and return its id."""
+        self._expire()
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = session
+        return session_id
+
+    def get(self, session_id: str) -> Optional[WhatIfSession]:
+        """Session for an id, or None if it never existed or has expired."""
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.last_used < time.monotonic() - self.ttl_seconds:
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Drop a session; returns whether it existed."""
+        return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+
+# Global session store
+whatif_sessions = WhatIfSessionStore()
+
+
+# Example usage and latency check
+if __name__ == "__main__":
+    from .predictor import get_predictor
+
+    predictor = get_predictor()
+    colleges = [
+        CollegeFeatures(name=f"College {i}", acceptance_rate=rate, test_policy=policy)
+        for i, (rate, policy) in enumerate(zip(
+            np.linspace(0.04, 0.8, 20), ['Required', 'Test-optional', 'Test-blind', 'Required'] * 5
+        ))
+    ]
+    session = WhatIfSession(predictor, {'gpa_unweighted': '3.9', 'sat': '1500'}, colleges)
+
+    timings = []
+    for step in range(200):
+        start = time.perf_counter()
+        session.update({'essay_quality': str(step % 10 + 1)})
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"Slider update for {len(colleges)} colleges: "
+          f"median {np.median(timings):.3f} ms, max {max(timings):.3f} ms")
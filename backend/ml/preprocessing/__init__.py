@@ -7,10 +7,12 @@ from .feature_extractor import (
     StudentFeatures,
     CollegeFeatures
 )
+from .frontend_profile import frontend_profile_to_student_features
 
 __all__ = [
     'FeatureExtractor',
     'StudentFeatures',
     'CollegeFeatures',
+    'frontend_profile_to_student_features',
 ]
 
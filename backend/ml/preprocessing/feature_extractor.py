@@ -71,6 +71,7 @@ class CollegeFeatures:
     # Other
     gpa_average: Optional[float] = None
     size: Optional[int] = None
+    unitid: Optional[int] = None  # IPEDS id, keys the per-college calibration table
 
 
 class FeatureExtractor:
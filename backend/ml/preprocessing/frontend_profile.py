@@ -0,0 +1,180 @@
+"""
+Conversion of frontend profile forms into StudentFeatures.
+
+The frontend sends every field as a string (dropdown and text input
+values). These helpers turn that form into the StudentFeatures used by the
+formula and the ML models, so /api/predict/frontend and the what-if
+sessions derive identical features from the same inputs.
+"""
+
+import math
+from typing import Any, Dict
+
+from .feature_extractor import StudentFeatures
+
+# Majors treated as a good fit by the major_fit heuristic
+POPULAR_MAJORS = ['Computer Science', 'Business', 'Engineering', 'Biology', 'Psychology']
+
+# Values assumed for fields missing from the form
+DEFAULT_FIELD_VALUE = "5"
+FIELD_DEFAULTS = {
+    'gpa_unweighted': "3.5",
+    'gpa_weighted': "3.8",
+    'sat': "1200",
+    'act': "25",
+    'major': "Computer Science",
+    'conduct_record': "9"
+}
+
+# Form fields the formula scores (through factor_scores)
+FORMULA_FIELDS = frozenset({
+    'gpa_unweighted', 'gpa_weighted', 'sat', 'act', 'extracurricular_depth', 'essay_quality',
+    'recommendations', 'plan_timing', 'volunteer_work', 'major', 'geography_residency',
+    'firstgen_diversity', 'ability_to_pay', 'awards_publications', 'portfolio_audition',
+    'policy_knob', 'demonstrated_interest', 'legacy_status', 'interview', 'conduct_record',
+    'hs_reputation'
+})
+# Form fields only the ML features read
+ML_ONLY_FIELDS = frozenset({'leadership_positions', 'geographic_diversity'})
+
+# Form fields the converter does not read directly -> (field it estimates them from,
+# value of that field giving the same estimate)
+FIELD_PROXIES = {
+    'ap_count': ('extracurricular_depth', lambda ap_count: ap_count / 2),  # ap_count = 2 x depth
+    'leadership_positions': ('extracurricular_depth', lambda positions: positions),  # formula's ecs_leadership
+}
+
+
+def profile_field(profile: Dict[str, Any], name: str) -> Any:
+    """Form value of a field as the converter sees it (default if missing)"""
+    return profile.get(name, FIELD_DEFAULTS.get(name, DEFAULT_FIELD_VALUE))
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    """Convert a form value to float, treating blanks, NaN and infinity as default"""
+    if value is None:
+        return default
+    if isinstance(value, str) and not value.strip():
+        return default
+    try:
+        result = float(value)
+    except (ValueError, TypeError):
+        return default
+    if math.isnan(result) or math.isinf(result):
+        return default
+    return result
+
+
+def _to_int(value: Any) -> int:
+    """Convert a form value to int (non-integer strings become 0)"""
+    try:
+        return int(value) if value and str(value).strip() else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def calculate_grades_score(gpa_unweighted: float, gpa_weighted: float) -> float:
+    """Grades factor (0-10) from GPA."""
+    if gpa_unweighted > 0:
+        # Convert 4.0 scale to 10.0 scale
+        return min(10.0, (gpa_unweighted / 4.0) * 10.0)
+    elif gpa_weighted > 0:
+        # Convert 5.0 scale to 10.0 scale
+        return min(10.0, (gpa_weighted / 5.0) * 10.0)
+    return 5.0  # Default neutral
+
+
+def calculate_testing_score(sat: int, act: int) -> float:
+    """Testing factor (0-10) from SAT/ACT: 1200 SAT / 20 ACT = 5.0, perfect = 10.0."""
+    if sat > 0:
+        return min(10.0, max(0.0, ((sat - 1200) / 400) * 5.0 + 5.0))
+    elif act > 0:
+        return min(10.0, max(0.0, ((act - 20) / 16) * 5.0 + 5.0))
+    return 5.0  # Default neutral
+
+
+def calculate_major_fit_score(major: str) -> float:
+    """
+    Major fit factor (0-10).
+
+    This would ideally use a major-college relevance database; for now it
+    is a simple heuristic based on major popularity.
+    """
+    if major in POPULAR_MAJORS:
+        return 7.0  # Good fit for popular majors
+    return 6.0  # Neutral fit
+
+
+def frontend_profile_to_student_features(profile: Dict[str, Any]) -> StudentFeatures:
+    """
+    Build StudentFeatures from a frontend profile form.
+
+    Args:
+        profile: Frontend profile fields (FrontendProfileRequest as a dict)
+
+    Returns:
+        StudentFeatures with derived factor scores and raw metrics
+    """
+    def field(name: str) -> Any:
+        return profile_field(profile, name)
+
+    gpa_unweighted = _to_float(field('gpa_unweighted'))
+    gpa_weighted = _to_float(field('gpa_weighted'))
+    sat_score = _to_int(field('sat'))
+    act_score = _to_int(field('act'))
+
+    extracurricular_depth = field('extracurricular_depth')
+    awards_publications = field('awards_publications')
+
+    return StudentFeatures(
+        # Academic metrics
+        gpa_unweighted=gpa_unweighted,
+        gpa_weighted=gpa_weighted,
+        sat_total=sat_score,
+        act_composite=act_score,
+
+        # Course rigor and class info
+        ap_count=int(_to_float(extracurricular_depth) * 2),  # Estimate based on extracurricular depth
+        honors_count=int(_to_float(extracurricular_depth) * 1.5),  # Estimate based on extracurricular depth
+        class_rank_percentile=_to_float(field('hs_reputation')) * 10,  # Estimate based on HS reputation
+        class_size=500,  # Default class size
+
+        # Extracurricular counts and commitment
+        ec_count=min(10, max(1, _to_int(extracurricular_depth) // 2)),
+        leadership_positions_count=_to_int(field('leadership_positions')),
+        years_commitment=min(6, max(1, _to_int(extracurricular_depth) // 2)),
+        hours_per_week=min(20.0, max(2.0, _to_float(extracurricular_depth) * 1.5)),
+        awards_count=_to_int(awards_publications),
+        national_awards=min(5, max(0, _to_int(awards_publications) // 2)),
+
+        # Demographics and diversity
+        first_generation=_to_float(field('firstgen_diversity')) > 7.0,
+        underrepresented_minority=_to_float(field('firstgen_diversity')) > 6.0,
+        geographic_diversity=_to_float(field('geographic_diversity')),
+        legacy_status=bool(_to_int(field('legacy_status'))),
+        recruited_athlete=_to_float(field('volunteer_work')) > 7.0,  # Derive from volunteer_work
+
+        # Factor scores (calculated from the form, not defaults)
+        factor_scores={
+            'grades': calculate_grades_score(gpa_unweighted, gpa_weighted),
+            'rigor': _to_float(extracurricular_depth),  # Use extracurricular depth as rigor proxy
+            'testing': calculate_testing_score(sat_score, act_score),
+            'essay': _to_float(field('essay_quality')),
+            'ecs_leadership': _to_float(extracurricular_depth),
+            'recommendations': _to_float(field('recommendations')),
+            'plan_timing': _to_float(field('plan_timing')),
+            'athletic_recruit': _to_float(field('volunteer_work')),  # Use volunteer_work as proxy
+            'major_fit': calculate_major_fit_score(field('major')),
+            'geography_residency': _to_float(field('geography_residency')),
+            'firstgen_diversity': _to_float(field('firstgen_diversity')),
+            'ability_to_pay': _to_float(field('ability_to_pay')),
+            'awards_publications': _to_float(awards_publications),
+            'portfolio_audition': _to_float(field('portfolio_audition')),
+            'policy_knob': _to_float(field('policy_knob')),
+            'demonstrated_interest': _to_float(field('demonstrated_interest')),
+            'legacy': _to_float(field('legacy_status')),
+            'interview': _to_float(field('interview')),
+            'conduct_record': _to_float(field('conduct_record')),
+            'hs_reputation': _to_float(field('hs_reputation'))
+        }
+    )
@@ -285,7 +285,8 @@ class SyntheticDataGenerator:
                         factor_scores=factor_scores,
                         acceptance_rate=college.acceptance_rate,
                         uses_testing=(college.test_policy != 'Test-blind'),
-                        need_aware=(college.financial_aid_policy == 'Need-aware')
+                        need_aware=(college.financial_aid_policy == 'Need-aware'),
+                        lazy_audit=True
                     )
                     formula_prob = formula_result.probability
                 except Exception as e:
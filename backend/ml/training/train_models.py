@@ -20,13 +20,19 @@ from sklearn.metrics import (
     roc_auc_score, brier_score_loss, log_loss,
     confusion_matrix, classification_report
 )
-import xgboost as xgb
+import copy
 import joblib
 import json
 from pathlib import Path
-from typing import Dict, Tuple, Any
+from typing import TYPE_CHECKING, Dict, Tuple, Any
 from datetime import datetime
 
+from ml.models.artifacts import save_model_bundle
+from ml.models.registry import ModelRegistry
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
 
 class ModelTrainer:
     """
@@ -183,12 +189,14 @@ class ModelTrainer:
         self,
         X_train: np.ndarray,
         y_train: np.ndarray
-    ) -> xgb.XGBClassifier:
+    ) -> 'xgb.XGBClassifier':
         """
         Train XGBoost model.
         
         State-of-the-art gradient boosting - highest accuracy.
         """
+        import xgboost as xgb
+        
         print("\n" + "="*60)
         print("TRAINING XGBOOST")
         print("="*60)
@@ -414,12 +422,22 @@ class ModelTrainer:
         joblib.dump(self.scalers['standard'], scaler_file)
         print(f"Saved scaler to {scaler_file}")
         
+        # Save the memory-mapped bundle the predictor prefers (it rewrites
+        # the models it is given, so it gets a copy)
+        bundle_file = save_model_bundle(str(output_path), copy.deepcopy(self.models), self.scalers['standard'])
+        print(f"Saved model bundle to {bundle_file}")
+        
         # Save metadata
         metadata_file = output_path / 'metadata.json'
         with open(metadata_file, 'w') as f:
             json.dump(self.metadata, f, indent=2)
         print(f"Saved metadata to {metadata_file}")
         
+        # Record the run as a new registry version (activate it separately)
+        registry = ModelRegistry(str(output_path / 'registry'))
+        version = registry.register(copy.deepcopy(self.models), self.scalers['standard'], metadata=self.metadata)
+        print(f"Registered model version {version} in {registry.root}")
+        
         print(f"\nAll models saved to: {output_path}")
         print("Ready for deployment!")
 
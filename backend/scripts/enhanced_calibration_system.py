@@ -6,11 +6,16 @@ without needing Quora data.
 """
 
 import json
+import os
+import sys
 import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core.calibration_table import build_calibration_table, elite_calibration_by_name
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -386,6 +391,39 @@ def _assess_profile_strength(self, student: StudentFeatures) -> str:
         
         return calibration_code
     
+    def build_college_calibration_table(
+        self,
+        catalog_csv='backend/data/raw/real_colleges_integrated.csv',
+        factors_json='backend/data/models/enhanced_calibration_factors.json'
+    ):
+        """
+        Precompute the per-college calibration table (A, C, factor, max prob)
+        for every catalog college, keyed by unitid.
+        
+        Elite factors are read from the same JSON the predictor loads, so
+        entries added there by hand are included.
+        """
+        with open(factors_json, 'r') as f:
+            calibration_factors = json.load(f)
+        
+        catalog = pd.read_csv(catalog_csv)
+        catalog = catalog.dropna(subset=['unitid', 'acceptance_rate'])
+        
+        return build_calibration_table(
+            unitids=catalog['unitid'].astype(int),
+            names=catalog['name'].fillna(''),
+            acceptance_rates=catalog['acceptance_rate'],
+            elite_calibration=elite_calibration_by_name(calibration_factors)
+        )
+    
+    def save_calibration_table(self, output_path='backend/data/models/college_calibration.npz'):
+        """
+        Build and save the per-college calibration table
+        """
+        table = self.build_college_calibration_table()
+        table.save(output_path)
+        logger.info(f"Calibration table saved: {len(table)} colleges, {int(table.is_elite.sum())} elite")
+    
     def save_calibration_data(self):
         """
         Save all calibration data to files
@@ -403,6 +441,9 @@ def _assess_profile_strength(self, student: StudentFeatures) -> str:
         with open('backend/data/models/elite_colleges_data.json', 'w') as f:
             json.dump(self.elite_colleges_data, f, indent=2)
         
+        # Save per-college calibration table (compact array file)
+        self.save_calibration_table()
+        
         # Generate and save ML calibration code
         calibration_code = self.generate_ml_calibration_code()
         with open('backend/ml/models/enhanced_calibration.py', 'w') as f:
@@ -447,6 +488,11 @@ def main():
     
     calibration_system = EnhancedCalibrationSystem()
     
+    # Only rebuild the per-college table from the existing calibration JSON
+    if '--table-only' in sys.argv:
+        calibration_system.save_calibration_table()
+        return
+    
     # Save all calibration data
     calibration_system.save_calibration_data()
     
@@ -458,6 +504,7 @@ def main():
     logger.info("  - backend/data/models/enhanced_calibration_factors.json")
     logger.info("  - backend/data/models/profile_strength_calibrations.json")
     logger.info("  - backend/data/models/elite_colleges_data.json")
+    logger.info("  - backend/data/models/college_calibration.npz")
     logger.info("  - backend/ml/models/enhanced_calibration.py")
 
 if __name__ == "__main__":
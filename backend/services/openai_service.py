@@ -3,12 +3,15 @@ OpenAI Service for College Information
 Fetches real-world college data like tuition, location, programs, etc.
 """
 
-import openai
 import json
 import logging
 from typing import Dict, Any, Optional
 import os
 
+from core.costs import count
+from core.startup import startup_components
+from core.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 class CollegeInfoService:
@@ -29,9 +32,11 @@ class CollegeInfoService:
             self.api_key = None
         else:
             self.api_key = api_key
+            import openai  # deferred: the SDK takes most of a second to import
             openai.api_key = api_key
             logger.info("OpenAI API key configured successfully")
     
+    @traced('college_info_service.get_college_info')
     async def get_college_info(self, college_name: str) -> Dict[str, Any]:
         """
         Get comprehensive college information using OpenAI
@@ -100,6 +105,8 @@ class CollegeInfoService:
             Use current data (2024-2025). If any information is not available, use "Unknown" or appropriate defaults.
             """
             
+            import openai
+            count('http_calls')
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
@@ -196,6 +203,7 @@ class CollegeInfoService:
             }
         }
     
+    @traced('college_info_service.get_college_subject_emphasis')
     async def get_college_subject_emphasis(self, college_name: str) -> Dict[str, Any]:
         """
         Get subject emphasis data for a specific college using OpenAI
@@ -243,6 +251,8 @@ class CollegeInfoService:
             - Other subjects: lower percentages
             """
             
+            import openai
+            count('http_calls')
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
@@ -334,5 +344,5 @@ class CollegeInfoService:
             results[college_name] = await self.get_college_info(college_name)
         return results
 
-# Global instance
-college_info_service = CollegeInfoService()
+# Global instance (built on first use or by startup warm-up)
+college_info_service = startup_components.add('college_info_service', CollegeInfoService)
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Benchmark the performance of the college suggestions endpoint
+
+Times a running server over HTTP. For repeatable in-process benchmarks of
+all hot paths with JSON baselines, run `python -m benchmarks` in backend/.
 """
 
 import requests
@@ -190,7 +190,7 @@ function ImprovementCard({ area, current, target, impact, priority, description,
   area: string; 
   current: string; 
   target: string; 
-  impact: number;
+  impact: number | null;
   priority?: string;
   description?: string;
   actionable_steps?: string[];
@@ -258,7 +258,7 @@ function ImprovementCard({ area, current, target, impact, priority, description,
             <span className="text-xs text-neutral-400 tracking-wide uppercase">Impact</span>
             <div className="flex items-center gap-2">
               <TrendingUp className="h-4 w-4 text-green-400" />
-              <span className="text-xl font-bold text-green-400">+{impact}%</span>
+              <span className="text-xl font-bold text-green-400">{impact === null ? 'Not measured' : `+${impact}%`}</span>
             </div>
           </div>
         </div>
@@ -307,7 +307,7 @@ export default function CalculationsPage() {
       // Hide items explicitly marked as Target Met or with zero/negative impact
       const targetText = (imp.target || '').toLowerCase()
       const currentText = (imp.current || '').toLowerCase()
-      if (imp.impact <= 0) {
+      if (imp.impact !== null && imp.impact <= 0) {
         console.log('🔍 Filtering out improvement (impact <= 0):', imp.area, 'impact:', imp.impact)
         return false
       }
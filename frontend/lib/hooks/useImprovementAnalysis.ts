@@ -5,7 +5,9 @@ interface ImprovementArea {
   area: string
   current: string
   target: string
-  impact: number
+  impact: number | null  // Measured gain in points; null when the predictor cannot measure it
+  heuristic_impact: number
+  probability_delta: number | null
   priority: string
   description: string
   actionable_steps: string[]
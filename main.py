@@ -1,6 +1,11 @@
 """
 Chancify AI - Main Application Entry Point
 This file serves as the entry point for Railway deployment
+
+Run directly, it serves one uvicorn process. With WEB_CONCURRENCY > 1 it
+switches to the preloaded prefork mode (backend/core/prefork.py): data
+services and models load once in a master process and the workers share
+them copy-on-write.
 """
 
 import sys
@@ -15,6 +20,11 @@ from backend.main import app
 
 # This allows Railway to find the app
 if __name__ == "__main__":
-    import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        from core.prefork import serve_preforked
+        serve_preforked(app, host="0.0.0.0", port=port, workers=workers)
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=port)
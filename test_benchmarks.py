@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the in-process benchmark suite
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import json
+import os
+import tempfile
+
+from benchmarks import BenchmarkCase, build_corpus, compare_to_baseline, load_baseline, run_case, save_baseline
+from benchmarks.runner import results_document
+
+
+def test_corpus_is_deterministic():
+    """The same seed gives the same students, colleges and queries"""
+    first, second = build_corpus(7, students=6, colleges=5), build_corpus(7, students=6, colleges=5)
+    assert first.profiles == second.profiles and first.colleges == second.colleges
+    assert first.search_queries == second.search_queries and first.zipcodes == second.zipcodes
+    assert len(first.colleges) == 5 and all(profile['college'] in first.colleges for profile in first.profiles)
+    assert all(1 <= int(profile['essay_quality']) <= 10 for profile in first.profiles)
+    assert build_corpus(8, students=6, colleges=5).profiles != first.profiles
+    assert first.describe() == {'seed': 7, 'data_version': first.data_version, 'students': 6, 'colleges': 5}
+
+
+def test_cases_report_latency_and_allocations():
+    """Percentiles are ordered, allocations are measured and before() runs untimed before each call"""
+    calls = []
+    case = BenchmarkCase('alloc', lambda n: bytearray(n), [256 * 1024, 512 * 1024],
+                         before=lambda: calls.append(1), items_per_call=2)
+    result = run_case(case, iterations=30, warmup=2, alloc_iterations=4)
+
+    assert len(calls) == 2 + 30 + 4
+    assert result.calls == 30 and result.p50_ms <= result.p95_ms <= result.p99_ms <= result.max_ms
+    assert abs(result.items_per_second - 2 * result.throughput) < 0.01
+    assert 256 <= result.peak_alloc_kib <= 600 and result.retained_kib < 16
+
+
+def test_regressions_are_reported_against_a_baseline():
+    """Only metrics worse than the threshold and the absolute floor fail; baselines round-trip"""
+    result = run_case(BenchmarkCase('noop', lambda item: None, [None]), iterations=5, alloc_iterations=1)
+    document = results_document([result], {'seed': 1})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'nested', 'baseline.json')
+        save_baseline(document, path)
+        baseline = load_baseline(path)
+    assert compare_to_baseline([result], baseline, threshold=0.25) == []
+
+    slow = dict(baseline['results']['noop'], p50_ms=result.p50_ms + 5, p95_ms=result.p95_ms + 5)
+    result.p50_ms, result.p95_ms = slow['p50_ms'] * 2, slow['p95_ms'] * 1.1
+    regressions = compare_to_baseline([result], {'results': {'noop': slow}}, threshold=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith('noop: p50_ms')
+    assert compare_to_baseline([result], {'results': {}}) == []
+
+
+def test_command_line_run_and_baseline_check():
+    """The CLI saves a baseline and exits 1 when a run regresses against one"""
+    from benchmarks.__main__ import main
+
+    options = ['--cases', 'formula_single,get_college_data', '--iterations', '5', '--alloc-iterations', '1',
+               '--students', '4', '--colleges', '4']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'baseline.json')
+        assert main(options + ['--save', path]) == 0
+        with open(path) as f:
+            document = json.load(f)
+        assert set(document['results']) == {'formula_single', 'get_college_data'}
+
+        for result in document['results'].values():
+            result['p50_ms'] = result['p95_ms'] = 0.0001
+        with open(path, 'w') as f:
+            json.dump(document, f)
+        assert main(options + ['--baseline', path]) == 1
+
+
+if __name__ == "__main__":
+    test_corpus_is_deterministic()
+    test_cases_report_latency_and_allocations()
+    test_regressions_are_reported_against_a_baseline()
+    test_command_line_run_and_baseline_check()
+    print("Benchmark suite tests passed")
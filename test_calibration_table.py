@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the persisted per-college calibration table against on-the-fly derivation
+"""
+
+import sys
+sys.path.append('.')
+
+import json
+import math
+import tempfile
+import os
+
+import pandas as pd
+
+from backend.core.elite_matcher import EliteNameMatcher
+from backend.core.probability import default_calibration
+from backend.core.calibration_table import (
+    DEFAULT_TABLE_PATH,
+    CalibrationTable,
+    build_calibration_table,
+    elite_calibration_by_name,
+    match_elite_name
+)
+
+CATALOG_CSV = 'backend/data/raw/real_colleges_integrated.csv'
+FACTORS_JSON = 'backend/data/models/enhanced_calibration_factors.json'
+
+
+def _elite_calibration():
+    with open(FACTORS_JSON, 'r') as f:
+        return elite_calibration_by_name(json.load(f))
+
+
+def test_table_matches_derivation():
+    """Stored A/C and elite factors match default_calibration and name matching"""
+    table = CalibrationTable.load(DEFAULT_TABLE_PATH)
+    catalog = pd.read_csv(CATALOG_CSV)
+    elite_calibration = _elite_calibration()
+
+    assert len(table) == len(catalog)
+
+    for _, row in catalog.iterrows():
+        params = table.calibration_params(row['unitid'], row['acceptance_rate'])
+        expected = default_calibration(row['acceptance_rate'])
+        assert math.isclose(params.A, expected.A, rel_tol=1e-12)
+        assert math.isclose(params.C, expected.C, rel_tol=1e-12)
+
+        elite_name = match_elite_name(row['name'], elite_calibration)
+        elite_params = table.elite_params(row['unitid'])
+        if elite_name is None:
+            assert elite_params is None
+        else:
+            assert elite_params == (
+                elite_calibration[elite_name]['factor'],
+                elite_calibration[elite_name]['max_prob']
+            )
+
+
+def test_lookup_misses():
+    """Unknown unitids and overridden acceptance rates fall back to derivation"""
+    table = build_calibration_table([100, 200], ['Harvard University', 'Somewhere College'], [0.04, 0.5], _elite_calibration())
+
+    assert table.calibration_params(999) is None
+    assert table.calibration_params(None) is None
+    assert table.calibration_params(200, acceptance_rate=0.3) is None
+    assert table.calibration_params(200, acceptance_rate=0.5) is not None
+    assert table.elite_params(100) is not None
+    assert table.elite_params(200) is None
+
+
+def test_save_load_roundtrip():
+    """Tables survive a save/load cycle"""
+    table = build_calibration_table([1, 2, 3], ['Yale University', 'A', 'B'], [0.05, 0.3, 0.7], _elite_calibration())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'table.npz')
+        table.save(path)
+        loaded = CalibrationTable.load(path)
+
+    for unitid in (1, 2, 3):
+        assert loaded.calibration_params(unitid) == table.calibration_params(unitid)
+        assert loaded.elite_params(unitid) == table.elite_params(unitid)
+
+
+def test_elite_matcher_matches_substring_rule():
+    """Compiled matcher agrees with the first-match substring loop"""
+    elite_calibration = _elite_calibration()
+    matcher = EliteNameMatcher(list(elite_calibration))
+    catalog_names = list(pd.read_csv(CATALOG_CSV)['name'])
+    probes = catalog_names + ['university', 'Rice', 'The Harvard University Extension', 'X']
+    for name in probes:
+        assert matcher.match(name) == match_elite_name(name, elite_calibration), name
+
+    # Overlapping patterns: priority follows insertion order, not position in text
+    overlapping = {name: {} for name in ['hers', 'he', 'she', 'his']}
+    matcher = EliteNameMatcher(list(overlapping))
+    for name in ['ushers', 'she', 'h', 'ahishers', 'xyz', 'rs', '']:
+        assert matcher.match(name) == match_elite_name(name, overlapping), name
+
+
+def test_elite_matcher_empty_name():
+    """An empty name matches the first elite entry, as the substring loop does"""
+    elite_calibration = _elite_calibration()
+    matcher = EliteNameMatcher(list(elite_calibration))
+    assert matcher.match_index('') == 0
+    assert matcher.match('') == match_elite_name('', elite_calibration) == next(iter(elite_calibration))
+    assert matcher.match(None) == matcher.match('')
+    assert EliteNameMatcher([]).match('') is None
+
+
+if __name__ == "__main__":
+    test_elite_matcher_matches_substring_rule()
+    test_elite_matcher_empty_name()
+    test_table_matches_derivation()
+    test_lookup_misses()
+    test_save_load_roundtrip()
+    print("Calibration table tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped catalog snapshot against the CSV it is compiled from
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from data import shared_store
+from data.catalog_snapshot import CATALOG_CSV_PATH, get_catalog_snapshot, load_catalog_snapshot
+from data.real_ipeds_major_mapping import real_ipeds_mapping
+from data.shared_store import source_hash
+
+
+def test_frame_matches_csv():
+    """The snapshot frame equals read_csv, with numbers mapped rather than copied"""
+    snapshot = get_catalog_snapshot()
+    frame = snapshot.frame()
+    pd.testing.assert_frame_equal(frame, pd.read_csv(CATALOG_CSV_PATH))
+    assert snapshot.frame() is frame
+    assert snapshot.arrays['unitid'].dtype == np.int64
+    assert not snapshot.arrays['acceptance_rate'].flags.writeable
+    assert np.shares_memory(frame['acceptance_rate'].to_numpy(), snapshot.arrays['acceptance_rate'])
+
+
+def test_version_is_content_hash():
+    """Snapshot version follows the CSV contents; edits produce a new version"""
+    original_dir = shared_store.SHARED_DATA_DIR
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            shared_store.SHARED_DATA_DIR = os.path.join(tmp, 'shared')
+            csv_path = os.path.join(tmp, 'catalog.csv')
+            df = pd.read_csv(CATALOG_CSV_PATH)
+            df.to_csv(csv_path, index=False)
+            first = load_catalog_snapshot(csv_path)
+            assert first.version == source_hash([csv_path])
+
+            df.loc[0, 'acceptance_rate'] = 0.01234
+            df.loc[1, 'city'] = None
+            df.to_csv(csv_path, index=False)
+            second = load_catalog_snapshot(csv_path)
+            assert second.version != first.version
+            assert second.column('acceptance_rate')[0] == 0.01234 and second.column('city')[1] is None
+            assert pd.isna(second.frame().loc[1, 'city'])
+    finally:
+        shared_store.SHARED_DATA_DIR = original_dir
+
+
+def test_schema_is_enforced():
+    """A column that does not fit its fixed dtype fails the build"""
+    original_dir = shared_store.SHARED_DATA_DIR
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            shared_store.SHARED_DATA_DIR = os.path.join(tmp, 'shared')
+            csv_path = os.path.join(tmp, 'catalog.csv')
+            pd.DataFrame({'name': ['A'], 'unitid': ['not-a-number']}).to_csv(csv_path, index=False)
+            try:
+                load_catalog_snapshot(csv_path)
+            except ValueError as e:
+                assert 'unitid' in str(e)
+            else:
+                raise AssertionError("built a snapshot with a text unitid")
+    finally:
+        shared_store.SHARED_DATA_DIR = original_dir
+
+
+def test_tier_lookup_uses_snapshot():
+    """College tiers come from the snapshot and agree with the CSV rows"""
+    df = pd.read_csv(CATALOG_CSV_PATH).drop_duplicates('name')
+    for _, row in df.head(50).iterrows():
+        expected = real_ipeds_mapping.normalize_tier(row['selectivity_tier'])
+        assert real_ipeds_mapping.get_college_tier(row['name']) == expected
+    assert real_ipeds_mapping.get_college_tier("Not A College") == 'moderately_selective'
+
+
+if __name__ == "__main__":
+    test_frame_matches_csv()
+    test_version_is_content_hash()
+    test_schema_is_enforced()
+    test_tier_lookup_uses_snapshot()
+    print("Catalog snapshot tests passed")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the row-index catalog lookup used by college suggestions
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import pandas as pd
+
+from data.real_college_suggestions import SUGGESTION_FIELDS, real_college_suggestions
+
+
+def test_index_matches_row_scan():
+    """Name -> row agrees with scanning the rows (later duplicates win)"""
+    df = real_college_suggestions.college_df
+    expected = {}
+    for position, name in enumerate(df['name'].tolist()):
+        if isinstance(name, str) and name:
+            expected[name] = position
+    assert real_college_suggestions.college_by_name == expected
+    assert all(isinstance(row, int) for row in real_college_suggestions.college_by_name.values())
+
+
+def test_suggestion_fields_come_from_the_row():
+    """Each suggestion entry carries its catalog row's values"""
+    df = real_college_suggestions.college_df
+    for name in ["Harvard University", "Glendale Community College", "Southwestern College"]:
+        row = real_college_suggestions.college_by_name[name]
+        info = real_college_suggestions._college_info(row, name, 0.5, "Engineering")
+        assert list(info) == ['name', *SUGGESTION_FIELDS, 'major_fit_score', 'ipeds_major']
+        for key, (column, _) in SUGGESTION_FIELDS.items():
+            value = df[column].iloc[row]
+            assert info[key] == value or (pd.isna(info[key]) and pd.isna(value)), (name, key)
+
+
+def test_fallback_keeps_first_duplicate():
+    """Fallback suggestions resolve duplicate names to the first row, as the DataFrame filter did"""
+    df = real_college_suggestions.college_df
+    name = "Southwestern College"
+    first = real_college_suggestions._first_row_by_name[name]
+    assert first == int(df.index[df['name'] == name][0])
+    assert first != real_college_suggestions.college_by_name[name]
+
+
+if __name__ == "__main__":
+    test_index_matches_row_scan()
+    test_suggestion_fields_come_from_the_row()
+    test_fallback_keeps_first_duplicate()
+    print("College index tests passed")
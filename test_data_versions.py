@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test data hot reload: bundles pinned per request, validated swaps, versioned caches
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+from dataclasses import replace
+from types import SimpleNamespace
+
+from core.calibration_table import DEFAULT_TABLE_PATH, get_calibration_table
+from data.data_versions import VersionedCache, build_bundle, current_bundle, data_versions, pinned, validate_bundle
+from data.real_college_suggestions import real_college_suggestions
+from data.real_ipeds_major_mapping import real_ipeds_mapping
+
+
+def _reload_with(bundle):
+    """Reload the global manager from a fixed bundle; returns reload()'s result"""
+    data_versions._loader = lambda: bundle
+    try:
+        return data_versions.reload()
+    finally:
+        data_versions._loader = build_bundle
+
+
+def _new_version(bundle):
+    return replace(bundle, sources={**bundle.sources, 'catalog': 'edited'})
+
+
+def test_pinned_request_keeps_its_version():
+    """A request that started before a reload finishes on the old bundle"""
+    old = data_versions.current
+    try:
+        with pinned():
+            assert current_bundle() is old
+            assert _reload_with(_new_version(old))
+            assert current_bundle() is old
+            assert real_college_suggestions.college_by_name is old.suggestions.college_by_name
+        new = current_bundle()
+        assert new is data_versions.current and new.version != old.version
+        assert real_ipeds_mapping.major_mapping is new.ipeds_mapping.major_mapping
+    finally:
+        data_versions._current = old
+
+
+def test_failed_validation_keeps_current():
+    """A bundle that fails validation is never published"""
+    old = data_versions.current
+    try:
+        broken = replace(_new_version(old), suggestions=SimpleNamespace(college_by_name={}))
+        assert not _reload_with(broken)
+        assert data_versions.current is old
+        assert "suggestion index is empty" in data_versions.last_error
+    finally:
+        data_versions._current = old
+        data_versions.last_error = None
+
+
+def test_versioned_cache_follows_swaps():
+    """Entries made under one version are invisible to the next, then dropped"""
+    old = data_versions.current
+    cache = VersionedCache()
+    try:
+        with pinned(old):
+            cache['harvard'] = 1
+            assert _reload_with(_new_version(old))
+            assert cache['harvard'] == 1
+        assert 'harvard' not in cache and len(cache) == 0
+        cache['harvard'] = 2
+        assert list(cache._buckets) == [data_versions.current.version]
+    finally:
+        data_versions._current = old
+
+
+def test_bounded_cache_keeps_recently_used_entries():
+    """With max_entries, the least recently used entry is evicted first"""
+    cache = VersionedCache(max_entries=2)
+    cache['harvard'] = 1
+    cache['yale'] = 2
+    assert cache['harvard'] == 1
+    cache['princeton'] = 3
+    assert list(cache) == ['harvard', 'princeton'] and 'yale' not in cache
+
+    from data.improvement_analysis_service import improvement_analysis_service
+    resolved = improvement_analysis_service._resolved_colleges
+    for i in range(resolved.max_entries + 10):
+        improvement_analysis_service.resolve_college_data(f"Unknown College {i}")
+    assert len(resolved) == resolved.max_entries
+
+
+def test_calibration_table_follows_pinned_bundle():
+    """The predictor's calibration table comes from the serving bundle"""
+    old = data_versions.current
+    assert get_calibration_table() is old.calibration
+    with pinned(replace(old, calibration=None)):
+        assert get_calibration_table() is None
+    assert get_calibration_table() is old.calibration
+
+
+def test_bundle_loads_without_the_names_sheet():
+    """A tree without therealdatabase/ (the Docker image) still gets a servable bundle"""
+    import data.college_names_mapping, data.college_nickname_mapper  # noqa: F401
+    # (the package re-exports same-named services, so take the modules from sys.modules)
+    names_module = sys.modules['data.college_names_mapping']
+    nickname_module = sys.modules['data.college_nickname_mapper']
+
+    original = names_module.NAMES_SHEET_PATH
+    missing = os.path.join(tempfile.gettempdir(), 'no-such-dir', 'College_Names_and_Nicknames.xlsx')
+    names_module.NAMES_SHEET_PATH = nickname_module.NAMES_SHEET_PATH = missing
+    try:
+        bundle = build_bundle()
+    finally:
+        names_module.NAMES_SHEET_PATH = nickname_module.NAMES_SHEET_PATH = original
+    assert bundle.sources['names'] == 'missing'
+    assert bundle.names_mapping.college_mapping == {}
+    assert bundle.nickname_mapper.find_college_by_nickname('mit') == 'Massachusetts Institute of Technology'
+    assert validate_bundle(bundle) == []
+
+
+def test_failed_first_load_is_not_retried_per_request():
+    """Without any bundle the error is cached for a while and calibration falls back to the file"""
+    old = data_versions.current
+    calls = []
+
+    def failing_loader():
+        calls.append(1)
+        raise OSError("catalog missing")
+
+    data_versions._current, data_versions._loader = None, failing_loader
+    try:
+        for _ in range(3):
+            try:
+                bundle = data_versions.current
+            except OSError:
+                pass
+            else:
+                raise AssertionError(f"load should fail, got bundle {bundle.version}")
+        assert len(calls) == 1 and data_versions.last_error == "catalog missing"
+        assert get_calibration_table() is get_calibration_table(str(DEFAULT_TABLE_PATH))
+    finally:
+        data_versions._current, data_versions._loader = old, build_bundle
+        data_versions._failure, data_versions.last_error = None, None
+
+
+if __name__ == "__main__":
+    test_pinned_request_keeps_its_version()
+    test_failed_validation_keeps_current()
+    test_versioned_cache_follows_swaps()
+    test_bounded_cache_keeps_recently_used_entries()
+    test_calibration_table_follows_pinned_bundle()
+    test_bundle_loads_without_the_names_sheet()
+    test_failed_first_load_is_not_retried_per_request()
+    print("Data version tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk cache of indexes derived from source data files
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+
+from data import derived_cache
+from data.city_state_database import CityStateDatabase
+from data.derived_cache import cached_index
+from data.tuition_state_service import TuitionStateService
+
+
+class _TempCacheDir:
+    """Point the derived cache at a scratch directory for the duration of a test"""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original = derived_cache.DERIVED_CACHE_DIR
+        derived_cache.DERIVED_CACHE_DIR = os.path.join(self.tmp.name, 'cache')
+        return self.tmp.name
+
+    def __exit__(self, *exc):
+        derived_cache.DERIVED_CACHE_DIR = self.original
+        self.tmp.cleanup()
+
+
+def test_index_rebuilt_only_when_inputs_change():
+    """Same sources and code version load the cached index; a change rebuilds"""
+    builds = []
+
+    def build():
+        builds.append(1)
+        with open(source) as f:
+            return {'rows': f.read().split()}
+
+    with _TempCacheDir() as tmp:
+        source = os.path.join(tmp, 'colleges.csv')
+        with open(source, 'w') as f:
+            f.write("MIT Yale")
+
+        assert cached_index('demo', [source], build) == {'rows': ['MIT', 'Yale']}
+        assert cached_index('demo', [source], build) == {'rows': ['MIT', 'Yale']}
+        assert len(builds) == 1
+
+        # A new code version rebuilds the same sources
+        cached_index('demo', [source], build, version='v2')
+        assert len(builds) == 2
+
+        # Edited sources rebuild and replace the older entries
+        with open(source, 'w') as f:
+            f.write("MIT Yale Brown")
+        assert cached_index('demo', [source], build, version='v2') == {'rows': ['MIT', 'Yale', 'Brown']}
+        assert len(builds) == 3
+        assert len([e for e in os.listdir(derived_cache.DERIVED_CACHE_DIR) if e.startswith('demo-')]) == 1
+
+
+def test_missing_or_corrupt_entries_fall_back_to_build():
+    """A missing source is never cached and an unreadable entry is rebuilt"""
+    with _TempCacheDir() as tmp:
+        assert cached_index('demo', [os.path.join(tmp, 'missing.csv')], lambda: 'fallback') == 'fallback'
+        assert not os.path.exists(derived_cache.DERIVED_CACHE_DIR)
+
+        source = os.path.join(tmp, 'colleges.csv')
+        with open(source, 'w') as f:
+            f.write("MIT")
+        cached_index('demo', [source], lambda: 'built')
+        (entry,) = os.listdir(derived_cache.DERIVED_CACHE_DIR)
+        with open(os.path.join(derived_cache.DERIVED_CACHE_DIR, entry), 'wb') as f:
+            f.write(b'not a pickle')
+        assert cached_index('demo', [source], lambda: 'rebuilt') == 'rebuilt'
+
+
+def test_services_load_identical_indexes_from_cache():
+    """Warm starts restore exactly the dictionaries a cold start builds"""
+    with _TempCacheDir():
+        cold_city, cold_tuition = CityStateDatabase(), TuitionStateService()
+        assert len(os.listdir(derived_cache.DERIVED_CACHE_DIR)) == 2
+        warm_city, warm_tuition = CityStateDatabase(), TuitionStateService()
+
+    assert cold_city.college_to_state and cold_tuition.tuition_data
+    assert list(warm_city.college_to_state.items()) == list(cold_city.college_to_state.items())
+    assert list(warm_city.city_to_state.items()) == list(cold_city.city_to_state.items())
+    for name in ('tuition_data', 'college_states', 'zipcode_states'):
+        assert list(getattr(warm_tuition, name).items()) == list(getattr(cold_tuition, name).items()), name
+
+
+if __name__ == "__main__":
+    test_index_rebuilt_only_when_inputs_change()
+    test_missing_or_corrupt_entries_fall_back_to_build()
+    test_services_load_identical_indexes_from_cache()
+    print("Derived index cache tests passed")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test that importing the API stays within its import-time budget
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+
+from core.import_budget import HEAVY_MODULES, check_import_budget, profile_imports
+
+
+def test_api_import_is_within_budget():
+    """The app imports without the ML stack and within IMPORT_TIME_BUDGET"""
+    profile = profile_imports('main')
+    assert profile.seconds > 0 and 'database' in profile.direct
+    assert check_import_budget(profile) == [], check_import_budget(profile)
+    assert not {name.split('.')[0] for name in profile.loaded} & set(HEAVY_MODULES)
+
+
+def test_predictor_loads_in_the_startup_warmup():
+    """The predictor is a startup component, so the background warm-up imports the ML stack"""
+    from core.startup import startup_components
+    import ml.models.predictor  # noqa: F401  (declares the component)
+
+    assert 'ml_predictor' in startup_components.status()
+
+
+def test_budget_violations_are_reported():
+    """Slow imports and forbidden packages each produce a problem"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'slow_app.py'), 'w') as f:
+            f.write("import time, json\ntime.sleep(0.2)\n")
+        profile = profile_imports('slow_app', cwd=tmp)
+
+    assert profile.seconds >= 0.2 and 'json' in profile.direct
+    assert check_import_budget(profile, budget=10.0, forbidden=()) == []
+    problems = check_import_budget(profile, budget=0.1, forbidden=('json',))
+    assert len(problems) == 2
+    assert 'budget 0.10s' in problems[0] and problems[1].endswith('loaded json')
+
+
+if __name__ == "__main__":
+    test_api_import_is_within_budget()
+    test_predictor_loads_in_the_startup_warmup()
+    test_budget_violations_are_reported()
+    print("Import budget tests passed")
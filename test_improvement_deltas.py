@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test measured improvement impacts against one-at-a-time predictions
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+from data.improvement_analysis_service import (
+    MAX_IMPROVEMENTS, improvement_analysis_service, _changes_scored_fields, _raise_profile
+)
+from data.improvement_rules import ImprovementArea
+from ml.models.predictor import get_predictor
+from ml.preprocessing.feature_extractor import CollegeFeatures
+from ml.preprocessing.frontend_profile import frontend_profile_to_student_features
+
+PROFILE = {
+    'gpa_unweighted': '3.6',
+    'sat': '1380',
+    'essay_quality': '6',
+    'extracurricular_depth': '5',
+    'leadership_positions': '1',
+    'recommendations': '6',
+    'volunteer_work': '4',
+    'intended_major': 'Computer Science'
+}
+COLLEGE = CollegeFeatures(name="Stanford University", acceptance_rate=0.04, sat_25th=1500, sat_75th=1570)
+
+
+def _predict(profile):
+    student = frontend_profile_to_student_features(profile)
+    return get_predictor().predict(student, COLLEGE).probability
+
+
+def test_deltas_match_single_predictions():
+    """Batched deltas equal re-running predict() on each perturbed profile"""
+    improvements = improvement_analysis_service.analyze_user_profile(PROFILE, "Stanford University")
+    measured = improvement_analysis_service.measure_probability_deltas(
+        PROFILE, improvements, COLLEGE, get_predictor()
+    )
+    base = _predict(PROFILE)
+    assert abs(measured["base_probability"] - base) < 1e-12
+    assert all(imp.profile_changes for imp in improvements)
+    for imp in improvements:
+        raised = _raise_profile(PROFILE, imp.profile_changes)
+        if _changes_scored_fields(PROFILE, raised, get_predictor().is_available()):
+            expected = _predict(raised) - base
+            assert abs(imp.probability_delta - expected) < 1e-12, imp.area
+            assert imp.impact == int(round(expected * 100))
+        else:
+            assert imp.probability_delta is None and imp.impact is None, imp.area
+
+
+def test_combined_delta_uses_top_gains():
+    """Combined delta re-scores the top-k changes applied together"""
+    improvements = improvement_analysis_service.analyze_user_profile(PROFILE, "Stanford University")
+    measured = improvement_analysis_service.measure_probability_deltas(
+        PROFILE, improvements, COLLEGE, get_predictor(), top_k=2
+    )
+    top = measured["improvements"][:2]
+    assert measured["combined_areas"] == [imp.area for imp in top]
+
+    combined = dict(PROFILE)
+    for imp in top:
+        combined = _raise_profile(combined, imp.profile_changes)
+    assert abs(measured["combined_probability"] - _predict(combined)) < 1e-12
+    assert measured["combined_delta"] >= top[0].probability_delta
+
+
+def test_targets_never_lower_profile():
+    """Perturbations only raise fields, starting from the predictor's defaults"""
+    raised = _raise_profile({'sat': '1550', 'essay_quality': ''}, {'sat': 1500, 'essay_quality': 8})
+    assert raised == {'sat': 1550.0, 'essay_quality': 8}
+    # A missing awards field is scored as 5, so a target of 3 changes nothing
+    assert _raise_profile({}, {'awards_publications': 3}) == {'awards_publications': 5.0}
+
+    # Fields the converter only estimates raise the field it estimates them from
+    assert _raise_profile({'extracurricular_depth': '4'}, {'ap_count': 12}) == {
+        'extracurricular_depth': 6.0, 'ap_count': 12
+    }
+    assert _raise_profile({}, {'leadership_positions': 7})['extracurricular_depth'] == 7
+
+
+def test_unscored_changes_are_unmeasured():
+    """Rules changing only fields the predictor ignores stay unmeasured and keep their heuristic"""
+    predictor = get_predictor()
+    unscored = ImprovementArea(area="Research", current="", target="", heuristic_impact=6, priority="high",
+                               description="", actionable_steps=[], profile_changes={'research_experience': 7})
+    academic = ImprovementArea(area="Academic Rigor", current="", target="", heuristic_impact=9, priority="high",
+                               description="", actionable_steps=[], profile_changes={'ap_count': 12})
+    improvement_analysis_service.measure_probability_deltas(PROFILE, [unscored, academic], COLLEGE, predictor)
+    assert unscored.probability_delta is None and unscored.impact is None
+    assert unscored.heuristic_impact == 6
+    assert academic.probability_delta > 0
+    assert academic.impact == int(round(academic.probability_delta * 100))
+    assert academic.heuristic_impact == 9
+
+
+def test_ranked_by_measured_gain_before_cut():
+    """Measured gains decide the order and the top-20 cut; unmeasurable rules go last"""
+    predictor = get_predictor()
+    unscored = ImprovementArea(area="Research", current="", target="", heuristic_impact=15, priority="high",
+                               description="", actionable_steps=[], profile_changes={'research_experience': 9})
+    # High heuristic score, small gain: ahead of the SAT rule before measuring, behind it after
+    filler = [
+        ImprovementArea(area=f"Essay {i}", current="", target="", heuristic_impact=14, priority="high",
+                        description="", actionable_steps=[], profile_changes={'essay_quality': 6.5})
+        for i in range(MAX_IMPROVEMENTS)
+    ]
+    sat = ImprovementArea(area="Standardized Testing", current="", target="", heuristic_impact=1, priority="low",
+                          description="", actionable_steps=[], profile_changes={'sat': 1570})
+    measured = improvement_analysis_service.measure_probability_deltas(
+        PROFILE, [unscored] + filler + [sat], COLLEGE, predictor
+    )
+    ranked = measured["improvements"]
+
+    assert len(ranked) == MAX_IMPROVEMENTS
+    assert ranked[0] is sat
+    assert unscored not in ranked
+    deltas = [imp.probability_delta for imp in ranked]
+    assert deltas == sorted(deltas, reverse=True)
+
+
+def test_college_list_matches_single_analyses():
+    """List analysis gives each college the same deltas as analyzing it alone"""
+    colleges = [
+        COLLEGE,
+        CollegeFeatures(name="Rice University", acceptance_rate=0.09, test_policy="Test-optional"),
+        CollegeFeatures(name="State University", acceptance_rate=0.7, financial_aid_policy="Need-aware"),
+    ]
+    names = [college.name for college in colleges]
+    analysis = improvement_analysis_service.analyze_college_list(PROFILE, names, colleges, get_predictor())
+
+    aggregate = {}
+    for college, entry in zip(colleges, analysis["colleges"]):
+        single = improvement_analysis_service.analyze_user_profile(PROFILE, college.name)
+        measured = improvement_analysis_service.measure_probability_deltas(PROFILE, single, college, get_predictor())
+        assert abs(entry["base_probability"] - measured["base_probability"]) < 1e-12
+        single = measured["improvements"]
+        assert [(imp.area, imp.target) for imp in entry["improvements"]] == [(imp.area, imp.target) for imp in single]
+        for batched, alone in zip(entry["improvements"], single):
+            assert (batched.probability_delta is None) == (alone.probability_delta is None), batched.area
+            if batched.probability_delta is not None:
+                assert abs(batched.probability_delta - alone.probability_delta) < 1e-12, batched.area
+            aggregate[batched.area] = aggregate.get(batched.area, 0.0) + (batched.probability_delta or 0.0)
+
+    gains = [entry["aggregate_gain"] for entry in analysis["improvements"]]
+    assert gains == sorted(gains, reverse=True)
+    for entry in analysis["improvements"]:
+        assert abs(entry["aggregate_gain"] - aggregate[entry["area"]]) < 1e-12
+    assert analysis["combined_expected_admits"] >= analysis["base_expected_admits"]
+
+
+if __name__ == "__main__":
+    test_deltas_match_single_predictions()
+    test_combined_delta_uses_top_gains()
+    test_targets_never_lower_profile()
+    test_unscored_changes_are_unmeasured()
+    test_ranked_by_measured_gain_before_cut()
+    test_college_list_matches_single_analyses()
+    print("Measured improvement impacts match single predictions")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test the compiled improvement rule table and its reload
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import json
+import os
+import tempfile
+
+from data.improvement_analysis_service import RULES_PATH, improvement_analysis_service
+from data.improvement_rules import RuleTable, load_rule_table
+
+COLLEGES = [
+    {"acceptance_rate": 0.05, "sat_25th": 1500, "sat_75th": 1570, "act_25th": 34, "act_75th": 36,
+     "gpa_avg": 4.2, "gpa_unweighted_avg": 3.95},
+    {"acceptance_rate": 0.15, "sat_25th": 1350, "sat_75th": 1500, "act_25th": 30, "act_75th": 34,
+     "gpa_avg": 4.0, "gpa_unweighted_avg": 3.8},
+    {"acceptance_rate": 0.6, "sat_25th": 1100, "sat_75th": 1300, "act_25th": 22, "act_75th": 28},
+]
+PROFILE = {
+    'gpa_unweighted': '3.7', 'sat': '1400', 'essay_quality': '6', 'extracurricular_depth': '6',
+    'leadership_positions': '3', 'ap_count': '4', 'intended_major': 'Computer Science'
+}
+
+
+def _table():
+    with open(RULES_PATH) as f:
+        return json.load(f)
+
+
+def test_rules_fire_per_college():
+    """College-dependent rules follow each college's thresholds"""
+    results = improvement_analysis_service.rules.evaluate(PROFILE, COLLEGES)
+    areas = [{(imp.area, imp.priority) for imp in improvements} for improvements in results]
+
+    # SAT 1400: below the elite 25th, mid-range at the second, above the third's 75th
+    sat = [[imp for imp in improvements if imp.area == "Standardized Testing"] for improvements in results]
+    assert sat[0][0].heuristic_impact == 12 and sat[0][0].profile_changes == {'sat': 1500.0}
+    assert sat[1][0].heuristic_impact == 3 and sat[1][0].target == "1550+ SAT"
+    assert sat[2] == []
+
+    # Profile-only rules match for every college; disabled rules never do
+    for college_areas in areas:
+        assert ("Essay Quality", "medium") in college_areas
+        assert ("STEM Preparation", "high") in college_areas
+        assert not any(area in ("First-Gen Support", "Geographic Diversity") for area, _ in college_areas)
+    assert [imp.area for imp in results[2]].count("Academic Rigor") == 0  # 4 APs >= 3 needed
+
+
+def test_batch_matches_single_college():
+    """Evaluating many colleges at once equals evaluating each alone"""
+    rules = improvement_analysis_service.rules
+    batch = rules.evaluate(PROFILE, COLLEGES)
+    for college, improvements in zip(COLLEGES, batch):
+        assert improvements == rules.evaluate(PROFILE, [college])[0]
+
+
+def test_text_and_order_match_the_original_analyses():
+    """Numbers render as the analyses formatted them, and equal-ranked rules keep their order"""
+    first = improvement_analysis_service.rules.evaluate(PROFILE, COLLEGES[:1])[0]
+    by_area = {imp.area: imp for imp in first}
+    assert (by_area['Standardized Testing'].current, by_area['Standardized Testing'].target) == ('1400.0 SAT', '1500.0+ SAT')
+    assert by_area['Standardized Testing'].description.startswith('Your SAT score is 100.0 points')
+    assert by_area['Academic Performance'].description.startswith('Your GPA is 0.25 points')
+    assert by_area['Essay Quality'].current == '6.0/10 quality'
+    # Missing fields are parsed from their default; blank ones keep it as is
+    volunteer = {imp.area: imp for imp in improvement_analysis_service.rules.evaluate({}, COLLEGES[:1])[0]}
+    assert volunteer['Community Service'].current == '5.0/10 volunteer work'
+    blank = improvement_analysis_service.rules.evaluate({'volunteer_work': ''}, COLLEGES[:1])[0]
+    assert {imp.area: imp for imp in blank}['Community Service'].current == '5/10 volunteer work'
+
+    ranked = improvement_analysis_service._analyze_college(PROFILE, COLLEGES[0])
+    medium = [imp.area for imp in ranked if imp.priority != 'high' and imp.heuristic_impact == 6]
+    assert medium.index('Academic Rigor') < medium.index('Awards & Recognition')
+
+
+def test_templates_are_interned():
+    """Constant text and steps are shared across results instead of rebuilt"""
+    first, second = improvement_analysis_service.rules.evaluate(PROFILE, COLLEGES[:2])
+    essay = [[imp for imp in improvements if imp.area == "Essay Quality"][0] for improvements in (first, second)]
+    assert essay[0].description is essay[1].description
+    assert all(a is b for a, b in zip(essay[0].actionable_steps, essay[1].actionable_steps))
+
+
+def test_bad_rule_is_rejected():
+    """Unknown metrics fail at compile time, not per request"""
+    table = _table()
+    table['rules'][0]['when'] = [["gpa_typo", "lt", 3.0]]
+    try:
+        RuleTable(table)
+    except ValueError as e:
+        assert "gpa_typo" in str(e)
+    else:
+        raise AssertionError("compiled a rule with an unknown metric")
+
+
+def test_reload_without_deploy():
+    """Edited rules take effect on reload; a broken file keeps the old table"""
+    original_rules = improvement_analysis_service.rules
+    table = _table()
+    essay = next(rule for rule in table['rules'] if rule['area'] == "Essay Quality")
+    essay['when'] = [["essay_quality", "lt", 9]]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rules.json')
+            with open(path, 'w') as f:
+                json.dump(table, f)
+            assert improvement_analysis_service.reload_rules(path)
+            assert improvement_analysis_service.rules.version != original_rules.version
+            areas = [imp.area for imp in improvement_analysis_service.rules.evaluate({'essay_quality': '8'}, COLLEGES[:1])[0]]
+            assert "Essay Quality" in areas
+
+            reloaded = improvement_analysis_service.rules
+            with open(path, 'w') as f:
+                f.write("{not json")
+            assert not improvement_analysis_service.reload_rules(path)
+            assert improvement_analysis_service.rules is reloaded
+    finally:
+        improvement_analysis_service.rules = original_rules
+    assert load_rule_table(RULES_PATH).version == original_rules.version
+
+
+if __name__ == "__main__":
+    test_rules_fire_per_college()
+    test_batch_matches_single_college()
+    test_text_and_order_match_the_original_analyses()
+    test_templates_are_interned()
+    test_bad_rule_is_rejected()
+    test_reload_without_deploy()
+    print("Improvement rule table tests passed")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the application-list optimizer against brute force and plain greedy
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import itertools
+
+import numpy as np
+
+from core.list_optimizer import list_value, optimize_application_list
+from ml.models.predictor import get_predictor
+from ml.preprocessing.feature_extractor import CollegeFeatures
+from ml.preprocessing.frontend_profile import frontend_profile_to_student_features
+
+
+def _pool(size, seed):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.02, 0.95, size), rng.uniform(0.1, 1.0, size), rng.choice([50.0, 75.0, 90.0], size)
+
+
+def _plain_greedy(probs, utils, k):
+    chosen = []
+    for _ in range(k):
+        rest = [i for i in range(len(probs)) if i not in chosen]
+        base = list_value(probs[chosen], utils[chosen])
+        gains = [list_value(probs[chosen + [i]], utils[chosen + [i]]) - base for i in rest]
+        chosen.append(rest[int(np.argmax(gains))])
+    return chosen
+
+
+def test_lazy_matches_plain_greedy():
+    """Lazy evaluation picks the same colleges as re-evaluating every gain"""
+    for seed in range(5):
+        probs, utils, _ = _pool(60, seed)
+        plan = optimize_application_list(probs, utils, max_applications=8)
+        assert plan.selected == _plain_greedy(probs, utils, 8)
+        assert abs(plan.expected_utility - list_value(probs[plan.selected], utils[plan.selected])) < 1e-12
+        assert abs(sum(plan.marginal_gains) - plan.expected_utility) < 1e-12
+
+
+def test_near_optimal_on_small_pools():
+    """Greedy reaches at least (1 - 1/e) of the brute-force optimum"""
+    for seed in range(5):
+        probs, utils, _ = _pool(12, seed + 10)
+        best = max(list_value(probs[list(s)], utils[list(s)]) for s in itertools.combinations(range(12), 4))
+        plan = optimize_application_list(probs, utils, max_applications=4)
+        assert plan.expected_utility >= (1 - 1 / np.e) * best
+        assert plan.expected_utility >= 0.95 * best
+
+
+def test_budget_is_respected():
+    """Total fees never exceed the budget"""
+    probs, utils, costs = _pool(500, 3)
+    for budget in (0, 60, 200, 700):
+        plan = optimize_application_list(probs, utils, max_applications=20, costs=costs, budget=budget)
+        assert plan.total_cost <= budget
+        assert abs(plan.total_cost - costs[plan.selected].sum()) < 1e-9
+    assert optimize_application_list(probs, utils, max_applications=20, costs=costs, budget=0).selected == []
+
+
+def test_predict_probabilities_matches_predict():
+    """Batched pool scoring gives the same probabilities as predict()"""
+    predictor = get_predictor()
+    student = frontend_profile_to_student_features({'gpa_unweighted': '3.7', 'sat': '1390', 'essay_quality': '8'})
+    colleges = [
+        CollegeFeatures(name="Harvard University", acceptance_rate=0.04, unitid=1000001),
+        CollegeFeatures(name="Test Blind College", acceptance_rate=0.3, test_policy="Test-blind"),
+        CollegeFeatures(name="Need Aware College", acceptance_rate=0.12, financial_aid_policy="Need-aware"),
+        CollegeFeatures(name="State University", acceptance_rate=0.75),
+    ]
+    probabilities = predictor.predict_probabilities(student, colleges)
+    for college, probability in zip(colleges, probabilities):
+        assert abs(probability - predictor.predict(student, college).probability) < 1e-12
+
+
+if __name__ == "__main__":
+    test_lazy_matches_plain_greedy()
+    test_near_optimal_on_small_pools()
+    test_budget_is_respected()
+    test_predict_probabilities_matches_predict()
+    print("Application-list optimizer tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped model bundle and its random forest representation
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from ml.models.artifacts import (
+    MODEL_BUNDLE_FILE, MappedForest, convert_model_dir, load_model_bundle, save_model_bundle
+)
+from ml.models.predictor import AdmissionPredictor
+
+
+def _train_models():
+    """Small LR + RF + soft-voting ensemble on synthetic data"""
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(400, 6))
+    y = (X[:, 0] + 0.5 * X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    X = scaler.transform(X)
+    lr = LogisticRegression().fit(X, y)
+    rf = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    ensemble = VotingClassifier([('lr', lr), ('rf', rf)], voting='soft').fit(X, y)
+    models = {'logistic_regression': lr, 'random_forest': rf, 'ensemble': ensemble}
+    return models, scaler, X
+
+
+def test_mapped_forest_matches_sklearn():
+    """Flat-array traversal gives the forest's exact probabilities, NaNs included"""
+    models, _, X = _train_models()
+    forest = models['random_forest']
+    mapped = MappedForest(forest)
+    assert mapped.n_estimators == 25
+    assert np.array_equal(mapped.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(mapped.predict(X), forest.predict(X))
+
+    with_missing = X.copy()
+    with_missing[::3, 0] = np.nan
+    nan_forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(with_missing, forest.predict(X))
+    assert np.array_equal(MappedForest(nan_forest).predict_proba(with_missing), nan_forest.predict_proba(with_missing))
+
+
+def test_bundle_round_trip_is_mapped_and_deduplicated():
+    """The bundle predicts like the source models, maps its arrays and stores members once"""
+    models, scaler, X = _train_models()
+    expected = {name: model.predict_proba(X) for name, model in models.items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        save_model_bundle(tmp, models, scaler)
+        assert os.listdir(tmp) == [MODEL_BUNDLE_FILE]
+        bundle = load_model_bundle(tmp)
+
+        loaded = bundle['models']
+        for name, probabilities in expected.items():
+            assert np.array_equal(loaded[name].predict_proba(X), probabilities), name
+        assert loaded['ensemble'].estimators_[0] is loaded['logistic_regression']
+        assert loaded['ensemble'].estimators_[1] is loaded['random_forest']
+        assert isinstance(loaded['random_forest'].threshold, np.memmap)
+        assert np.array_equal(bundle['scaler'].mean_, scaler.mean_)
+
+        with open(os.path.join(tmp, MODEL_BUNDLE_FILE), 'wb') as f:
+            joblib.dump({'format': 999}, f)
+        try:
+            load_model_bundle(tmp)
+            raise AssertionError("unknown bundle format was accepted")
+        except ValueError:
+            pass
+    assert load_model_bundle(tmp) is None
+
+
+def test_predictor_prefers_converted_bundle():
+    """Legacy files convert to a bundle, which the predictor then loads"""
+    models, scaler, X = _train_models()
+    expected = models['ensemble'].predict_proba(X)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in models.items():
+            joblib.dump(model, os.path.join(tmp, f'{name}.joblib'))
+        joblib.dump(scaler, os.path.join(tmp, 'scaler.joblib'))
+        assert convert_model_dir(tmp) == os.path.join(tmp, MODEL_BUNDLE_FILE)
+        for name in models:
+            os.remove(os.path.join(tmp, f'{name}.joblib'))  # only the bundle is left to load
+
+        predictor = AdmissionPredictor(model_dir=tmp)
+        assert predictor.is_available()
+        assert sorted(predictor.models) == sorted(models)
+        assert isinstance(predictor.models['random_forest'], MappedForest)
+        assert np.array_equal(predictor.models['ensemble'].predict_proba(X), expected)
+
+
+if __name__ == "__main__":
+    test_mapped_forest_matches_sklearn()
+    test_bundle_round_trip_is_mapped_and_deduplicated()
+    test_predictor_prefers_converted_bundle()
+    print("Model artifact tests passed")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test the versioned model registry, atomic activation and shadow scoring
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from ml.models import predictor as predictor_module
+from ml.models.predictor import activate_model, active_model_version, get_predictor
+from ml.models.registry import ACTIVE_POINTER_FILE, ModelRegistry
+from ml.models.shadow import ShadowScorer
+from ml.preprocessing.feature_extractor import CollegeFeatures, FeatureExtractor, StudentFeatures
+
+STUDENT = StudentFeatures(factor_scores={}, gpa_unweighted=3.8, sat_total=1480)
+COLLEGE = CollegeFeatures(name='Test College', acceptance_rate=0.3)
+
+
+def _train(seed: int, n_features: int = None):
+    """LR + RF on random data shaped like FeatureExtractor output"""
+    if n_features is None:
+        n_features = FeatureExtractor.extract_features(STUDENT, COLLEGE)[0].shape[0]
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, n_features))
+    y = (X[:, 0] + rng.normal(size=200) > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    models = {
+        'logistic_regression': LogisticRegression().fit(scaler.transform(X), y),
+        'random_forest': RandomForestClassifier(n_estimators=5, max_depth=4, random_state=seed).fit(scaler.transform(X), y)
+    }
+    return models, scaler
+
+
+class _TempRegistry:
+    """Point the predictor at a scratch registry and restore its globals afterwards"""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (predictor_module.model_registry, predictor_module._predictor, predictor_module._predictor_version)
+        predictor_module.model_registry = ModelRegistry(self.tmp.name)
+        return predictor_module.model_registry
+
+    def __exit__(self, *exc):
+        (predictor_module.model_registry, predictor_module._predictor, predictor_module._predictor_version) = self.saved
+        self.tmp.cleanup()
+
+
+def test_versions_are_stored_with_metrics_and_schema():
+    """Each run gets its own directory; the pointer names exactly one of them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        assert registry.versions() == [] and registry.active_version() is None
+
+        models, scaler = _train(1)
+        metadata = {'metrics': {'ensemble': {'roc_auc': 0.81}}, 'selected_features': ['gpa_unweighted', 'sat_total']}
+        first = registry.register(models, scaler, metadata=metadata, version='v1')
+        second = registry.register(*_train(2), version='v2')
+        try:
+            registry.register(*_train(3), version='v1')
+            raise AssertionError("duplicate version was accepted")
+        except ValueError:
+            pass
+
+        assert [v.version for v in registry.versions()] == [first, second]
+        v1 = registry.versions()[0]
+        assert v1.metrics == {'ensemble': {'roc_auc': 0.81}}
+        assert v1.feature_names == ['gpa_unweighted', 'sat_total'] and v1.registered_at
+        assert not any(name.startswith('.staging') for name in os.listdir(tmp))
+
+        registry.set_active('v2')
+        assert registry.active_version() == 'v2'
+        assert [v.active for v in registry.versions()] == [False, True]
+        for unknown in ('v3', '../v1', ACTIVE_POINTER_FILE):
+            try:
+                registry.set_active(unknown)
+                raise AssertionError(f"{unknown} was activated")
+            except KeyError:
+                pass
+        assert registry.active_version() == 'v2'
+
+
+def test_activation_swaps_only_working_versions():
+    """A good version is loaded, warmed and swapped in; a broken one leaves the old predictor serving"""
+    with _TempRegistry() as registry:
+        registry.register(*_train(1), version='v1')
+        registry.register(*_train(2, n_features=3), version='broken')  # wrong feature schema
+        registry.set_active('v1')
+
+        serving = get_predictor(force_reload=True)
+        assert active_model_version() == 'v1' and serving.is_available()
+        before = serving.predict(STUDENT, COLLEGE).probability
+
+        registry.register(*_train(2), version='v2')
+        swapped = activate_model('v2')
+        assert get_predictor() is swapped and swapped is not serving
+        assert registry.active_version() == 'v2' and active_model_version() == 'v2'
+
+        try:
+            activate_model('broken')
+            raise AssertionError("broken version was activated")
+        except ValueError:
+            pass
+        assert get_predictor() is swapped and registry.active_version() == 'v2'
+        assert np.isfinite(before)
+
+
+def test_shadow_scoring_runs_off_the_request_path():
+    """Sampled requests are re-scored by the candidate and summarized; a full queue drops samples"""
+    with _TempRegistry() as registry:
+        registry.register(*_train(1), version='v1')
+        registry.register(*_train(2), version='v2')
+        live = predictor_module.load_version('v1')
+        candidate = predictor_module.load_version('v2')
+
+        shadow = ShadowScorer()
+        assert not shadow.submit(STUDENT, COLLEGE, live.predict(STUDENT, COLLEGE), 0.001)
+        shadow.start(candidate, 'v2', sample_rate=1.0)
+        for _ in range(20):
+            assert shadow.submit(STUDENT, COLLEGE, live.predict(STUDENT, COLLEGE), 0.001)
+        assert shadow.drain()
+
+        stats = shadow.stats()
+        expected = candidate.predict(STUDENT, COLLEGE).probability - live.predict(STUDENT, COLLEGE).probability
+        assert stats['scored'] == 20 and stats['errors'] == 0 and stats['version'] == 'v2'
+        assert abs(stats['probability_delta']['mean'] - expected) < 1e-4
+        assert stats['latency_ms']['live_p50'] == 1.0
+
+        shadow.stop()
+        assert not shadow.submit(STUDENT, COLLEGE, live.predict(STUDENT, COLLEGE), 0.001)
+
+        tiny = ShadowScorer(queue_size=1)
+        tiny.candidate, tiny.sample_rate = candidate, 1.0  # no worker, so the queue fills
+        result = live.predict(STUDENT, COLLEGE)
+        assert tiny.submit(STUDENT, COLLEGE, result, 0.001) and not tiny.submit(STUDENT, COLLEGE, result, 0.001)
+        assert tiny.stats()['dropped'] == 1
+
+
+def test_model_endpoints_require_admin_post():
+    """Activating, shadowing and reloading are POSTs carrying the admin token"""
+    from fastapi.testclient import TestClient
+    from core import profiler
+    from main import app
+
+    client = TestClient(app)
+    original = profiler.PROFILE_ADMIN_TOKEN
+    profiler.PROFILE_ADMIN_TOKEN = 'secret'
+    try:
+        for path in ('/api/debug/models/activate', '/api/debug/models/shadow'):
+            assert client.get(path, params={'version': 'missing'}).status_code == 405
+            assert client.post(path, params={'version': 'missing'}).status_code == 403
+            response = client.post(path, params={'version': 'missing'}, headers={'X-Profile-Token': 'secret'})
+            assert response.status_code == 200 and response.json()['status'] == 'error'
+        stopped = client.post('/api/debug/models/shadow', headers={'X-Profile-Token': 'secret'})
+        assert stopped.json()['status'] == 'success'
+
+        # Reloads replace every prefork worker, so they are admin-only POSTs too
+        for path in ('/api/debug/reload-predictor', '/api/debug/reload-data', '/api/debug/reload-improvement-rules'):
+            assert client.get(path).status_code == 405
+            assert client.post(path).status_code == 403
+        reloaded = client.post('/api/debug/reload-improvement-rules', headers={'X-Profile-Token': 'secret'}).json()
+        assert reloaded['status'] == 'success' and reloaded['workers_reloading'] is False
+    finally:
+        profiler.PROFILE_ADMIN_TOKEN = original
+
+
+if __name__ == "__main__":
+    test_versions_are_stored_with_metrics_and_schema()
+    test_activation_swaps_only_working_versions()
+    test_shadow_scoring_runs_off_the_request_path()
+    test_model_endpoints_require_admin_post()
+    print("Model registry tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the Monte Carlo application-list simulator against closed-form odds
+"""
+
+import sys
+sys.path.append('.')
+
+import math
+
+import numpy as np
+
+from backend.core.portfolio import norm_cdf, norm_ppf, simulate_portfolio
+
+PROBS = np.array([0.04, 0.08, 0.15, 0.3, 0.5, 0.7, 0.9])
+
+
+def _exact_prob_none(probs, rho, nodes=80):
+    """P(no admits) under the one-factor model, by Gauss-Hermite quadrature"""
+    z, w = np.polynomial.hermite_e.hermegauss(nodes)
+    thresholds = [norm_ppf(np.array([p]))[0] for p in probs]
+    total = 0.0
+    for zk, wk in zip(z, w):
+        none = 1.0
+        for t in thresholds:
+            x = (t - math.sqrt(rho) * zk) / math.sqrt(1 - rho)
+            none *= 1.0 - 0.5 * math.erfc(-x / math.sqrt(2))
+        total += wk * none
+    return total / math.sqrt(2 * math.pi)
+
+
+def test_normal_helpers():
+    """ppf and cdf approximations agree with math.erfc"""
+    x = np.linspace(-7, 7, 2001)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert np.abs(norm_cdf(x) - exact).max() < 2e-7
+    q = np.linspace(1e-6, 1 - 1e-6, 2001)
+    assert np.abs(norm_cdf(norm_ppf(q)) - q).max() < 2e-7
+
+
+def test_matches_closed_form():
+    """Admit-count odds match quadrature, independent or correlated"""
+    for rho in (0.0, 0.3, 0.7):
+        result = simulate_portfolio(PROBS, trials=400_000, strength_correlation=rho, seed=1)
+        assert abs(result.admit_count_distribution[0] - _exact_prob_none(PROBS, rho)) < 0.003, rho
+        assert abs(result.expected_admits - PROBS.sum()) < 0.01, rho
+
+    independent = simulate_portfolio(PROBS, trials=400_000, strength_correlation=0.0, seed=1)
+    assert abs(independent.prob_at_least_one - (1 - np.prod(1 - PROBS))) < 0.003
+
+
+def test_correlation_and_reaches():
+    """Correlation lowers P(>=1 admit); reach odds only count reach colleges"""
+    reach = PROBS < 0.25
+    low = simulate_portfolio(PROBS, reach_mask=reach, strength_correlation=0.1)
+    high = simulate_portfolio(PROBS, reach_mask=reach, strength_correlation=0.6)
+    assert high.prob_at_least_one < low.prob_at_least_one
+    assert high.prob_at_least_one_reach < low.prob_at_least_one_reach
+    assert simulate_portfolio(PROBS).prob_at_least_one_reach is None
+    assert abs(sum(low.admit_count_distribution) - 1.0) < 1e-12
+    assert len(low.admit_count_distribution) == len(PROBS) + 1
+
+
+def test_seed_reproducibility():
+    """Same seed gives identical results; different seeds differ"""
+    a = simulate_portfolio(PROBS, trials=50_000, seed=7)
+    b = simulate_portfolio(PROBS, trials=50_000, seed=7)
+    c = simulate_portfolio(PROBS, trials=50_000, seed=8)
+    assert a.to_dict() == b.to_dict()
+    assert a.admit_count_distribution != c.admit_count_distribution
+
+
+def test_reach_mask_length_checked():
+    """A reach mask that does not line up with the colleges is rejected"""
+    for mask in (PROBS[:-1] < 0.25, [True] * (len(PROBS) + 1), np.zeros((1, len(PROBS)), dtype=bool)):
+        try:
+            simulate_portfolio(PROBS, reach_mask=mask)
+        except ValueError as e:
+            assert "reach_mask" in str(e)
+        else:
+            raise AssertionError(f"accepted a reach mask of shape {np.shape(mask)}")
+
+
+if __name__ == "__main__":
+    test_normal_helpers()
+    test_matches_closed_form()
+    test_correlation_and_reaches()
+    test_seed_reproducibility()
+    test_reach_mask_length_checked()
+    print("Portfolio simulator matches closed-form odds")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the preloaded prefork server mode and its memory accounting
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+
+from core.prefork import memory_report, process_memory
+
+# Tiny ASGI app answering with the worker's pid, served by serve_preforked
+SERVER = """
+import os, sys
+sys.path.append('backend')
+from core.prefork import serve_preforked
+
+async def app(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': str(os.getpid()).encode()})
+
+serve_preforked(app, host='127.0.0.1', port=int(sys.argv[1]), workers=2, log_level='warning')
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_process_memory_splits_rss():
+    """Unique and shared pages add up to the resident set"""
+    memory = process_memory(os.getpid())
+    assert memory is not None
+    assert memory['unique'] > 0 and memory['shared'] >= 0
+    assert abs(memory['unique'] + memory['shared'] - memory['rss']) <= 0.01 * memory['rss'] + 64
+    assert process_memory(2 ** 22 + 12345) is None
+
+    lines = memory_report({'master': os.getpid()}).splitlines()
+    assert lines[0].split()[:2] == ['process', 'pid'] and lines[1].split()[0] == 'master'
+
+
+def test_workers_share_one_socket_and_stop_cleanly():
+    """Forked workers serve the master's socket; SIGTERM stops all of them"""
+    port = _free_port()
+    master = subprocess.Popen([sys.executable, '-c', SERVER, str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        pids = set()
+        deadline = time.time() + 60
+        while len(pids) < 2 and time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=2) as response:
+                    pids.add(int(response.read()))
+            except OSError:
+                time.sleep(0.2)
+        assert len(pids) == 2 and master.pid not in pids
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+    for pid in pids:
+        assert process_memory(pid) is None  # workers exited with the master
+
+
+def _worker_pids(port: int, count: int, exclude=(), timeout: float = 60) -> set:
+    pids = set()
+    deadline = time.time() + timeout
+    while len(pids) < count and time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=2) as response:
+                pid = int(response.read())
+            if pid not in exclude:
+                pids.add(pid)
+        except OSError:
+            time.sleep(0.2)
+    return pids
+
+
+def test_sighup_replaces_workers_with_reloaded_forks():
+    """After SIGHUP the master reloads and every worker is replaced"""
+    port = _free_port()
+    master = subprocess.Popen([sys.executable, '-c', SERVER, str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        old = _worker_pids(port, 2)
+        assert len(old) == 2
+        master.send_signal(signal.SIGHUP)
+        new = _worker_pids(port, 2, exclude=old)
+        assert len(new) == 2 and master.pid not in new
+        deadline = time.time() + 30
+        while any(process_memory(pid) is not None for pid in old) and time.time() < deadline:
+            time.sleep(0.2)
+        assert all(process_memory(pid) is None for pid in old)
+        assert master.poll() is None
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    test_process_memory_splits_rss()
+    test_workers_share_one_socket_and_stop_cleanly()
+    test_sighup_replaces_workers_with_reloaded_forks()
+    print("Prefork server tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the on-demand request profiler
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import os
+import tempfile
+import threading
+import time
+
+import core.profiler as profiler
+from core.profiler import StackSampler, list_profiles, profile_path, profile_request, should_profile
+from core.tracing import flush_writes, trace_request, traced
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@traced('worker_job')
+def worker_job():
+    _busy(0.05)
+
+
+def test_sampler_follows_the_request_into_worker_threads():
+    """Threads are sampled while inside the request's spans and the capture is saved"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with trace_request('POST /api/predict/frontend', 'prof-1') as trace:
+            with profile_request(trace, directory=tmp) as sampler:
+                worker = threading.Thread(target=trace_request_context(worker_job))
+                worker.start()
+                worker.join()
+                _busy(0.03)
+        flush_writes()
+        assert trace.sampler is None and trace.to_dict()['spans']['attrs'] == {'profiled': True, 'profile': 'prof-1'}
+        assert sampler.samples > 0
+
+        with open(profile_path('prof-1', tmp)) as f:
+            lines = f.read().splitlines()
+        stacks = dict(line.rsplit(' ', 1) for line in lines)
+        assert any('worker_job' in stack and stack.rsplit(';', 1)[-1].startswith('_busy (') for stack in stacks)
+        assert any('test_sampler_follows' in stack for stack in stacks)
+        assert all(count.isdigit() for count in stacks.values())
+        assert list_profiles(tmp)[0]['request_id'] == 'prof-1'
+
+        for bad in ('missing', '../prof-1'):
+            try:
+                profile_path(bad, tmp)
+            except KeyError:
+                pass
+            else:
+                raise AssertionError(f"profile_path accepted {bad!r}")
+
+
+def trace_request_context(func):
+    """Run func in a new thread with the caller's context (like run_in_threadpool)"""
+    import contextvars
+    context = contextvars.copy_context()
+    return lambda: context.run(func)
+
+
+def test_only_selected_requests_are_profiled():
+    """The admin header or the sample rate selects requests, on profiled paths only"""
+    original = profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_SAMPLE_RATE
+    try:
+        profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_SAMPLE_RATE = 'secret', 0.0
+        assert should_profile('/api/suggest/colleges', 'secret')
+        assert should_profile('/api/improvement-analysis/MIT', 'secret')
+        assert not should_profile('/api/suggest/colleges', 'wrong')
+        assert not should_profile('/api/health', 'secret')
+        profiler.PROFILE_SAMPLE_RATE = 1.0
+        assert should_profile('/api/predict/frontend', None)
+        profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_SAMPLE_RATE = '', 0.0
+        assert not should_profile('/api/predict/frontend', '')
+    finally:
+        profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_SAMPLE_RATE = original
+
+    sampler = StackSampler()
+    sampler.sample()
+    assert sampler.samples == 1 and not sampler.counts
+
+
+def test_profiles_are_listed_and_downloaded():
+    """A request with the admin header is captured under its X-Request-ID"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    original = profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_DIR = 'secret', tmp
+        try:
+            client = TestClient(app)
+            headers = {'X-Profile-Token': 'secret', 'X-Request-ID': 'prof-api'}
+            response = client.post('/api/predict/frontend', json={}, headers=headers)
+            assert response.headers['x-request-id'] == 'prof-api'
+            flush_writes()
+            assert os.path.exists(os.path.join(tmp, 'prof-api.collapsed'))
+
+            admin = {'X-Profile-Token': 'secret'}
+            listed = client.get('/api/debug/profiles', headers=admin).json()['profiles']
+            assert [meta['request_id'] for meta in listed] == ['prof-api']
+            download = client.get('/api/debug/profiles/prof-api', headers=admin)
+            assert download.status_code == 200 and download.headers['content-type'].startswith('text/plain')
+            assert client.get('/api/debug/profiles/unknown', headers=admin).status_code == 404
+
+            # Reusing a request id keeps the first capture
+            first = download.content
+            client.post('/api/predict/frontend', json={}, headers=headers)
+            flush_writes()
+            listed = client.get('/api/debug/profiles', headers=admin).json()['profiles']
+            assert len(listed) == 2 and all(meta['request_id'].startswith('prof-api') for meta in listed)
+            assert client.get('/api/debug/profiles/prof-api', headers=admin).content == first
+
+            for path in ('/api/debug/profiles', '/api/debug/profiles/prof-api', '/api/debug/slow-requests'):
+                assert client.get(path).status_code == 403
+                assert client.get(path, headers={'X-Profile-Token': 'wrong'}).status_code == 403
+            profiler.PROFILE_ADMIN_TOKEN = ''
+            assert client.get('/api/debug/profiles', headers={'X-Profile-Token': ''}).status_code == 403
+        finally:
+            profiler.PROFILE_ADMIN_TOKEN, profiler.PROFILE_DIR = original
+
+
+if __name__ == "__main__":
+    test_sampler_follows_the_request_into_worker_threads()
+    test_only_selected_requests_are_profiled()
+    test_profiles_are_listed_and_downloaded()
+    print("Profiler tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test per-request cost accounting
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+from core.costs import CostMetrics, collect_costs, cost_metrics, count, format_costs
+from data.data_versions import VersionedCache
+
+
+def test_counts_are_collected_per_request():
+    """Counts add up inside a request and are dropped outside one"""
+    count('file_reads')
+    with collect_costs() as costs:
+        count('file_reads')
+        count('rows_scanned', 500)
+        count('rows_scanned', 250)
+        count('http_calls', 0)
+    assert costs == {'file_reads': 1, 'rows_scanned': 750, 'http_calls': 0}
+    assert format_costs(costs) == 'file_reads=1, rows_scanned=750'
+
+    metrics = CostMetrics()
+    metrics.observe_request('/api/x', costs)
+    metrics.observe_request('/api/x', {'file_reads': 2})
+    assert metrics.requests('/api/x') == 2 and metrics.total('/api/x', 'file_reads') == 3
+    lines = metrics.render().splitlines()
+    assert 'chancify_requests_total{endpoint="/api/x"} 2' in lines
+    assert 'chancify_request_operations_total{endpoint="/api/x",operation="rows_scanned"} 750' in lines
+
+
+def test_versioned_cache_counts_hits_and_misses():
+    """A membership check plus lookup is one hit; a failed check or lookup is a miss"""
+    cache = VersionedCache()
+    with collect_costs() as costs:
+        assert 'a' not in cache
+        cache['a'] = 1
+        if 'a' in cache:
+            assert cache['a'] == 1
+        assert cache.get('b') is None
+    assert costs == {'cache_misses': 2, 'cache_hits': 1}
+
+
+def test_costs_are_returned_and_aggregated():
+    """Search scans show up in the response header and the /metrics totals"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    cost_metrics.reset()
+    client = TestClient(app)
+    response = client.get('/api/search/colleges', params={'q': 'zzzz-no-such-college'})
+    assert response.status_code == 200
+    header = dict(item.split('=') for item in response.headers['x-request-cost'].split(', '))
+    assert int(header['rows_scanned']) > 0
+
+    assert cost_metrics.requests('/api/search/colleges') == 1
+    assert cost_metrics.total('/api/search/colleges', 'rows_scanned') == int(header['rows_scanned'])
+    assert 'x-request-cost' not in client.get('/').headers
+    assert 'chancify_request_operations_total{endpoint="/api/search/colleges",operation="rows_scanned"}' in client.get('/metrics').text
+
+
+if __name__ == "__main__":
+    test_counts_are_collected_per_request()
+    test_versioned_cache_counts_hits_and_misses()
+    test_costs_are_returned_and_aggregated()
+    print("Request cost tests passed")
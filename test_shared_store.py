@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the shared read-only data segment and the mappings served from it
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import json
+import math
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+from data import shared_store
+from data.real_ipeds_major_mapping import COLLEGE_DATA_PATH, MAPPING_PATH, RealIPEDSMajorMapping, real_ipeds_mapping
+from data.shared_store import StringColumn, attach, encode_strings
+
+
+def _json_mappings():
+    with open(MAPPING_PATH) as f:
+        major_mapping = json.load(f)
+    with open(COLLEGE_DATA_PATH) as f:
+        college_major_data = json.load(f)
+    return major_mapping, college_major_data
+
+
+def test_string_column_round_trip():
+    """Blob/offsets strings decode back exactly, including non-ASCII"""
+    values = ["Université de Montréal", "", "MIT", "São Paulo", "MIT"]
+    column = StringColumn({f's.{k}': v for k, v in encode_strings(values).items()}, 's')
+    assert len(column) == len(values)
+    assert column.tolist() == values and [column[i] for i in range(len(values))] == values
+    assert column.positions() == {"Université de Montréal": 0, "": 1, "MIT": 2, "São Paulo": 3}
+
+
+def test_mapping_views_match_json():
+    """The shared views decode to the same data as the JSON files"""
+    major_mapping, college_major_data = _json_mappings()
+    assert real_ipeds_mapping.shared is not None
+    # json.dumps compares the NaN percentages too
+    assert json.dumps(dict(real_ipeds_mapping.major_mapping)) == json.dumps(major_mapping)
+    for name, data in college_major_data.items():
+        view = real_ipeds_mapping.college_major_data[name]
+        assert json.dumps(view['majors']) == json.dumps(data['majors'])
+        assert view['unitid'] == data.get('unitid')
+    assert "Not A College" not in real_ipeds_mapping.college_major_data
+
+
+def test_lookups_match_json():
+    """Scores and college lists equal the dict-backed implementation"""
+    major_mapping, college_major_data = _json_mappings()
+    plain = RealIPEDSMajorMapping.__new__(RealIPEDSMajorMapping)
+    plain.shared, plain.major_mapping, plain.college_major_data = None, major_mapping, college_major_data
+
+    for major in list(major_mapping)[:10]:
+        assert real_ipeds_mapping.get_colleges_for_major(major, limit=50) == plain.get_colleges_for_major(major, limit=50)
+        for college in list(college_major_data)[:100]:
+            shared = real_ipeds_mapping.get_major_strength_score(college, major, tier='elite')
+            expected = plain.get_major_strength_score(college, major, tier='elite')
+            assert shared == expected or (math.isnan(shared) and math.isnan(expected)), (college, major)
+    assert real_ipeds_mapping.get_college_majors("Not A College") == []
+
+
+def test_segment_built_once_per_version():
+    """One build per source version; other processes attach to it"""
+    original_dir = shared_store.SHARED_DATA_DIR
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'values': np.arange(5)}
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            shared_store.SHARED_DATA_DIR = os.path.join(tmp, 'shared')
+            source = os.path.join(tmp, 'source.txt')
+            with open(source, 'w') as f:
+                f.write("v1")
+
+            assert attach('demo', [source], build)['values'].tolist() == [0, 1, 2, 3, 4]
+            assert not attach('demo', [source], build)['values'].flags.writeable
+            assert len(builds) == 1
+
+            # A separate worker process maps the published files without building (last line is ours)
+            code = (
+                "import sys; sys.path.append('backend'); from data.shared_store import attach; "
+                f"print(attach('demo', [{source!r}], lambda: 1/0)['values'].sum())"
+            )
+            env = dict(os.environ, CHANCIFY_SHARED_DATA_DIR=shared_store.SHARED_DATA_DIR)
+            assert subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                                  check=True).stdout.split()[-1] == "10"
+
+            # Editing the source publishes a new version and drops the stale one
+            with open(source, 'w') as f:
+                f.write("v2")
+            attach('demo', [source], build)
+            assert len(builds) == 2
+            assert len([e for e in os.listdir(shared_store.SHARED_DATA_DIR) if e.startswith('demo-')]) == 1
+    finally:
+        shared_store.SHARED_DATA_DIR = original_dir
+
+
+if __name__ == "__main__":
+    test_string_column_round_trip()
+    test_mapping_views_match_json()
+    test_lookups_match_json()
+    test_segment_built_once_per_version()
+    print("Shared data segment tests passed")
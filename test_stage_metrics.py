@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test per-stage latency histograms and the /metrics endpoint
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import time
+
+from core.metrics import LATENCY_BUCKETS, LatencyMetrics, collect_stages, latency_metrics, stage, timed
+
+
+def test_histograms_render_as_prometheus_text():
+    """Buckets are cumulative with a +Inf bucket, plus _sum and _count"""
+    metrics = LatencyMetrics()
+    for seconds in (0.00005, 0.0003, 0.0003, 20.0):
+        metrics.observe('/api/x', 'formula', seconds)
+    metrics.observe('/api/"q"', 'request', 0.001)
+
+    lines = metrics.render().splitlines()
+    assert lines[1] == '# TYPE chancify_stage_latency_seconds histogram'
+    bucket = 'chancify_stage_latency_seconds_bucket{endpoint="/api/x",stage="formula",le="%s"} %d'
+    assert bucket % (0.0001, 1) in lines
+    assert bucket % (0.00025, 1) in lines and bucket % (0.0005, 3) in lines
+    assert bucket % (10.0, 3) in lines and bucket % ('+Inf', 4) in lines
+    assert 'chancify_stage_latency_seconds_count{endpoint="/api/x",stage="formula"} 4' in lines
+    assert 'chancify_stage_latency_seconds_sum{endpoint="/api/x",stage="formula"} 20.000650000' in lines
+    assert any(line.startswith('chancify_stage_latency_seconds_count{endpoint="/api/\\"q\\""') for line in lines)
+    assert len([line for line in lines if '_bucket' in line]) == 2 * (len(LATENCY_BUCKETS) + 1)
+
+
+def test_stages_are_summed_per_request():
+    """Inside a request repeated stages add up; outside one they are recorded directly"""
+    @timed('college_resolution')
+    def resolve():
+        time.sleep(0.002)
+
+    with collect_stages() as stages:
+        for _ in range(3):
+            with stage('formula'):
+                time.sleep(0.001)
+        resolve()
+    assert set(stages) == {'formula', 'college_resolution'}
+    assert stages['formula'] >= 0.003 and stages['college_resolution'] >= 0.002
+
+    latency_metrics.reset()
+    with stage('formula'):
+        pass
+    assert latency_metrics.histogram('none', 'formula').count == 1
+
+    # A stage costs a few microseconds
+    started = time.perf_counter()
+    with collect_stages():
+        for _ in range(10000):
+            with stage('formula'):
+                pass
+    assert (time.perf_counter() - started) / 10000 < 20e-6
+
+
+def test_requests_are_recorded_under_their_route():
+    """The middleware labels histograms with the route template and /metrics serves them"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    latency_metrics.reset()
+    client = TestClient(app)
+    assert client.get('/').status_code == 200
+    client.delete('/api/whatif/sessions/not-a-session')
+
+    assert latency_metrics.histogram('/', 'request').count == 1
+    assert latency_metrics.histogram('/', 'serialization').count == 1
+    assert latency_metrics.histogram('/api/whatif/sessions/{session_id}', 'request').count == 1
+
+    response = client.get('/metrics')
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'chancify_stage_latency_seconds_count{endpoint="/",stage="request"} 1' in response.text
+
+
+if __name__ == "__main__":
+    test_histograms_render_as_prometheus_text()
+    test_stages_are_summed_per_request()
+    test_requests_are_recorded_under_their_route()
+    print("Stage metrics tests passed")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test lazy, dependency-ordered component initialization
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import asyncio
+import threading
+import time
+
+from core.startup import ComponentGraph, report
+
+
+def test_components_build_lazily_once():
+    """A proxy builds its component (after its dependencies) on first use only"""
+    graph = ComponentGraph()
+    builds = []
+    graph.add('names', lambda: builds.append('names') or {'mit': 'MIT'})
+    lookup = graph.add('lookup', lambda: builds.append('lookup') or graph.get('names').copy(), depends_on=('names',))
+    assert builds == [] and graph.status() == {'names': 'pending', 'lookup': 'pending'}
+
+    assert lookup.get('mit') == 'MIT'
+    assert lookup.get('mit') == 'MIT'
+    assert builds == ['names', 'lookup']
+    assert graph.status() == {'names': 'ready', 'lookup': 'ready'}
+
+
+def test_independent_components_load_concurrently():
+    """load_all starts components as soon as their dependencies are ready"""
+    graph = ComponentGraph()
+    both_running = threading.Barrier(2, timeout=5)
+    graph.add('catalog', lambda: (both_running.wait(), 'catalog')[1])
+    graph.add('mappings', lambda: (both_running.wait(), 'mappings')[1])
+    graph.add('suggestions', lambda: (graph.get('catalog'), graph.get('mappings')), depends_on=('catalog', 'mappings'))
+
+    timings = {t.name: t for t in graph.load_all(max_workers=2)}
+    assert all(t.state == 'ready' for t in timings.values())
+    assert timings['catalog'].thread != timings['mappings'].thread
+    assert timings['suggestions'].started >= timings['catalog'].started + timings['catalog'].seconds
+    assert graph.get('suggestions') == ('catalog', 'mappings')
+    assert report(list(timings.values())).splitlines()[0].split()[:2] == ['component', 'depends']
+
+
+def test_failed_component_is_reported_and_retried():
+    """A failure is recorded, blocks dependents, and the next use retries"""
+    graph = ComponentGraph()
+    attempts = []
+
+    def flaky():
+        attempts.append(time.perf_counter())
+        if len(attempts) == 1:
+            raise OSError("College_State_Zip.csv missing")
+        return 'loaded'
+
+    graph.add('city_state', flaky)
+    graph.add('tuition', lambda: graph.get('city_state'), depends_on=('city_state',))
+    graph.add('rules', lambda: 'rules')
+
+    timings = {t.name: t for t in graph.load_all()}
+    assert timings['city_state'].state == 'failed' and 'missing' in timings['city_state'].error
+    assert timings['tuition'].state == 'pending' and timings['rules'].state == 'ready'
+    assert graph.get('tuition') == 'loaded' and len(attempts) == 2
+
+
+def test_declaration_order_is_enforced():
+    """Unknown dependencies and duplicate names are rejected"""
+    graph = ComponentGraph()
+    graph.add('a', lambda: 1)
+    for name, depends_on in [('b', ('missing',)), ('a', ())]:
+        try:
+            graph.add(name, lambda: 2, depends_on=depends_on)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"declared {name!r}")
+
+
+def test_health_answers_while_components_build():
+    """Requests sleep through the warm-up, so the event loop keeps serving /api/health"""
+    import httpx
+    import main  # noqa: F401 - imports backend.main
+    backend_main = sys.modules['backend.main']
+
+    graph = ComponentGraph()
+    release = threading.Event()
+    graph.add('catalog', lambda: release.wait(5) and 'catalog')
+    graph.add('broken', lambda: 1 / 0)
+
+    async def run():
+        transport = httpx.ASGITransport(app=backend_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            # No warm-up running (STARTUP_WARMUP=0): nothing is waited for or built
+            assert (await client.get('/api/search/colleges', params={'q': 'zzzz'})).status_code == 200
+            assert graph.status() == {'catalog': 'pending', 'broken': 'pending'}
+
+            warmup = graph.load_in_background()
+            waiting = asyncio.ensure_future(client.get('/api/search/colleges', params={'q': 'zzzz'}))
+            await asyncio.sleep(0.1)
+            health = await asyncio.wait_for(client.get('/api/health'), timeout=2)
+            assert health.status_code == 200 and health.json()['components']['catalog'] == 'loading'
+            assert not waiting.done()
+            release.set()
+            assert (await asyncio.wait_for(waiting, timeout=5)).status_code == 200
+            warmup.join(5)
+
+            # A failed component does not hold later requests back
+            assert graph.status() == {'catalog': 'ready', 'broken': 'failed'} and not graph.warming_up()
+            response = await asyncio.wait_for(client.get('/api/search/colleges', params={'q': 'zzzz'}), timeout=2)
+            assert response.status_code == 200
+
+    original = backend_main.startup_components
+    backend_main.startup_components = graph
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        backend_main.startup_components = original
+
+if __name__ == "__main__":
+    test_components_build_lazily_once()
+    test_independent_components_load_concurrently()
+    test_failed_component_is_reported_and_retried()
+    test_declaration_order_is_enforced()
+    test_health_answers_while_components_build()
+    print("Startup component tests passed")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test request-scoped tracing and slow-request capture
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import core.tracing as tracing
+from core.metrics import stage
+from core.tracing import (
+    flush_writes, read_slow_traces, span, trace_request, traced, tracing_active, valid_request_id, write_slow_trace
+)
+
+
+def test_spans_nest_into_a_tree():
+    """Child spans (including stages) hang off the span that was current when they started"""
+    @traced('lookup')
+    def lookup():
+        with span('inner', key='x') as inner:
+            inner.set(rows=3)
+
+    with span('outside'):
+        assert not tracing_active()
+
+    with trace_request('GET /x', 'req-1') as trace:
+        lookup()
+        with stage('formula'):
+            try:
+                with span('failing'):
+                    raise KeyError('missing')
+            except KeyError:
+                pass
+
+    tree = trace.to_dict()
+    assert tree['request_id'] == 'req-1' and tree['duration_ms'] >= 0
+    lookup_node, formula_node = tree['spans']['children']
+    assert lookup_node['name'] == 'lookup'
+    assert lookup_node['children'][0] == {**lookup_node['children'][0], 'name': 'inner', 'attrs': {'key': 'x', 'rows': 3}}
+    assert formula_node['name'] == 'formula' and formula_node['children'][0]['error'] == 'KeyError'
+    assert not tracing_active()
+
+
+def test_async_functions_and_versioned_services_are_traced():
+    """@traced awaits coroutines inside the span; versioned service calls become spans"""
+    from data.data_versions import VersionedService, pinned
+
+    class Mapping:
+        def get(self, key):
+            return key.upper()
+
+    service = VersionedService('ipeds_mapping')
+
+    @traced('fetch')
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return service.get('a')
+
+    async def run():
+        with pinned(SimpleNamespace(ipeds_mapping=Mapping())):
+            with trace_request('GET /async') as trace:
+                assert await fetch() == 'A'
+            assert service.get('b') == 'B'
+        return trace
+
+    fetch_node = asyncio.run(run()).to_dict()['spans']['children'][0]
+    assert fetch_node['name'] == 'fetch' and fetch_node['duration_ms'] >= 10
+    assert fetch_node['children'][0]['name'] == 'ipeds_mapping.get'
+
+
+def test_slow_requests_are_written_with_their_id():
+    """Only requests over the threshold are logged, and the log can be read back"""
+    original = tracing.SLOW_REQUEST_MS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'logs', 'slow.jsonl')
+        original_log = tracing.SLOW_REQUEST_LOG
+        tracing.SLOW_REQUEST_LOG = path
+        try:
+            tracing.SLOW_REQUEST_MS = 20
+            with trace_request('GET /fast', 'fast'):
+                pass
+            with trace_request('GET /slow', 'slow'):
+                with span('sleep'):
+                    time.sleep(0.03)
+            flush_writes()
+        finally:
+            tracing.SLOW_REQUEST_MS = original
+            tracing.SLOW_REQUEST_LOG = original_log
+
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert [record['request_id'] for record in records] == ['slow']
+        assert records[0]['spans']['children'][0]['name'] == 'sleep'
+
+        with trace_request('GET /later', 'later') as trace:
+            pass
+        write_slow_trace(trace, path)
+        assert [record['request_id'] for record in read_slow_traces(10, path)] == ['later', 'slow']
+        assert read_slow_traces(10, os.path.join(tmp, 'missing.jsonl')) == []
+
+
+def test_slow_trace_written_off_the_request():
+    """Leaving a slow trace only queues the write; the writer thread does the I/O"""
+    original = tracing.SLOW_REQUEST_MS, tracing.SLOW_REQUEST_LOG
+    release = threading.Event()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'slow.jsonl')
+        tracing.SLOW_REQUEST_MS, tracing.SLOW_REQUEST_LOG = 0, path
+        try:
+            tracing.submit_write(release.wait)  # hold the writer busy
+            with trace_request('GET /queued', 'queued'):
+                pass
+            assert not os.path.exists(path)
+        finally:
+            tracing.SLOW_REQUEST_MS, tracing.SLOW_REQUEST_LOG = original
+            release.set()
+            flush_writes()
+        assert [record['request_id'] for record in read_slow_traces(10, path)] == ['queued']
+
+
+def test_request_id_is_returned():
+    """The middleware echoes a sane X-Request-ID or generates one"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    assert client.get('/', headers={'X-Request-ID': 'abc-123'}).headers['x-request-id'] == 'abc-123'
+    generated = client.get('/', headers={'X-Request-ID': 'bad id\n'}).headers['x-request-id']
+    assert generated != 'bad id\n' and generated.isalnum()
+    # Non-ASCII letters and digits pass str.isalnum() but are not accepted
+    for supplied in ('caf\u00e9', '\u0661\u0662', 'a' * 65):
+        assert not valid_request_id(supplied)
+    assert valid_request_id('Req_01-abc')
+
+    from core import profiler
+    original = profiler.PROFILE_ADMIN_TOKEN
+    profiler.PROFILE_ADMIN_TOKEN = 'secret'
+    try:
+        response = client.get('/api/debug/slow-requests', params={'limit': 5}, headers={'X-Profile-Token': 'secret'})
+        assert response.status_code == 200 and isinstance(response.json()['traces'], list)
+    finally:
+        profiler.PROFILE_ADMIN_TOKEN = original
+
+
+if __name__ == "__main__":
+    test_spans_nest_into_a_tree()
+    test_async_functions_and_versioned_services_are_traced()
+    test_slow_requests_are_written_with_their_id()
+    test_slow_trace_written_off_the_request()
+    test_request_id_is_returned()
+    print("Tracing tests passed")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test that the vectorized formula engine matches the scalar pipeline
+"""
+
+import sys
+sys.path.append('.')
+
+import numpy as np
+
+from backend.core.audit import LazyAuditReport
+from backend.core.pipeline import calculate_admission_probability, batch_calculate_probabilities
+from backend.core.scoring import CollegePolicy, compute_composite, apply_conduct_penalty
+from backend.core.vectorized import (
+    FACTOR_ORDER,
+    scores_to_matrix,
+    compute_composites,
+    calculate_probability_matrix
+)
+
+
+def _random_profiles(count, seed=7, allow_none=True):
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(count):
+        scores = {}
+        for factor in FACTOR_ORDER:
+            roll = rng.random()
+            if roll < 0.15:
+                continue  # missing -> neutral default
+            elif roll < 0.2 and allow_none:
+                scores[factor] = None
+            else:
+                scores[factor] = float(rng.uniform(-1, 11))  # include out-of-range values
+        profiles.append(scores)
+    return profiles
+
+
+def test_composites_match_scalar():
+    """Composites match compute_composite + conduct penalty for every policy"""
+    profiles = _random_profiles(300)
+    matrix = scores_to_matrix(profiles)
+
+    for uses_testing in (True, False):
+        for need_aware in (True, False):
+            vectorized = compute_composites(matrix, uses_testing, need_aware)
+            policy = CollegePolicy(uses_testing=uses_testing, need_aware=need_aware)
+            for i, scores in enumerate(profiles):
+                expected = apply_conduct_penalty(
+                    compute_composite(scores, policy).composite,
+                    scores.get("conduct_record")
+                )
+                assert abs(vectorized[i] - expected) < 1e-9, (i, vectorized[i], expected)
+
+
+def test_probability_matrix_matches_scalar():
+    """M x N probability grid matches calculate_admission_probability pair by pair"""
+    profiles = _random_profiles(60, seed=11, allow_none=False)
+    rng = np.random.default_rng(3)
+    colleges = [
+        {
+            "name": f"College {i}",
+            "acceptance_rate": float(rate),
+            "uses_testing": bool(rng.random() > 0.3),
+            "need_aware": bool(rng.random() > 0.5),
+        }
+        for i, rate in enumerate([0.01, 0.04, 0.1, 0.149, 0.15, 0.35, 0.8, 0.95])
+    ]
+
+    composites, probabilities = calculate_probability_matrix(profiles, colleges)
+    assert composites.shape == probabilities.shape == (len(profiles), len(colleges))
+
+    for i, scores in enumerate(profiles):
+        for j, college in enumerate(colleges):
+            report = calculate_admission_probability(
+                scores,
+                college["acceptance_rate"],
+                college["uses_testing"],
+                college["need_aware"]
+            )
+            assert abs(report.composite_score - composites[i, j]) < 1e-9
+            assert abs(report.probability - probabilities[i, j]) < 1e-12
+
+
+def test_lazy_audit_matches_eager():
+    """Lazy reports defer the breakdown and then match the eager report"""
+    scores = {"grades": 9.0, "essay": 8.5, "ecs_leadership": 8.0, "conduct_record": 2.0}
+    eager = calculate_admission_probability(scores, 0.08, uses_testing=False)
+    lazy = calculate_admission_probability(scores, 0.08, uses_testing=False, lazy_audit=True)
+
+    assert isinstance(lazy, LazyAuditReport)
+    assert lazy.probability == eager.probability
+    assert not lazy.is_built
+    assert lazy.to_dict() == eager.to_dict()
+    assert lazy.is_built
+
+
+def test_batch_reports_match_single():
+    """Batch reports (vectorized numerics, lazy breakdown) match single calls"""
+    scores = _random_profiles(1, seed=5, allow_none=False)[0]
+    colleges = [
+        {"name": "Elite", "acceptance_rate": 0.04},
+        {"name": "Selective", "acceptance_rate": 0.2, "uses_testing": False},
+        {"name": "State", "acceptance_rate": 0.6, "need_aware": True},
+    ]
+    results = batch_calculate_probabilities(scores, colleges)
+
+    for college in colleges:
+        expected = calculate_admission_probability(
+            scores,
+            college["acceptance_rate"],
+            college.get("uses_testing", True),
+            college.get("need_aware", False)
+        )
+        assert results[college["name"]].to_dict() == expected.to_dict()
+
+
+if __name__ == "__main__":
+    test_composites_match_scalar()
+    test_probability_matrix_matches_scalar()
+    test_lazy_audit_matches_eager()
+    test_batch_reports_match_single()
+    print("Vectorized formula engine matches scalar pipeline")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test that incremental what-if sessions match full re-prediction
+"""
+
+import sys
+sys.path.append('.')
+sys.path.append('backend')
+
+import time
+
+from core.calibration_table import CalibrationTable, set_calibration_provider
+from core.probability import default_calibration
+from ml.models.predictor import get_predictor
+from ml.models.whatif_session import WhatIfSession, WhatIfSessionStore
+from ml.preprocessing.feature_extractor import CollegeFeatures
+from ml.preprocessing.frontend_profile import frontend_profile_to_student_features
+
+COLLEGES = [
+    CollegeFeatures(name="Harvard University", acceptance_rate=0.04),
+    CollegeFeatures(name="Test Blind College", acceptance_rate=0.3, test_policy="Test-blind"),
+    CollegeFeatures(name="Need Aware College", acceptance_rate=0.12, financial_aid_policy="Need-aware"),
+    CollegeFeatures(name="State University", acceptance_rate=0.75),
+]
+
+SLIDER_MOVES = [
+    {'essay_quality': '9'},
+    {'extracurricular_depth': '9', 'awards_publications': '9'},  # cluster dampening kicks in
+    {'sat': '1580'},
+    {'conduct_record': '2'},  # conduct penalty
+    {'ability_to_pay': '10', 'essay_quality': ''},
+    {'conduct_record': '9', 'extracurricular_depth': '4'},
+]
+
+
+def test_updates_match_full_prediction():
+    """Every slider move gives the same probabilities as predict() from scratch"""
+    predictor = get_predictor()
+    profile = {'gpa_unweighted': '3.8', 'sat': '1450', 'major': 'History'}
+    session = WhatIfSession(predictor, profile, COLLEGES)
+
+    for changes in SLIDER_MOVES:
+        results = session.update(changes)
+        profile.update(changes)
+        student = frontend_profile_to_student_features(profile)
+        for college, result in zip(COLLEGES, results):
+            expected = predictor.predict(student, college)
+            assert abs(result.probability - expected.probability) < 1e-9, (changes, college.name)
+            assert abs(result.formula_probability - expected.formula_probability) < 1e-9
+
+
+def test_update_latency():
+    """Slider moves for 20 colleges come back well under 5ms"""
+    colleges = [CollegeFeatures(name=f"College {i}", acceptance_rate=0.04 + 0.04 * i) for i in range(20)]
+    session = WhatIfSession(get_predictor(), {}, colleges)
+
+    timings = []
+    for step in range(50):
+        start = time.perf_counter()
+        session.update({'recommendations': str(step % 10)})
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    assert timings[len(timings) // 2] < 0.005
+
+
+def test_calibration_table_rows_used():
+    """Session and grid take A/C from the calibration table by unitid, like predict()"""
+    colleges = [
+        CollegeFeatures(name="Tabled College", acceptance_rate=0.2, unitid=100),
+        CollegeFeatures(name="Overridden Rate", acceptance_rate=0.35, unitid=200),
+        CollegeFeatures(name="Untabled College", acceptance_rate=0.5, unitid=300),
+    ]
+    table_rates = [0.2, 0.4]
+    table = CalibrationTable(
+        unitid=[100, 200],
+        acceptance_rate=table_rates,
+        A=[default_calibration(r).A - 1.0 for r in table_rates],
+        C=[default_calibration(r).C * 0.5 for r in table_rates],
+        factor=[0.0, 0.0],
+        max_prob=[0.0, 0.0],
+        is_elite=[False, False]
+    )
+    predictor = get_predictor()
+    profile = {'gpa_unweighted': '3.6', 'sat': '1350'}
+    student = frontend_profile_to_student_features(profile)
+    untabled = predictor.predict(student, colleges[0]).probability
+
+    set_calibration_provider(lambda: table)
+    try:
+        expected = [predictor.predict(student, college).probability for college in colleges]
+        session_probs = [r.probability for r in WhatIfSession(predictor, profile, colleges).update({})]
+        grid_probs = predictor.predict_probability_grid([student], colleges)[0]
+    finally:
+        set_calibration_provider(None)
+
+    assert abs(expected[0] - untabled) > 1e-3  # the table row actually changes the result
+    for college, want, got_session, got_grid in zip(colleges, expected, session_probs, grid_probs):
+        assert abs(got_session - want) < 1e-9, college.name
+        assert abs(got_grid - want) < 1e-9, college.name
+
+
+def test_session_store_expiry_and_cap():
+    """Sessions expire when idle and the oldest are evicted at the cap"""
+    predictor = get_predictor()
+    store = WhatIfSessionStore(ttl_seconds=60, max_sessions=2)
+    first = store.add(WhatIfSession(predictor, {}, COLLEGES[:1]))
+    second = store.add(WhatIfSession(predictor, {}, COLLEGES[:1]))
+    store.get(first)  # first is now most recently used
+    third = store.add(WhatIfSession(predictor, {}, COLLEGES[:1]))
+
+    assert store.get(second) is None
+    assert store.get(first) is not None and store.get(third) is not None
+
+    store.get(first).last_used -= 120
+    assert store.get(first) is None
+    assert store.remove(third) and not store.remove(third)
+
+
+if __name__ == "__main__":
+    test_updates_match_full_prediction()
+    test_update_latency()
+    test_calibration_table_rows_used()
+    test_session_store_expiry_and_cap()
+    print("What-if sessions match full re-prediction")